@@ -1,14 +1,74 @@
 r"""
 This package contains methods and classes that target ArchivesSpace's v2.X
 API.
+
+Submodules are imported the first time they are accessed as attributes of
+the package, so `import aspace` stays cheap for short-lived scripts, while
+`aspace.client.ASpaceClient` continues to work without a separate import.
 """
 
-import aspace.enums
-import aspace.util
-import aspace.jsonmodel
-import aspace.base_client
-import aspace.client
+import importlib
+
+
+# Submodules that are available as attributes of the package, and are
+# imported on first access.
+_SUBMODULES = frozenset([
+    'async_base_client',
+    'async_client',
+    'base_client',
+    'cache',
+    'client',
+    'client_extensions',
+    'constants',
+    'enums',
+    'json_decoding',
+    'jsonmodel',
+    'limiters',
+    'metrics',
+    'retry',
+    'routing',
+    'session_store',
+    'sync_state',
+    'tracing',
+    'transports',
+    'util',
+])
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        # import_module also binds the submodule as an attribute of the
+        # package, so this is only called once per submodule.
+        return importlib.import_module('.' + name, __name__)
+
+    if name == '__version__':
+        version = globals()['__version__'] = _get_version()
+        return version
+
+    raise AttributeError(
+        'module %r has no attribute %r' % (__name__, name))
+
+
+def _get_version() -> str:
+    """
+    Returns the version of the installed distribution, from its metadata.
+    Only a source checkout that has not been installed falls back to
+    versioneer, which runs git.
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        metadata = None  # Added in Python 3.8.
+
+    if metadata is not None:
+        try:
+            return metadata.version('aspace-client')
+        except metadata.PackageNotFoundError:
+            pass
+
+    from ._version import get_versions
+    return get_versions()['version']
+
 
-from ._version import get_versions
-__version__ = get_versions()['version']
-del get_versions
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | {'__version__'})
@@ -0,0 +1,322 @@
+r"""
+Contains the AsyncBaseASpaceClient class.
+"""
+
+import asyncio
+import configparser
+import urllib
+
+from aspace import constants, tracing, util
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncBaseASpaceClient(object):
+    """
+    The asyncio counterpart of BaseASpaceClient. Wraps the AsyncClient class
+    from the httpx Python library, adding methods that abstract
+    ArchivesSpace-specific functionality.
+
+    Requires httpx, which can be installed with
+    `pip install aspace-client[async]`.
+    """
+
+    def __init__(self, api_host: str = constants.DEFAULT_API_HOST,
+                 username: str = constants.DEFAULT_USERNAME,
+                 password: str = constants.DEFAULT_PASSWORD,
+                 auto_auth=True,
+                 max_connections: int = constants.DEFAULT_ASYNC_MAX_CONNECTIONS,
+                 tracer: tracing.Tracer = None,
+                 **kwargs):
+        """
+        Initializes a new asynchronous ArchivesSpace client.
+
+        :api_host: Url used to connect to the API of the ArchivesSpace
+        instance. Trailing slashes are not required.
+
+        :username: Username of an ASpace user account that has access
+        to the API.
+
+        :password: Password of the ASpace user account.
+
+        :auto_auth: Specifies whether the client automatically sends an
+        authentication request to ArchivesSpace. Coroutines cannot run
+        during initialization, so the request is sent just before the
+        client's first request.
+
+        :max_connections: Maximum number of connections that the client
+        keeps open to the ArchivesSpace instance. Requests over this limit
+        wait for a free connection.
+
+        :tracer: Optional `tracing.Tracer`, which records each request as a
+        span. Please see `BaseASpaceClient`.
+
+        Any other keyword arguments are passed to `httpx.AsyncClient`.
+        """
+
+        if httpx is None:
+            raise ImportError(
+                'AsyncBaseASpaceClient requires httpx. Install it with '
+                '`pip install aspace-client[async]`.'
+            )
+
+        self.aspace_api_host = api_host.strip()
+        self.aspace_username = username
+        self.aspace_password = password
+
+        # In order to make sure that relative endpoints can be predictably
+        # concatenated onto the end of the base url, the url needs to end in a
+        # slash.
+        if not self.aspace_api_host.endswith('/'):
+            self.aspace_api_host += '/'
+
+        self.headers = {'Accept': 'application/json'}
+
+        self.tracer = tracer
+        self._auto_auth = auto_auth
+        self._auth_loop = self._auth_lock_for_loop = None
+
+        # Matches the requests library, which does not time out by default.
+        kwargs.setdefault('timeout', None)
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            **kwargs
+        )
+
+    @classmethod
+    def init_from_config(cls, config: configparser.ConfigParser,
+                         section='aspace_credentials', auto_auth=False):
+        """
+        Initializes an instance of any subclass of AsyncBaseASpaceClient from
+        an instance of the `configparser.ConfigParser` builtin Python config
+        parser. The following keys are read from the specified `section` of
+        the specified `config`. If any are not set, the initializer will use
+        defaults from the `constants` module.
+
+        `"api_host"`: Url used to connect to the API of the ArchivesSpace
+        instance. Trailing slashes are not required.
+
+        `"username"`: Username of an ASpace user account that has access
+        to the API.
+
+        `"password"`: Password of the ASpace user account.
+
+        `"max_connections"`: Maximum number of connections that the client
+        keeps open to the ArchivesSpace instance.
+
+        The other keys read by `BaseASpaceClient.init_from_config`, such as
+        the retry, rate limit, cache, session store and routing settings, are
+        not supported by the asynchronous client, and are ignored.
+        """
+
+        def aspace_credential(term, default=None):
+            return config.get(section, term, fallback=default)
+
+        _self = cls(
+            api_host=aspace_credential(
+                'api_host', constants.DEFAULT_API_HOST),
+
+            username=aspace_credential(
+                'username', constants.DEFAULT_USERNAME),
+
+            password=aspace_credential(
+                'password', constants.DEFAULT_PASSWORD),
+
+            max_connections=config.getint(
+                section, 'max_connections',
+                fallback=constants.DEFAULT_ASYNC_MAX_CONNECTIONS),
+
+            auto_auth=auto_auth,
+        )
+
+        return _self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Closes all of the client's open connections.
+        """
+        await self._http.aclose()
+
+    def _url(self, uri: str) -> str:
+        """
+        Joins a relative endpoint onto the end of the base url.
+        """
+
+        # In order to make sure that relative endpoints can be predictably
+        # concatenated onto the end of the base url, the relative endpoint
+        # needs to have no leading slashes.
+        relative_uri = uri.lstrip(' /') if uri else ''
+        return urllib.parse.urljoin(self.aspace_api_host, relative_uri)
+
+    async def _send(self, method: str, uri: str, **kwargs):
+        headers = dict(self.headers)
+        headers.update(kwargs.pop('headers', None) or {})
+
+        return await self._http.request(
+            method,
+            self._url(uri),
+            headers=headers,
+            **kwargs
+        )
+
+    async def request(self, method: str, uri: str, **kwargs):
+        """
+        Sends a request to an endpoint relative to the base url, returning
+        an `httpx.Response`. The request is replayed after reauthenticating,
+        in the event that a 412 error is reached. An HTTP response code of
+        412 from ArchivesSpace indicates either `SESSION_GONE` or
+        `SESSION_EXPIRED`.
+
+        Each request is recorded as a span by the client's `tracer`, if it
+        has one.
+        """
+
+        if self.tracer is None:
+            return await self._request(method, uri, **kwargs)
+
+        with self.tracer.span('HTTP ' + method, {
+            'http.method': method,
+            'http.url': self._url(uri),
+            'http.endpoint': util.endpoint_template('/' + uri.lstrip(' /')),
+        }) as span:
+            resp = await self._request(method, uri, **kwargs)
+            span.set_attribute('http.status_code', resp.status_code)
+            return resp
+
+    async def _request(self, method: str, uri: str, **kwargs):
+        """
+        Implements `request`.
+        """
+        if self._auto_auth and constants.X_AS_SESSION not in self.headers:
+            await self._reauthenticate(None)
+
+        session = self.headers.get(constants.X_AS_SESSION)
+        resp = await self._send(method, uri, **kwargs)
+
+        # Catches any responses that have a code of 412, indicating either
+        # SESSION_GONE or SESSION_EXPIRED
+        if resp.status_code == 412:
+            await self._reauthenticate(session)
+            resp = await self._send(method, uri, **kwargs)
+
+        return resp
+
+    async def get(self, uri: str, **kwargs):
+        return await self.request('GET', uri, **kwargs)
+
+    async def post(self, uri: str, data=None, json=None, **kwargs):
+        return await self.request('POST', uri, data=data, json=json, **kwargs)
+
+    async def put(self, uri: str, data=None, json=None, **kwargs):
+        return await self.request('PUT', uri, data=data, json=json, **kwargs)
+
+    async def delete(self, uri: str, **kwargs):
+        return await self.request('DELETE', uri, **kwargs)
+
+    async def wait_until_ready(self, check_interval=5.0, max_wait_time=None,
+                               on_fail=None, authenticate_on_success=False):
+        """
+        Periodically checks the `/` endpoint of the base api host until the
+        API becomes ready, or until the max_wait_time is reached. Accepts the
+        same arguments as `BaseASpaceClient.wait_until_ready`.
+
+        Returns a reference to self once finished.
+        """
+
+        timer = 0
+
+        while True:
+            try:
+                if (await self._send('GET', '/')).is_success:
+                    break
+            except httpx.TransportError:
+                pass
+
+            if max_wait_time is not None and timer > max_wait_time:
+                raise Exception(
+                    "The API could not be reached within the maximum allowed "
+                    "time."
+                )
+
+            if callable(on_fail):
+                on_fail()
+
+            await asyncio.sleep(check_interval)
+            timer += check_interval
+
+        if authenticate_on_success:
+            await self.authenticate()
+
+        return self
+
+    @property
+    def _auth_lock(self) -> asyncio.Lock:
+        """
+        Serializes logins. The lock is created inside the running event
+        loop, the first time it is needed there, since asyncio locks can only
+        be used in 1 event loop, and before Python 3.10 are bound to the
+        loop that is current when they are created.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._auth_loop is not loop:
+            self._auth_loop = loop
+            self._auth_lock_for_loop = asyncio.Lock()
+
+        return self._auth_lock_for_loop
+
+    async def _reauthenticate(self, stale_session):
+        """
+        Authenticates, unless another coroutine has already replaced the
+        `stale_session` token while this one was waiting for the lock.
+        """
+        async with self._auth_lock:
+            if self.headers.get(constants.X_AS_SESSION) == stale_session:
+                await self._authenticate()
+
+    async def authenticate(self):
+        """
+        Authenticates the ArchivesSpace API client and sets up the
+        X-ArchivesSpace-Session header for future requests. Returns
+        the JSON response if the login was valid. Raises an error
+        if the HTTP status code was not in the 200 series.
+        """
+        async with self._auth_lock:
+            return await self._authenticate()
+
+    async def _authenticate(self):
+
+        # The login request is sent without the stale session token, which
+        # stays in place for any other requests that are already in flight.
+        resp = await self._http.post(
+            self._url('users/' + self.aspace_username + '/login'),
+            headers={
+                key: value
+                for key, value in self.headers.items()
+                if key != constants.X_AS_SESSION
+            },
+            data={'password': self.aspace_password},
+        )
+
+        assert resp.is_success, (
+            'Received {} while attempting to authenticate: {}'.format(
+                resp.status_code,
+                resp.text,
+            )
+        )
+
+        session = resp.json()['session']
+        self.headers[constants.X_AS_SESSION] = session
+        return resp
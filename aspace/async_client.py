@@ -0,0 +1,29 @@
+r"""
+Contains the AsyncASpaceClient class.
+"""
+
+from aspace import async_base_client
+from aspace.client_extensions import async_record_streams
+
+
+class AsyncASpaceClient(async_base_client.AsyncBaseASpaceClient):
+    """
+    Extends the functionality of the AsyncBaseASpaceClient, by including
+    instances of classes that leverage multiple endpoints of the
+    ArchivesSpace API.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._streams = async_record_streams.AsyncRecordStreamingService(self)
+
+    @property
+    def streams(self) -> async_record_streams.AsyncRecordStreamingService:
+        """
+
+        Returns an instance of the AsyncRecordStreamingService class,
+        providing async generators that stream records and URIs from
+        ArchivesSpace, via the ArchivesSpace API.
+
+        """
+        return self._streams
@@ -3,11 +3,28 @@ Contains the BaseASpaceClient class.
 """
 
 import configparser
+import functools
 import requests
+import threading
 import time
+import typing
 import urllib
 
-from aspace import constants
+import urllib3
+
+from aspace import constants, json_decoding, metrics, util
+
+# The optional components are imported when they are first used, so that
+# short-lived scripts do not pay for the ones that they do not configure.
+if typing.TYPE_CHECKING:
+    from aspace import (
+        cache as response_cache,
+        limiters,
+        retry,
+        routing,
+        session_store as token_store,
+        tracing,
+    )
 
 
 class BaseASpaceClient(requests.Session):
@@ -19,7 +36,20 @@ class BaseASpaceClient(requests.Session):
     def __init__(self, api_host: str = constants.DEFAULT_API_HOST,
                  username: str = constants.DEFAULT_USERNAME,
                  password: str = constants.DEFAULT_PASSWORD,
-                 auto_auth=True):
+                 auto_auth=True,
+                 pool_connections: int = constants.DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = constants.DEFAULT_POOL_MAXSIZE,
+                 pool_block=constants.DEFAULT_POOL_BLOCK,
+                 retry_policy: 'retry.RetryPolicy' = None,
+                 concurrency_limiter: (
+                     'limiters.AdaptiveConcurrencyLimiter') = None,
+                 rate_limiter: 'limiters.RateLimiter' = None,
+                 json_loads=None,
+                 cache: 'response_cache.ResponseCache' = None,
+                 session_store: 'token_store.FileSessionStore' = None,
+                 router: 'routing.BackendRouter' = None,
+                 tracer: 'tracing.Tracer' = None,
+                 transport=constants.DEFAULT_TRANSPORT,):
         """
         Initializes a new ArchivesSpace client.
 
@@ -35,11 +65,81 @@ class BaseASpaceClient(requests.Session):
         sends an authentication request to ArchivesSpace on initialization.
         This should be turned off in cases where the implementing program
         needs to wait for the ArchivesSpace instance to spin up.
+
+        :pool_connections: Number of per-host connection pools that are
+        kept.
+
+        :pool_maxsize: Maximum number of keep-alive connections kept open to
+        each host. Should be at least the number of threads sharing the
+        client, otherwise connections are closed and re-opened under load.
+
+        :pool_block: If True, requests wait for a free connection once
+        `pool_maxsize` connections are in use, instead of opening extra
+        connections that are discarded afterwards.
+
+        :retry_policy: Optional `retry.RetryPolicy`, used to retry requests
+        that fail because of transient server or network errors. If omitted,
+        failed requests are not retried.
+
+        :concurrency_limiter: Optional
+        `limiters.AdaptiveConcurrencyLimiter`, shared by every thread using
+        the client. Requests wait for the limiter before being sent, so that
+        streams with a high `concurrency` only keep as many requests in
+        flight as ArchivesSpace can handle without slowing down.
+
+        :rate_limiter: Optional `limiters.RateLimiter`, shared by every thread
+        using the client, which puts a ceiling on the number of requests per
+        second, globally and for specific endpoints.
+
+        :json_loads: Optional function used by `Response.json()` to decode
+        the bytes of each response body. Defaults to `json_decoding.loads`,
+        which uses orjson when it is installed.
+
+        :cache: Optional `cache.ResponseCache`. GET responses with an `ETag`
+        or `Last-Modified` header are stored, and revalidated with
+        conditional requests. Record streams also use the cache. Please see
+        the `cache` module.
+
+        :session_store: Optional `session_store.FileSessionStore`, shared with
+        other processes. A session token found in the store is used instead
+        of logging in, and tokens from new logins are saved to it. If the
+        stored token has expired, the client logs in when it receives a 412.
+
+        :router: Optional `routing.BackendRouter`, which spreads requests
+        across several backend nodes. If specified, `api_host` is ignored,
+        and relative endpoints are joined onto the router's primary host.
+
+        :tracer: Optional `tracing.Tracer`. Each request is recorded as a
+        span, which is a child of the span of the high-level operation that
+        sent it, such as `TopContainerManagementService.linked_records`.
+
+        :transport: Name of the library that requests are sent with, either
+        `"requests"` or `"httpx"`, which can multiplex concurrent requests
+        over HTTP/2 connections. Can also be a `requests` transport adapter.
+        Please see the `transports` module.
         """
 
         super().__init__()
 
-        self.aspace_api_host = api_host.strip()
+        from aspace import transports
+
+        adapter = (
+            transports.create_adapter(
+                transport,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            if isinstance(transport, str) else
+            transport
+        )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+        self.pool_maxsize = getattr(adapter, 'pool_maxsize', pool_maxsize)
+
+        self.aspace_api_host = (
+            router.primary if router is not None else api_host.strip()
+        )
         self.aspace_username = username
         self.aspace_password = password
 
@@ -51,7 +151,31 @@ class BaseASpaceClient(requests.Session):
 
         self.headers['Accept'] = 'application/json'
 
-        if auto_auth:
+        # Offers every compression format that the transport is able to
+        # decode. urllib3's include brotli and zstd when their packages are
+        # installed.
+        self.headers['Accept-Encoding'] = getattr(
+            adapter, 'accept_encoding', urllib3.util.request.ACCEPT_ENCODING)
+
+        self.bandwidth_meter = metrics.BandwidthMeter()
+        self.request_metrics = metrics.RequestMetrics()
+        self.retry_policy = retry_policy
+        self.concurrency_limiter = concurrency_limiter
+        self.rate_limiter = rate_limiter
+        self.json_loads = json_loads or json_decoding.loads
+        self.cache = cache
+        self.session_store = session_store
+        self.router = router
+        self.tracer = tracer
+
+        if router is not None:
+            router.probe = self._probe
+
+        # Serializes logins, so that concurrent requests that all receive a
+        # 412 share a single re-authentication.
+        self._auth_lock = threading.RLock()
+
+        if auto_auth and not self._load_stored_session():
             self.authenticate()
 
     @classmethod
@@ -71,11 +195,111 @@ class BaseASpaceClient(requests.Session):
         to the API.
 
         `"password"`: Password of the ASpace user account.
+
+        `"pool_connections"`, `"pool_maxsize"`, `"pool_block"`: Connection
+        pool settings. Please see the docs for `__init__`.
+
+        `"retry_max_attempts"`, `"retry_backoff_factor"`: If
+        `retry_max_attempts` is greater than 1, failed requests are retried
+        using a `retry.RetryPolicy` with these settings.
+
+        `"rate_limit"`, `"rate_limit_burst"`: If `rate_limit` is set, the
+        client sends at most that many requests per second, using a
+        `limiters.RateLimiter`.
+
+        `"cache_dir"`, `"cache_max_bytes"`: If `cache_dir` is set, responses
+        are cached in that directory, using a `cache.ResponseCache`.
+
+        `"session_store_path"`: If set, session tokens are shared with other
+        processes through this file, using a `session_store.FileSessionStore`.
+
+        `"api_hosts"`, `"routing_strategy"`, `"routing_pin_writes"`: If
+        `api_hosts` is set to a comma separated list of urls, requests are
+        spread across those backend nodes using a `routing.BackendRouter`,
+        and `api_host` is ignored.
+
+        `"transport"`: Library that requests are sent with, either
+        `"requests"` or `"httpx"`. Please see the `transports` module.
         """
 
+        from aspace import (
+            cache as response_cache,
+            limiters,
+            retry,
+            routing,
+            session_store as token_store,
+        )
+
         def aspace_credential(term, default=None):
             return config.get(section, term, fallback=default)
 
+        retry_max_attempts = config.getint(
+            section, 'retry_max_attempts', fallback=1)
+
+        retry_policy = (
+            retry.RetryPolicy(
+                max_attempts=retry_max_attempts,
+                backoff_factor=config.getfloat(
+                    section, 'retry_backoff_factor',
+                    fallback=constants.DEFAULT_RETRY_BACKOFF_FACTOR),
+            )
+            if retry_max_attempts > 1 else
+            None
+        )
+
+        rate_limit = config.getfloat(section, 'rate_limit', fallback=None)
+
+        rate_limiter = (
+            limiters.RateLimiter(
+                rate=rate_limit,
+                burst=config.getfloat(
+                    section, 'rate_limit_burst', fallback=None),
+            )
+            if rate_limit else
+            None
+        )
+
+        cache_dir = config.get(section, 'cache_dir', fallback=None)
+
+        cache = (
+            response_cache.ResponseCache(
+                cache_dir,
+                max_bytes=config.getint(
+                    section, 'cache_max_bytes',
+                    fallback=constants.DEFAULT_CACHE_MAX_BYTES),
+            )
+            if cache_dir else
+            None
+        )
+
+        session_store_path = config.get(
+            section, 'session_store_path', fallback=None)
+
+        session_store = (
+            token_store.FileSessionStore(session_store_path)
+            if session_store_path else
+            None
+        )
+
+        api_hosts = [
+            host.strip()
+            for host in aspace_credential('api_hosts', '').split(',')
+            if host.strip()
+        ]
+
+        router = (
+            routing.BackendRouter(
+                api_hosts,
+                strategy=config.get(
+                    section, 'routing_strategy',
+                    fallback=constants.DEFAULT_ROUTING_STRATEGY),
+                pin_writes=config.getboolean(
+                    section, 'routing_pin_writes', fallback=False),
+            )
+            if api_hosts else
+            None
+        )
+
         _self = cls(
             api_host=aspace_credential(
                 'api_host', constants.DEFAULT_API_HOST),
@@ -87,6 +311,28 @@ class BaseASpaceClient(requests.Session):
                 'password', constants.DEFAULT_PASSWORD),
 
             auto_auth=auto_auth,
+
+            pool_connections=config.getint(
+                section, 'pool_connections',
+                fallback=constants.DEFAULT_POOL_CONNECTIONS),
+
+            pool_maxsize=config.getint(
+                section, 'pool_maxsize',
+                fallback=constants.DEFAULT_POOL_MAXSIZE),
+
+            pool_block=config.getboolean(
+                section, 'pool_block',
+                fallback=constants.DEFAULT_POOL_BLOCK),
+
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            session_store=session_store,
+            router=router,
+
+            transport=config.get(
+                section, 'transport',
+                fallback=constants.DEFAULT_TRANSPORT),
         )
 
         return _self
@@ -115,26 +361,536 @@ class BaseASpaceClient(requests.Session):
         replay the request, in the event that a 412 error is reached. An HTTP
         response code of 412 from ArchivesSpace indicates either `SESSION_GONE`
         or `SESSION_EXPIRED`.
+
+        Safe to call from multiple threads. When several requests receive a
+        412 for the same expired session, only 1 of them logs in, and all of
+        them are replayed using the new session.
+
+        Requests that fail with a transient error are retried according to
+        the client's `retry_policy`.
+
+        GET requests are revalidated against the client's `cache`, if it has
+        one.
+
+        Every request is counted in the client's `request_metrics`, and
+        recorded as a span by the client's `tracer`, if it has one.
         """
 
-        resp = super().send(request, **kwargs)
+        endpoint = util.endpoint_template(self.relative_uri(request.url))
+
+        if self.tracer is None:
+            return self._send_and_reauthenticate(request, endpoint, **kwargs)
+
+        with self.tracer.span('HTTP ' + request.method, {
+            'http.method': request.method,
+            'http.url': request.url,
+            'http.endpoint': endpoint,
+        }) as span:
+            resp = self._send_and_reauthenticate(request, endpoint, **kwargs)
+            span.set_attribute('http.status_code', resp.status_code)
+            return resp
+
+    def _send_and_reauthenticate(self, request: requests.PreparedRequest,
+                                 endpoint: str, **kwargs):
+        """
+        Implements `send`, for a request to the endpoint template `endpoint`.
+        """
+        cache_uri = self._cache_uri(request, **kwargs)
+        cache_entry = self._add_conditional_headers(request, cache_uri)
+
+        resp = self._measured_send(request, endpoint, **kwargs)
 
         # Catches any responses that have a code of 412, indicating either
-        # SESSION_GONE or SESSION_EXPIRED
-        if resp.status_code == 412:
-            self.authenticate()
+        # SESSION_GONE or SESSION_EXPIRED. A token taken from the session
+        # store may itself have expired, in which case the client logs in and
+        # replays the request once more.
+        attempts = 2 if self.session_store is not None else 1
+
+        while resp.status_code == 412 and attempts:
+            attempts -= 1
+            resp.close()
+            self.request_metrics.record_reauthentication(endpoint)
+            self._reauthenticate(request.headers.get(constants.X_AS_SESSION))
             request.headers[constants.X_AS_SESSION] = (
                 self.headers[constants.X_AS_SESSION]
             )
-            resp = super().send(request, **kwargs)
+            resp = self._measured_send(request, endpoint, **kwargs)
+
+        # Re-authentication did not produce a token that works, so it is
+        # removed from the session store instead of being shared further.
+        if resp.status_code == 412:
+            self._discard_stored_session(
+                request.headers.get(constants.X_AS_SESSION))
+
+        if cache_uri is not None:
+            self._update_cache(cache_uri, cache_entry, resp)
+        # Deleted records are removed from the cache.
+        elif (self.cache is not None and request.method == 'DELETE'
+                and resp.ok):
+            self.cache.delete(
+                self.relative_uri(request.url), scope=self.cache_scope)
+
+        # Decodes JSON with the client's json_loads function.
+        if type(resp) is requests.Response:
+            resp.__class__ = json_decoding.JSONResponse
+            resp.json_loads = self.json_loads
+            resp.on_complete = self._measure_response
+
+        # Streamed responses are measured once they are closed.
+        if not kwargs.get('stream') and hasattr(resp, 'complete'):
+            resp.complete()
 
         return resp
 
+    def _cache_uri(self, request: requests.PreparedRequest, **kwargs) -> str:
+        """
+        Returns the cache key for a request, or `None` if the request's
+        response should not be cached.
+        """
+        if (self.cache is None or request.method != 'GET'
+                or kwargs.get('stream')):
+            return None
+
+        uri = self.relative_uri(request.url)
+
+        # Lists, searches and other queries change too often to cache.
+        if '?' in uri:
+            return None
+
+        return uri
+
+    def _add_conditional_headers(self, request: requests.PreparedRequest,
+                                 cache_uri: str) -> dict:
+        """
+        Makes the request conditional on the cached response for
+        `cache_uri` having changed. Returns the cache entry, or `None` if
+        there is no entry that can be revalidated.
+        """
+        if cache_uri is None:
+            return None
+
+        entry = self.cache.get(cache_uri, scope=self.cache_scope)
+
+        if entry is None or not (entry['etag'] or entry['last_modified']):
+            return None
+
+        if entry['etag']:
+            request.headers['If-None-Match'] = entry['etag']
+
+        if entry['last_modified']:
+            request.headers['If-Modified-Since'] = entry['last_modified']
+
+        return entry
+
+    def _update_cache(self, cache_uri: str, cache_entry: dict,
+                      resp: requests.Response):
+        """
+        Serves a 304 response from the cache, or stores a new response that
+        can be revalidated later.
+        """
+        if resp.status_code == 304 and cache_entry is not None:
+            self.cache.record_revalidation()
+            resp.status_code = 200
+            resp.reason = 'OK'
+            resp._content = cache_entry['body']
+            resp.from_cache = True
+            return
+
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+
+        if resp.status_code == 200 and (etag or last_modified):
+            self.cache.put(
+                cache_uri,
+                resp.content,
+                etag=etag,
+                last_modified=last_modified,
+                scope=self.cache_scope,
+            )
+
+        # The record no longer exists, so its cached copy is removed.
+        elif resp.status_code in (404, 410):
+            self.cache.delete(cache_uri, scope=self.cache_scope)
+
+    @property
+    def cache_scope(self) -> str:
+        """
+        The scope that the client's responses are stored under in its
+        `cache`, made up of its username and API host, so that clients of
+        other instances, or other users, that share the cache directory do
+        not read them.
+        """
+        return '%s@%s' % (self.aspace_username, self.aspace_api_host)
+
+    def cache_stats(self) -> dict:
+        """
+        Returns the counters of the client's `cache`. Please see
+        `cache.ResponseCache.stats`.
+        """
+        if self.cache is None:
+            return {}
+
+        return self.cache.stats()
+
+    def _measure_response(self, resp: requests.Response):
+        """
+        Records the compressed and decompressed size of a response body.
+        """
+        decoded_bytes = (
+            len(resp._content) if isinstance(resp._content, bytes) else
+            getattr(resp, 'decoded_bytes', 0)
+        )
+
+        wire_bytes = (
+            resp.raw.tell() if hasattr(resp.raw, 'tell') else
+            decoded_bytes
+        )
+
+        self.bandwidth_meter.record(
+            util.endpoint_template(self.relative_uri(resp.request.url)),
+            wire_bytes=wire_bytes,
+            decoded_bytes=decoded_bytes,
+            encoding=resp.headers.get('Content-Encoding'),
+        )
+
+    def bandwidth_stats(self) -> dict:
+        """
+        Returns the number of bytes received for each endpoint template, as
+        sent over the wire and after decompression. Please see
+        `metrics.BandwidthMeter.snapshot`.
+        """
+        return self.bandwidth_meter.snapshot()
+
+    def _measured_send(self, request: requests.PreparedRequest,
+                       endpoint: str, **kwargs):
+        """
+        Sends the request using `_send`, recording its status code and
+        latency under `endpoint` in the client's `request_metrics`. The
+        latency includes any retries, and for streamed responses, ends once
+        the headers have been received.
+        """
+        start = time.perf_counter()
+        status_code = None
+
+        try:
+            resp = self._send(request, **kwargs)
+            status_code = resp.status_code
+            return resp
+        finally:
+            self.request_metrics.record(
+                request.method,
+                endpoint,
+                status_code,
+                time.perf_counter() - start,
+            )
+
+    def metrics_snapshot(self) -> dict:
+        """
+        Returns the request counts, status codes and latencies for each
+        endpoint template, with the bytes received from it. Please see
+        `metrics.RequestMetrics.snapshot` and
+        `metrics.BandwidthMeter.snapshot`.
+        """
+        snapshot = self.request_metrics.snapshot()
+        bandwidth = self.bandwidth_meter.snapshot()
+
+        for key in ('wire_bytes', 'decoded_bytes'):
+            snapshot['total'][key] = bandwidth['total'][key]
+
+            for endpoint, stats in snapshot['endpoints'].items():
+                stats[key] = (
+                    bandwidth['endpoints'].get(endpoint, {}).get(key, 0)
+                )
+
+        return snapshot
+
+    def prometheus_metrics(self,
+                           prefix: str = constants.DEFAULT_METRICS_PREFIX
+                           ) -> str:
+        """
+        Returns the client's request and bandwidth metrics in the Prometheus
+        text exposition format, ready to be served from a `/metrics`
+        endpoint.
+        """
+        return (
+            self.request_metrics.prometheus_text(prefix)
+            + self.bandwidth_meter.prometheus_text(prefix)
+        )
+
+    def _send(self, request: requests.PreparedRequest, **kwargs):
+        """
+        Sends the request using Session.send, retrying it according to the
+        client's `retry_policy`. Each attempt waits for the client's
+        `rate_limiter`, then for a slot from its `concurrency_limiter`, and
+        is then sent to the backend node chosen by its `router`.
+        """
+        send = functools.partial(super().send, **kwargs)
+
+        if self.router is not None:
+            send = functools.partial(self._route, send)
+
+        if self.concurrency_limiter is not None:
+            send = functools.partial(
+                self.concurrency_limiter.call,
+                send,
+                endpoint=self._latency_key(request),
+
+                # Streamed requests are only timed until their headers
+                # arrive, and logins are not limited by the server's load.
+                sample_latency=not (
+                    kwargs.get('stream') or request.url.endswith('/login')
+                ),
+            )
+
+        if self.rate_limiter is not None:
+            send = functools.partial(
+                self.rate_limiter.call,
+                self.relative_uri(request.url),
+                send,
+            )
+
+        if self.retry_policy is None:
+            return send(request)
+
+        return self.retry_policy.send(send, request)
+
+    def _latency_key(self, request: requests.PreparedRequest) -> str:
+        """
+        Returns the key that the `concurrency_limiter` compares the latency
+        of a request with others under: its method, endpoint template and
+        the names of its query parameters, so that, for example, `all_ids`
+        listings and `id_set` batches from the same endpoint are compared
+        separately.
+        """
+        uri = self.relative_uri(request.url)
+        params = sorted(set(
+            name for name, _ in urllib.parse.parse_qsl(
+                urllib.parse.urlsplit(uri).query, keep_blank_values=True)
+        ))
+
+        return '%s %s%s' % (
+            request.method,
+            util.endpoint_template(uri),
+            '?' + '&'.join(params) if params else '',
+        )
+
+    def _route(self, send, request: requests.PreparedRequest):
+        """
+        Points the request at the backend node chosen by the client's
+        `router`, and sends it. Each attempt is routed separately, so that
+        retries can fail over to another node.
+        """
+        host = self.router.choose(request.method)
+        request.url = host + self.relative_uri(request.url).lstrip('/')
+        return self.router.call(host, send, request)
+
+    def backend_stats(self) -> dict:
+        """
+        Returns the state of each backend node of the client's `router`.
+        Please see `routing.BackendRouter.stats`.
+        """
+        if self.router is None:
+            return {}
+
+        return self.router.stats()
+
+    def relative_uri(self, url: str) -> str:
+        """
+        Returns the URI of a request url relative to the API host, with a
+        leading slash, such as `/repositories/2/search?page=1`.
+        """
+        hosts = (
+            self.router.hosts if self.router is not None else
+            [self.aspace_api_host]
+        )
+
+        for host in hosts:
+            if url.startswith(host):
+                return '/' + url[len(host):]
+
+        parsed = urllib.parse.urlsplit(url)
+        return parsed.path + ('?' + parsed.query if parsed.query else '')
+
+    def retry_stats(self) -> dict:
+        """
+        Returns the request and retry counts of the client's `retry_policy`.
+        Please see `retry.RetryPolicy.stats`.
+        """
+        if self.retry_policy is None:
+            return {}
+
+        return self.retry_policy.stats()
+
+    def _reauthenticate(self, stale_session: str):
+        """
+        Authenticates, unless another thread has already replaced the
+        `stale_session` token while this one was waiting for the lock, or
+        another process has already saved a newer token to the session
+        store.
+        """
+        with self._auth_lock:
+            if self.headers.get(constants.X_AS_SESSION) != stale_session:
+                return
+
+            if self._load_stored_session(stale_session):
+                return
+
+            try:
+                self.authenticate()
+            except BaseException:
+                self._discard_stored_session(stale_session)
+                raise
+
+    def _discard_stored_session(self, session: str):
+        """
+        Removes the `session` token from the client's `session_store`, if it
+        has one, so that other processes log in instead of using it. A token
+        that another process has since replaced is kept.
+        """
+        if self.session_store is None or not session:
+            return
+
+        self.session_store.discard(
+            self.aspace_api_host, self.aspace_username, session)
+
+    def _load_stored_session(self, stale_session: str = None) -> bool:
+        """
+        Uses the token from the client's `session_store`, if it has one that
+        is different from `stale_session`. Returns True if a stored token is
+        now in use.
+        """
+        if self.session_store is None:
+            return False
+
+        session = self.session_store.load(
+            self.aspace_api_host, self.aspace_username)
+
+        if not session or session == stale_session:
+            return False
+
+        self._set_session(session)
+        return True
+
+    def _set_session(self, session: str):
+        """
+        Sets the X-ArchivesSpace-Session header used by future requests.
+        """
+
+        # The headers are replaced rather than modified in place, so that
+        # requests being prepared on other threads never see a partially
+        # updated dict.
+        headers = self.headers.copy()
+        headers[constants.X_AS_SESSION] = session
+        self.headers = headers
+
+    def _connection_pools(self) -> list:
+        """
+        Returns the urllib3 connection pools currently held by the client.
+        """
+        pools = []
+
+        for adapter in set(self.adapters.values()):
+            pool_manager = getattr(adapter, 'poolmanager', None)
+            if pool_manager is None:
+                continue
+
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(key)
+                if pool is not None:
+                    pools.append(pool)
+
+        return pools
+
+    def warm_up(self, connections: int,
+                timeout: float = constants.DEFAULT_WARM_UP_TIMEOUT) -> int:
+        """
+        Opens up to `connections` keep-alive connections to the API host
+        ahead of time, so that the first concurrent requests do not pay for
+        TCP and TLS handshakes. Returns the number of warm-up requests that
+        succeeded.
+
+        Sends concurrent GET requests to the root of the API, and only reads
+        their bodies once every response has arrived, or `timeout` seconds
+        have passed, so that each request holds its own connection. No more
+        requests are sent than the client's `pool_maxsize`, or the current
+        limit of its `concurrency_limiter`, allow in flight. An HTTP/2
+        connection carries every concurrent request, so the `"httpx"`
+        transport only opens 1.
+        """
+        connections = min(connections, self.pool_maxsize)
+        if self.concurrency_limiter is not None:
+            connections = min(connections, self.concurrency_limiter.limit)
+
+        connections = max(connections, 1)
+        received = threading.Barrier(connections)
+
+        def get(_):
+            try:
+                resp = self.get('/', stream=True)
+            except BaseException:
+                received.abort()
+                raise
+
+            with resp:
+
+                # Reading the body returns the connection to the pool, so it
+                # waits until every request has checked out a connection.
+                try:
+                    received.wait(timeout)
+                except threading.BrokenBarrierError:
+                    pass
+
+                resp.content
+                return resp.ok
+
+        return sum(util.concurrent_map(
+            get, range(connections), concurrency=connections))
+
+    def connection_stats(self) -> dict:
+        """
+        Returns connection reuse statistics for each host that the client
+        has connected to, keyed by host url:
+
+        ```
+        {
+            'connections': int,  # Connections opened
+            'requests': int,     # Requests sent
+            'reused': int,       # Requests sent over an existing connection
+            'idle': int,         # Keep-alive connections ready for reuse
+        }
+        ```
+
+        With the `"httpx"` transport, `idle` is replaced by `http_versions`,
+        the number of requests sent with each HTTP version.
+        """
+        stats = {}
+
+        for pool in self._connection_pools():
+            host = '%s://%s:%s' % (pool.scheme, pool.host, pool.port)
+            stats[host] = {
+                'connections': pool.num_connections,
+                'requests': pool.num_requests,
+                'reused': max(pool.num_requests - pool.num_connections, 0),
+                'idle': sum(
+                    1 for conn in list(pool.pool.queue)
+                    if conn is not None
+                ),
+            }
+
+        # Transports without urllib3 pools report their own statistics.
+        for adapter in set(self.adapters.values()):
+            if hasattr(adapter, 'connection_stats'):
+                stats.update(adapter.connection_stats())
+
+        return stats
+
     def wait_until_ready(self, check_interval=5.0, max_wait_time=None,
                          on_fail=None, authenticate_on_success=False):
         """
         Periodically checks the `/` endpoint of the base api host until the
-        API becomes ready, or until the max_wait_time is reached.
+        API becomes ready, or until the max_wait_time is reached. With a
+        `router`, every backend node is checked, and the API is ready once
+        any of them is.
 
         Returns a reference to self once finished.
 
@@ -157,11 +913,13 @@ class BaseASpaceClient(requests.Session):
         timer = 0
 
         while True:
-            try:
-                if self.get('/').ok:
-                    break
-            except requests.exceptions.ConnectionError:
-                pass
+            ready = (
+                self.router.probe_all() if self.router is not None else
+                self._probe(self.aspace_api_host)
+            )
+
+            if ready:
+                break
 
             if max_wait_time is not None and timer > max_wait_time:
                 raise Exception(
@@ -180,6 +938,23 @@ class BaseASpaceClient(requests.Session):
 
         return self
 
+    def _probe(self, host: str, timeout: float = None) -> bool:
+        """
+        Returns True if the `/` endpoint of the API at `host` responds
+        successfully. The probe is sent straight to `host`, without routing,
+        retries or rate limiting.
+        """
+        request = self.prepare_request(requests.Request('GET', host))
+
+        try:
+            resp = super().send(request, timeout=timeout)
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout):
+            return False
+
+        resp.close()
+        return resp.ok
+
     def authenticate(self):
         """
         Authenticates the ArchivesSpace API client and sets up the
@@ -188,21 +963,30 @@ class BaseASpaceClient(requests.Session):
         if the HTTP status code was not in the 200 series.
         """
 
-        if constants.X_AS_SESSION in self.headers:
-            del self.headers[constants.X_AS_SESSION]
+        with self._auth_lock:
 
-        resp = self.post(
-            'users/' + self.aspace_username + '/login',
-            {'password': self.aspace_password}
-        )
+            # The login request is sent without the stale session header,
+            # which stays in place for any requests already in flight.
+            resp = self.post(
+                'users/' + self.aspace_username + '/login',
+                {'password': self.aspace_password},
+                headers={constants.X_AS_SESSION: None},
+            )
 
-        assert resp.ok, (
-            'Received {} while attempting to authenticate: {}'.format(
-                resp.status_code,
-                resp.text,
+            assert resp.ok, (
+                'Received {} while attempting to authenticate: {}'.format(
+                    resp.status_code,
+                    resp.text,
+                )
             )
-        )
 
-        session = resp.json()['session']
-        self.headers[constants.X_AS_SESSION] = session
-        return resp
+            self._set_session(resp.json()['session'])
+
+            if self.session_store is not None:
+                self.session_store.save(
+                    self.aspace_api_host,
+                    self.aspace_username,
+                    self.headers[constants.X_AS_SESSION],
+                )
+
+            return resp
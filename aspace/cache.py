@@ -0,0 +1,313 @@
+r"""
+Contains the ResponseCache class, an optional persistent cache of response
+bodies used by BaseASpaceClient and the RecordStreamingService.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from aspace import constants
+
+
+class ResponseCache(object):
+    """
+    Stores response bodies on disk, keyed by URI and scope. The cache is
+    bounded by `max_bytes`, evicting the least recently used entries first.
+
+    A scope is kept for each ArchivesSpace instance and user, which
+    BaseASpaceClient passes as its `cache_scope`, since different users may
+    be allowed to see different records. Entries and sync times stored under
+    one scope are never read under another.
+
+    Entries are revalidated in 2 ways:
+
+    1. BaseASpaceClient sends conditional GETs (`If-None-Match` or
+       `If-Modified-Since`) for entries that were stored with an `ETag` or
+       `Last-Modified` header, and serves a 304 response from the cache.
+    2. RecordStreamingService lists the IDs of the records that have been
+       modified since the last complete pass over a list endpoint, using the
+       `modified_since` parameter, and serves all of the other records from
+       the cache.
+
+    Entries and sync times are each written atomically to their own file,
+    so a cache directory can be shared by several processes, and by clients
+    of different instances or users.
+
+    The size bound is kept by each process separately: a process counts the
+    entries that were on disk when it first needed the size, plus the
+    entries that it has stored since. Several processes sharing a directory
+    can together exceed `max_bytes` until one of them is restarted.
+    """
+
+    _SYNC_TIMES_DIR = 'sync_times'
+
+    def __init__(self, directory: str,
+                 max_bytes: int = constants.DEFAULT_CACHE_MAX_BYTES,):
+        """
+        :directory: Directory that the cache is stored in. It is created if
+        it does not exist.
+
+        :max_bytes: Maximum total size of the cached entries.
+        """
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        self._counts = collections.Counter()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Maps entry paths to their sizes, least recently used first. The
+        # directory is only scanned once the sizes are needed, since a large
+        # cache takes a while to scan.
+        self._index = None
+        self._size = 0
+
+    @property
+    def _entries(self) -> collections.OrderedDict:
+        """
+        Returns the index of entry sizes, scanning the directory for it the
+        first time. Must be called with the lock held.
+        """
+        if self._index is None:
+            self._index = collections.OrderedDict(
+                (path, size)
+                for _, path, size in sorted(self._scan())
+            )
+            self._size = sum(self._index.values())
+            self._evict()
+
+        return self._index
+
+    def _scan(self):
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if not filename.endswith('.entry'):
+                    continue
+
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                yield stat.st_mtime, path, stat.st_size
+
+    def _path(self, uri: str, scope: str = None) -> str:
+        digest = hashlib.sha1(
+            ('%s\n%s' % (scope or '', uri)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + '.entry')
+
+    def _write_atomic(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def get(self, uri: str, scope: str = None) -> dict:
+        """
+        Returns the cached entry for `uri` in `scope`, or `None`:
+
+        ```
+        {
+            'uri': str,
+            'scope': str,           # Or None
+            'body': bytes,
+            'etag': str,            # Or None
+            'last_modified': str,   # Or None
+            'stored_at': float,     # Unix timestamp
+        }
+        ```
+        """
+        path = self._path(uri, scope)
+
+        try:
+            with open(path, 'rb') as entry_file:
+                header, body = entry_file.read().split(b'\n', 1)
+            entry = json.loads(header.decode('utf-8'))
+        except (OSError, ValueError):
+            with self._lock:
+                self._counts['misses'] += 1
+            return None
+
+        if entry.get('uri') != uri or entry.get('scope') != scope:
+            with self._lock:
+                self._counts['misses'] += 1
+            return None
+
+        entry['body'] = body
+
+        with self._lock:
+            self._counts['hits'] += 1
+            if self._index is not None and path in self._index:
+                self._index.move_to_end(path)
+
+        # Keeps the recency of the entry on disk, for the next process.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry
+
+    def put(self, uri: str, body: bytes, etag: str = None,
+            last_modified: str = None, scope: str = None):
+        """
+        Stores a response body for `uri` in `scope`, with its optional
+        validators, and evicts the least recently used entries if the cache
+        is over its maximum size.
+        """
+        header = json.dumps({
+            'uri': uri,
+            'scope': scope,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+        }).encode('utf-8')
+
+        data = header + b'\n' + body
+        path = self._path(uri, scope)
+
+        if len(data) > self.max_bytes:
+            return
+
+        self._write_atomic(path, data)
+
+        with self._lock:
+            entries = self._entries
+            self._size += len(data) - entries.pop(path, 0)
+            entries[path] = len(data)
+            self._counts['stores'] += 1
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self._size -= size
+            self._counts['evictions'] += 1
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def delete(self, uri: str, scope: str = None):
+        """
+        Removes the entry for `uri` in `scope`, if there is one.
+        """
+        path = self._path(uri, scope)
+
+        with self._lock:
+            if self._index is not None:
+                self._size -= self._index.pop(path, 0)
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def record_revalidation(self):
+        """
+        Counts a conditional request that was answered with a 304.
+        """
+        with self._lock:
+            self._counts['revalidated'] += 1
+
+    def _sync_time_path(self, list_uri: str, scope: str = None) -> str:
+        digest = hashlib.sha1(
+            ('%s\n%s' % (scope or '', list_uri)).encode('utf-8')).hexdigest()
+        return os.path.join(
+            self.directory, self._SYNC_TIMES_DIR, digest + '.json')
+
+    def get_sync_time(self, list_uri: str, scope: str = None) -> float:
+        """
+        Returns the time at which the last complete pass over `list_uri` in
+        `scope` started, or `None` if there has not been one.
+        """
+        try:
+            with open(self._sync_time_path(list_uri, scope),
+                      'r') as sync_file:
+                sync_time = json.load(sync_file)
+        except (OSError, ValueError):
+            return None
+
+        if (sync_time.get('list_uri') != list_uri
+                or sync_time.get('scope') != scope):
+            return None
+
+        return sync_time.get('sync_time')
+
+    def set_sync_time(self, list_uri: str, sync_time: float,
+                      scope: str = None):
+        """
+        Records the time at which a complete pass over `list_uri` in `scope`
+        started. Each sync time is kept in its own file, so processes that
+        record the sync times of different list endpoints never overwrite
+        each other's.
+        """
+        self._write_atomic(
+            self._sync_time_path(list_uri, scope),
+            json.dumps({
+                'list_uri': list_uri,
+                'scope': scope,
+                'sync_time': sync_time,
+            }).encode('utf-8'),
+        )
+
+    def stats(self) -> dict:
+        """
+        Returns the cache's counters and size:
+
+        ```
+        {
+            'hits': int,
+            'misses': int,
+            'revalidated': int,  # 304 responses served from the cache
+            'stores': int,
+            'evictions': int,
+            'entries': int,
+            'bytes': int,
+        }
+        ```
+        """
+        with self._lock:
+            stats = {
+                key: self._counts[key]
+                for key in ('hits', 'misses', 'revalidated', 'stores',
+                            'evictions')
+            }
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._size
+            return stats
+
+    def clear(self):
+        """
+        Removes every entry and sync time from the cache.
+        """
+        with self._lock:
+            for path in list(self._entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+            self._entries.clear()
+            self._size = 0
+
+            shutil.rmtree(
+                os.path.join(self.directory, self._SYNC_TIMES_DIR),
+                ignore_errors=True,
+            )
@@ -10,9 +10,30 @@ of utilities included in this package are
 These components can be accessed through the ASpaceClient class.
 """
 
-import aspace.client_extensions.record_streams
-import aspace.client_extensions.user_management
-import aspace.client_extensions.enum_management
-import aspace.client_extensions.schema_query
-import aspace.client_extensions.jobs
-import aspace.client_extensions.top_containers
+import importlib
+
+
+# Modules that are available as attributes of the package, and are imported
+# on first access, so that the synchronous client does not import the asyncio
+# streams, and vice versa.
+_SUBMODULES = frozenset([
+    'async_record_streams',
+    'enum_management',
+    'jobs',
+    'record_streams',
+    'schema_query',
+    'top_containers',
+    'user_management',
+])
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module('.' + name, __name__)
+
+    raise AttributeError(
+        'module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
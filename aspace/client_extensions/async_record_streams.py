@@ -0,0 +1,319 @@
+from aspace import constants, async_base_client, tracing, util
+from aspace.client_extensions.record_streams import RecordStreamingService
+
+
+class AsyncRecordStreamingService(object):
+    """
+    The asyncio counterpart of RecordStreamingService. Contains methods that
+    asynchronously stream all records from an instance of ArchivesSpace of a
+    particular record type. All of the streams are async generators.
+    """
+
+    def __init__(self, client: async_base_client.AsyncBaseASpaceClient):
+        self._client = client
+
+    @tracing.traced
+    async def repositories(self):
+        """
+        Streams all repository records from the ArchivesSpace instance.
+        """
+        for repo in (await self._client.get('/repositories')).json():
+            yield repo
+
+    async def _get_repo_uris(self, repository_uris: list = None) -> list:
+        """
+        Returns a list of valid repository URIs in the ArchivesSpace
+        instance, or raises an error.
+        """
+        return RecordStreamingService._clean_repo_uris(
+            repository_uris
+            if repository_uris is not None else
+            [repo['uri'] async for repo in self.repositories()]
+        )
+
+    async def _list_uris(self, plural_record_type: str,
+                         repository_uris: list = None,) -> list:
+        plural_record_type = plural_record_type.strip('/')
+
+        return [
+            '%s/%s' % (repo_uri, plural_record_type)
+            for repo_uri in await self._get_repo_uris(repository_uris)
+        ]
+
+    async def _all_ids(self, list_uri: str) -> list:
+        return (await self._client.get('%s?all_ids=true' % list_uri)).json()
+
+    async def _get_batch(self, list_uri: str, batch: list) -> list:
+        # Records deleted since their IDs were listed are left out, as they
+        # are by the id_set parameter.
+        if len(batch) == 1:
+            resp = await self._client.get('%s/%d' % (list_uri, batch[0]))
+            if resp.status_code == 404:
+                return []
+
+            resp.raise_for_status()
+            return [resp.json()]
+
+        resp = await self._client.get(
+            list_uri,
+            params={'id_set': RecordStreamingService._id_set(batch)},
+        )
+        resp.raise_for_status()
+
+        records = RecordStreamingService._records_by_id(resp.json())
+        return [records[_id] for _id in batch if _id in records]
+
+    async def _get_json(self, uri: str):
+        return (await self._client.get(uri)).json()
+
+    async def _hydrate(self, list_uri: str, rec_ids: list,
+                       batch_size: int, concurrency: int, ordered):
+        list_uri = '/%s' % list_uri.strip('/')
+
+        async def get_batch(batch):
+            return await self._get_batch(list_uri, batch)
+
+        async for batch in util.async_concurrent_map(
+            get_batch,
+            RecordStreamingService._batches(rec_ids, batch_size),
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            for record in batch:
+                yield record
+
+    @tracing.traced
+    async def uris(self, plural_record_type: str,):
+        """
+        Streams all URIs of a specific type from the ArchivesSpace instance.
+        See `RecordStreamingService.uris`.
+        """
+        plural_record_type = plural_record_type.strip('/')
+
+        for rec_id in await self._all_ids('/%s' % plural_record_type):
+            yield '/%s/%d' % (plural_record_type, rec_id)
+
+    @tracing.traced
+    async def repository_relative_uris(self, plural_record_type: str,
+                                       repository_uris: list = None,
+                                       endpoint_extension: str = None,):
+        """
+        Streams all URIs of a specific type from the ArchivesSpace instance,
+        from each repository. See
+        `RecordStreamingService.repository_relative_uris`.
+        """
+        extension = (
+            '' if endpoint_extension is None else
+            '/%s' % endpoint_extension.strip('/')
+        )
+
+        for list_uri in await self._list_uris(
+            plural_record_type,
+            repository_uris=repository_uris,
+        ):
+            for rec_id in await self._all_ids(list_uri):
+                yield '%s/%d%s' % (list_uri, rec_id, extension)
+
+    @tracing.traced
+    async def records(self, plural_record_type: str,
+                      batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+                      concurrency: int = constants.DEFAULT_ASYNC_CONCURRENCY,
+                      ordered=True,):
+        """
+        Streams all records of a specific type from the ArchivesSpace
+        instance. See `RecordStreamingService.records`.
+
+        :concurrency: Maximum number of requests that are in flight at once.
+        """
+        list_uri = '/%s' % plural_record_type.strip('/')
+
+        async for record in self._hydrate(
+            list_uri,
+            await self._all_ids(list_uri),
+            batch_size=batch_size,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            yield record
+
+    @tracing.traced
+    async def repository_relative_records(self, plural_record_type: str,
+                                          repository_uris: list = None,
+                                          endpoint_extension: str = None,
+                                          batch_size: int = (
+                                              constants
+                                              .DEFAULT_ID_SET_BATCH_SIZE
+                                          ),
+                                          concurrency: int = (
+                                              constants
+                                              .DEFAULT_ASYNC_CONCURRENCY
+                                          ),
+                                          ordered=True,):
+        """
+        Streams all records of a specific type from the ArchivesSpace
+        instance, from each repository. See
+        `RecordStreamingService.repository_relative_records`.
+
+        :concurrency: Maximum number of requests that are in flight at once.
+        """
+
+        if endpoint_extension is not None:
+            async for record in util.async_concurrent_map(
+                self._get_json,
+                self.repository_relative_uris(
+                    plural_record_type,
+                    repository_uris=repository_uris,
+                    endpoint_extension=endpoint_extension,
+                ),
+                concurrency=concurrency,
+                ordered=ordered,
+            ):
+                yield record
+            return
+
+        for list_uri in await self._list_uris(
+            plural_record_type,
+            repository_uris=repository_uris,
+        ):
+            async for record in self._hydrate(
+                list_uri,
+                await self._all_ids(list_uri),
+                batch_size=batch_size,
+                concurrency=concurrency,
+                ordered=ordered,
+            ):
+                yield record
+
+    @tracing.traced
+    def resources(self, repository_uris: list = None,
+                  endpoint_extension: str = None, **kwargs):
+        """
+        Streams all resources from the ArchivesSpace instance.
+        """
+        return self.repository_relative_records(
+            plural_record_type='resources',
+            repository_uris=repository_uris,
+            endpoint_extension=endpoint_extension,
+            **kwargs
+        )
+
+    @tracing.traced
+    def resource_trees(self, repository_uris: list = None,
+                       large_tree_extension: str = None, **kwargs):
+        """
+        Streams all resource trees from the ArchivesSpace instance. See
+        `RecordStreamingService.resource_trees`.
+        """
+        endpoint_extension = 'tree'
+
+        if large_tree_extension:
+            endpoint_extension = '%s/%s' % (
+                endpoint_extension,
+                large_tree_extension.lstrip('/ ')
+            )
+
+        return self.resources(
+            repository_uris=repository_uris,
+            endpoint_extension=endpoint_extension,
+            **kwargs
+        )
+
+    @tracing.traced
+    def resource_ordered_records(self, repository_uris: list = None,
+                                 **kwargs):
+        """
+        Streams all resource ordered_records from the ArchivesSpace instance.
+        """
+        return self.resources(
+            repository_uris=repository_uris,
+            endpoint_extension='ordered_records',
+            **kwargs
+        )
+
+    @tracing.traced
+    def accessions(self, repository_uris: list = None, **kwargs):
+        """
+        Streams all accession records from the ArchivesSpace instance.
+        """
+        return self.repository_relative_records(
+            'accessions', repository_uris=repository_uris, **kwargs)
+
+    @tracing.traced
+    def archival_objects(self, repository_uris: list = None, **kwargs):
+        """
+        Streams all archival object records from the ArchivesSpace instance.
+        """
+        return self.repository_relative_records(
+            'archival_objects', repository_uris=repository_uris, **kwargs)
+
+    @tracing.traced
+    def top_containers(self, repository_uris: list = None, **kwargs):
+        """
+        Streams all top_container records from the ArchivesSpace instance.
+        """
+        return self.repository_relative_records(
+            'top_containers', repository_uris=repository_uris, **kwargs)
+
+    @tracing.traced
+    def jobs(self, repository_uris: list = None, **kwargs):
+        """
+        Streams all job records from the ArchivesSpace instance.
+        """
+        return self.repository_relative_records(
+            'jobs', repository_uris=repository_uris, **kwargs)
+
+    @tracing.traced
+    def users(self, **kwargs):
+        """
+        Streams all user records from the ArchivesSpace instance.
+        """
+        return self.records('users', **kwargs)
+
+    @tracing.traced
+    def people(self, **kwargs):
+        """
+        Streams all person agents from the ArchivesSpace instance.
+        """
+        return self.records('agents/people', **kwargs)
+
+    @tracing.traced
+    def corporate_entities(self, **kwargs):
+        """
+        Streams all corporate entity agents from the ArchivesSpace instance.
+        """
+        return self.records('agents/corporate_entities', **kwargs)
+
+    @tracing.traced
+    def families(self, **kwargs):
+        """
+        Streams all family agents from the ArchivesSpace instance.
+        """
+        return self.records('agents/families', **kwargs)
+
+    @tracing.traced
+    def software(self, **kwargs):
+        """
+        Streams all software agents from the ArchivesSpace instance.
+        """
+        return self.records('agents/software', **kwargs)
+
+    @tracing.traced
+    async def all_agents(self, **kwargs):
+        """
+        Streams all agent records from the ArchivesSpace instance.
+        """
+        for stream in [
+            self.people,
+            self.corporate_entities,
+            self.families,
+            self.software,
+        ]:
+            async for record in stream(**kwargs):
+                yield record
+
+    @tracing.traced
+    def subjects(self, **kwargs):
+        """
+        Streams all subject records from the ArchivesSpace instance.
+        """
+        return self.records('subjects', **kwargs)
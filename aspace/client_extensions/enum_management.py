@@ -5,6 +5,7 @@ import enum
 from aspace import base_client
 from aspace import enums
 from aspace import constants
+from aspace import tracing
 from aspace import util
 
 VALID_ENUM_URI_RE = re.compile(constants.VALID_ENUM_URI_REGEX)
@@ -19,6 +20,7 @@ class EnumerationManagementService(object):
     def __init__(self, client: base_client.BaseASpaceClient):
         self._client = client
 
+    @tracing.traced
     def get_all(self) -> list:
         """
         Dowloads a list of all of the controlled value lists.
@@ -47,6 +49,7 @@ class EnumerationManagementService(object):
         match = VALID_ENUM_URI_RE.match(enum_uri)
         return bool(match)
 
+    @tracing.traced
     def get_by_name(self, enum_name: str) -> dict:
         """
         GETs an enumeration using the `/config/enumerations/names/:enum_name`
@@ -55,6 +58,7 @@ class EnumerationManagementService(object):
         resp = self._client.get('/config/enumerations/names/%s' % enum_name)
         return resp.json()
 
+    @tracing.traced
     def get(self, enum_id: Union[str, int, enums.Enumeration]
             ) -> dict:
         """
@@ -77,6 +81,7 @@ class EnumerationManagementService(object):
             )
         )
 
+    @tracing.traced
     def sort_values(self, enum_id: Union[str, int, enums.Enumeration]):
         """
         Sorts all of the values of an enumeration based on their value.
@@ -104,6 +109,7 @@ class EnumerationManagementService(object):
         """
         return util.convert_to_enumeration_value(value)
 
+    @tracing.traced
     def update_enumeration(self, enum_id: Union[str, int, enums.Enumeration],
                            new_values: Iterable, cleanup_new_values=True,
                            reorder_enumeration=False):
@@ -137,6 +143,7 @@ class EnumerationManagementService(object):
         if reorder_enumeration:
             self.sort_values(enum_id)
 
+    @tracing.traced
     def merge(self, enum_id: Union[str, int, enums.Enumeration],
               from_value: str, to_value: str) -> dict:
         """
@@ -3,7 +3,7 @@ import json
 import os
 from typing import Union, List, Dict
 
-from aspace import constants, base_client, enums, client_extensions
+from aspace import constants, base_client, enums, client_extensions, tracing
 
 
 class JobManagementService(object):
@@ -17,6 +17,7 @@ class JobManagementService(object):
             client_extensions.record_streams.RecordStreamingService(client)
         )
 
+    @tracing.traced
     def import_types(self, repo_uri) -> List[dict]:
         """
         Returns the JSON result from
@@ -83,6 +84,7 @@ class JobManagementService(object):
         assert resp.ok, resp.text
         return resp.json()
 
+    @tracing.traced
     def create_with_files(self, repo_uri: str,
                           import_type: Union[str, enums.DataImportTypes],
                           filepaths: List[str],
@@ -123,6 +125,7 @@ class JobManagementService(object):
             },
         )
 
+    @tracing.traced
     def create_with_data(self, repo_uri: str,
                          import_type: Union[str, enums.DataImportTypes],
                          filedata: Dict[str, Union[str, io.TextIOBase]],
@@ -185,6 +188,7 @@ class JobManagementService(object):
 
         return uri
 
+    @tracing.traced
     def get_output_files(self, job: Union[str, dict]) -> list:
         """
         Gets a list of a job's output files.
@@ -197,6 +201,7 @@ class JobManagementService(object):
         assert resp.ok, resp.text
         return resp.json()
 
+    @tracing.traced
     def get_log(self, job: Union[str, dict]) -> list:
         """
         Gets a job's output log.
@@ -209,6 +214,7 @@ class JobManagementService(object):
         assert resp.ok, resp.text
         return resp.text
 
+    @tracing.traced
     def get(self, job: Union[str, dict]) -> dict:
         """
         Gets a job.
@@ -221,6 +227,7 @@ class JobManagementService(object):
         assert resp.ok, resp.text
         return resp.json()
 
+    @tracing.traced
     def cancel(self, job: Union[str, dict]) -> dict:
         """
         Cancels a job.
@@ -233,6 +240,7 @@ class JobManagementService(object):
         assert resp.ok, resp.text
         return resp.json()
 
+    @tracing.traced
     def delete(self, job: Union[str, dict]) -> dict:
         """
         Deletes a job.
@@ -245,6 +253,7 @@ class JobManagementService(object):
         assert resp.ok, resp.text
         return resp.json()
 
+    @tracing.traced
     def get_active(self, repository_uris: list = None,) -> List[dict]:
         """
         Gets a list of all the job records from the ArchivesSpace instance that
@@ -263,6 +272,7 @@ class JobManagementService(object):
             repository_uris=repository_uris
         )
 
+    @tracing.traced
     def get_archived(self, repository_uris: list = None,) -> List[dict]:
         """
         Gets a list of all the job records from the ArchivesSpace instance that
@@ -282,6 +292,7 @@ class JobManagementService(object):
             repository_uris=repository_uris
         )
 
+    @tracing.traced
     def get_completed(self, repository_uris: list = None,) -> List[dict]:
         """
         Gets a list of all the job records from the ArchivesSpace instance that
@@ -298,6 +309,7 @@ class JobManagementService(object):
             repository_uris=repository_uris
         )
 
+    @tracing.traced
     def get_failed(self, repository_uris: list = None,) -> List[dict]:
         """
         Gets a list of all the job records from the ArchivesSpace instance that
@@ -314,6 +326,7 @@ class JobManagementService(object):
             repository_uris=repository_uris
         )
 
+    @tracing.traced
     def get_by_status(self, status, repository_uris: list = None,) -> List[dict]:
         """
         Gets a list of all the job records from the ArchivesSpace instance that
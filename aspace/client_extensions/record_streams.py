@@ -1,10 +1,436 @@
+import bisect
+import collections
+import contextvars
+import datetime
+import functools
+import itertools
+import os
 import re
+import sys
+import threading
+import time
+from concurrent import futures
 
-from aspace import constants, base_client
+from aspace import (
+    constants,
+    base_client,
+    json_decoding,
+    sync_state,
+    tracing,
+    util,
+)
 
 
 VALID_REPO_URI_RE = re.compile(constants.VALID_REPO_URI_REGEX)
 
+# The client of a harvesting worker process. Please see
+# `RecordStreamingService.harvest_records`.
+_harvest_client = None
+
+
+def _start_harvest_worker(settings: dict):
+    """
+    Creates the client of a harvesting worker process from the settings of
+    the parent's client. The worker uses the parent's session token instead
+    of logging in, and its share of the parent's limiters.
+    """
+    global _harvest_client
+
+    from aspace import limiters, retry, session_store as token_store
+
+    settings = dict(settings)
+    session = settings.pop('session')
+    session_store_path = settings.pop('session_store_path')
+    retry_settings = settings.pop('retry')
+    rate_limit = settings.pop('rate_limiter')
+    concurrency_limit = settings.pop('concurrency_limiter')
+
+    _harvest_client = base_client.BaseASpaceClient(
+        auto_auth=False,
+        session_store=(
+            token_store.FileSessionStore(session_store_path)
+            if session_store_path else
+            None
+        ),
+        retry_policy=(
+            retry.RetryPolicy(**retry_settings)
+            if retry_settings is not None else
+            None
+        ),
+        rate_limiter=(
+            limiters.RateLimiter(**rate_limit)
+            if rate_limit is not None else
+            None
+        ),
+        concurrency_limiter=(
+            limiters.AdaptiveConcurrencyLimiter(**concurrency_limit)
+            if concurrency_limit is not None else
+            None
+        ),
+        **settings
+    )
+
+    _harvest_client._set_session(session)
+
+
+def _harvest_chunk(task: tuple, transform=None, batch_size: int = None,
+                   concurrency: int = 1) -> list:
+    """
+    Downloads the records with the IDs in a chunk, in a harvesting worker
+    process, and returns the results of `transform` for each of them.
+    """
+    list_uri, rec_ids = task
+
+    records = RecordStreamingService(_harvest_client)._hydrate(
+        list_uri,
+        rec_ids,
+        batch_size=batch_size,
+        concurrency=concurrency,
+    )
+
+    if transform is None:
+        return list(records)
+
+    return [transform(record) for record in records]
+
+
+# Stands in for the record of a step of a checkpointed stream that only
+# updates the checkpoint. Please see `CheckpointedStream`.
+_NO_RECORD = object()
+
+
+class CheckpointedStream(object):
+    """
+    Iterator over a stream that saves its position to a
+    `sync_state.StreamCheckpoint`. The stream is made of steps, each a
+    `(record, update)` pair, where `update` records the step in the
+    checkpoint. A record's update is only applied once the consumer asks for
+    the next record, so a record counts as streamed once it has been
+    processed. Steps without a record, which mark a list endpoint or the
+    whole stream as complete, are applied as soon as they are reached.
+    """
+
+    def __init__(self, steps: iter, checkpoint: sync_state.StreamCheckpoint):
+        self.steps = steps
+        self.checkpoint = checkpoint
+        self._pending = None
+
+    def take(self, next_step) -> dict:
+        """
+        Applies the update of the last record taken, then returns the next
+        record from the steps returned by `next_step`, which raises
+        `StopIteration` once there are none left.
+        """
+        if self._pending is not None:
+            update, self._pending = self._pending, None
+            update()
+
+        try:
+            while True:
+                record, update = next_step()
+
+                if record is _NO_RECORD:
+                    update()
+                    continue
+
+                self._pending = update
+                return record
+
+        except StopIteration:
+            raise
+
+        except BaseException:
+            self.checkpoint.save()
+            raise
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.take(functools.partial(next, self.steps))
+
+    def close(self):
+        """
+        Closes the stream, and saves the position of the records streamed.
+        """
+        self.steps.close()
+        self.checkpoint.save()
+
+    def trace_with(self, tracer: tracing.Tracer, span: tracing.Span):
+        """
+        Keeps `span` open while the stream's steps are produced, and returns
+        the stream itself, rather than a generator that `ReadAhead` would
+        not recognise as checkpointed. Called by `tracing.traced`.
+        """
+        self.steps = tracer.trace_iterator(span, self.steps)
+        return self
+
+
+def _record_size(record) -> int:
+    """
+    Estimates the size of a record, as the length of its JSON encoding.
+    """
+    try:
+        return len(json_decoding.dumps(record))
+    except (TypeError, ValueError):
+        return sys.getsizeof(record)
+
+
+class ReadAhead(object):
+    """
+    Iterates over a record stream on a background thread, keeping up to
+    `max_records` records, or `max_bytes` bytes of records, buffered ahead
+    of the consumer. The requests for the next records are sent while the
+    consumer works on the current ones, so network time and the consumer's
+    processing time overlap.
+
+    ```
+    with ReadAhead(client.streams.archival_objects(), max_records=200) as ao:
+        for archival_object in ao:
+            ...
+
+    print(ao.stats())
+    ```
+
+    `stats` shows which side is the bottleneck. If the buffer is mostly
+    empty and the consumer waits for records, the stream is network-bound.
+    If the buffer is mostly full and the background thread waits for room,
+    the consumer is the bottleneck.
+
+    An error raised by the stream is raised to the consumer once the records
+    buffered before it have been consumed. The stream is closed, on the
+    background thread, when it is exhausted or `close` is called.
+
+    A checkpointed stream's position is advanced as the consumer takes each
+    record from the buffer, rather than as the background thread reads it,
+    so records that are still buffered when the stream stops are streamed
+    again when it is resumed.
+    """
+
+    def __init__(self, stream,
+                 max_records: int = constants.DEFAULT_READ_AHEAD_RECORDS,
+                 max_bytes: int = None, size=_record_size):
+        """
+        :stream: Any iterable of records, such as a `RecordStreamingService`
+        stream. Please call `close`, or use the `ReadAhead` as a context
+        manager, if the stream may not be consumed completely, so that the
+        background thread stops.
+
+        :max_records: Maximum number of records buffered.
+
+        :max_bytes: Optional maximum size of the records buffered. A record
+        that is larger than `max_bytes` on its own is still buffered, once
+        the buffer is empty.
+
+        :size: Function that returns the size of a record in bytes, when
+        `max_bytes` is specified. Defaults to the length of its JSON
+        encoding.
+        """
+        self.max_records = max(max_records or 1, 1)
+        self.max_bytes = max_bytes
+        self._size = size
+        self._stream = stream
+
+        # The steps of a checkpointed stream are buffered, and applied to its
+        # checkpoint as the consumer takes them.
+        if isinstance(stream, CheckpointedStream):
+            self._source = stream.steps
+        else:
+            self._source = iter(stream)
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._buffer = collections.deque()
+        self._bytes = 0
+        self._done = False
+        self._closed = False
+        self._error = None
+
+        self._produced = 0
+        self._consumed = 0
+        self._peak = 0
+        self._occupancy = 0
+        self._nexts = 0
+        self._consumer_waits = 0
+        self._consumer_waited = 0.0
+        self._producer_waits = 0
+        self._producer_waited = 0.0
+
+        # Runs in a copy of the caller's context, so that the stream's
+        # requests are traced as part of the caller's span.
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._fill,),
+            name='aspace-read-ahead',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _full(self, size: int) -> bool:
+        """
+        Returns True if a record of `size` bytes does not fit in the buffer.
+        Must be called with the lock held.
+        """
+        if len(self._buffer) >= self.max_records:
+            return True
+
+        return bool(
+            self.max_bytes and self._buffer and
+            self._bytes + size > self.max_bytes
+        )
+
+    def _fill(self):
+        """
+        Reads records from the stream into the buffer, waiting whenever the
+        buffer is full. Runs on the background thread.
+        """
+        try:
+            checkpointed = isinstance(self._stream, CheckpointedStream)
+
+            for item in self._source:
+                record = item[0] if checkpointed else item
+                is_record = record is not _NO_RECORD
+                size = (
+                    self._size(record) if self.max_bytes and is_record else 0
+                )
+
+                with self._lock:
+                    if self._full(size) and not self._closed:
+                        self._producer_waits += 1
+                        started = time.monotonic()
+
+                        while self._full(size) and not self._closed:
+                            self._not_full.wait()
+
+                        self._producer_waited += time.monotonic() - started
+
+                    if self._closed:
+                        return
+
+                    self._buffer.append((item, size, is_record))
+                    self._bytes += size
+                    self._produced += is_record
+                    self._peak = max(self._peak, len(self._buffer))
+                    self._not_empty.notify()
+
+        except BaseException as e:
+            with self._lock:
+                self._error = e
+
+        finally:
+            close = getattr(self._source, 'close', None)
+            if close is not None:
+                close()
+
+            with self._lock:
+                self._done = True
+                self._not_empty.notify_all()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if isinstance(self._stream, CheckpointedStream):
+            return self._stream.take(self._take)
+
+        return self._take()
+
+    def _take(self):
+        """
+        Returns the next item in the buffer, waiting for the background
+        thread if it is empty.
+        """
+        with self._lock:
+            self._occupancy += len(self._buffer)
+            self._nexts += 1
+
+            if not self._buffer and not self._done:
+                self._consumer_waits += 1
+                started = time.monotonic()
+
+                while not self._buffer and not self._done:
+                    self._not_empty.wait()
+
+                self._consumer_waited += time.monotonic() - started
+
+            if self._buffer:
+                item, size, is_record = self._buffer.popleft()
+                self._bytes -= size
+                self._consumed += is_record
+                self._not_full.notify()
+                return item
+
+            error, self._error = self._error, None
+
+        if error is not None:
+            raise error
+
+        raise StopIteration
+
+    def close(self):
+        """
+        Stops reading ahead, and discards the buffered records. The stream is
+        closed once the request the background thread is waiting on, if any,
+        completes.
+        """
+        with self._lock:
+            self._closed = True
+            self._buffer.clear()
+            self._bytes = 0
+            self._not_full.notify_all()
+
+        if isinstance(self._stream, CheckpointedStream):
+            self._stream.checkpoint.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self) -> dict:
+        """
+        Returns the buffer's current occupancy, and how long each side has
+        spent waiting for the other:
+
+        ```
+        {
+            'buffered': int,
+            'buffered_bytes': int,  # Only counted with max_bytes
+            'max_records': int,
+            'max_bytes': int,  # Or None
+            'peak': int,  # Most records buffered at once
+            'mean_occupancy': float,  # Mean records buffered per next()
+            'produced': int,
+            'consumed': int,
+            'consumer_waits': int,  # Times the buffer was empty
+            'consumer_waited': float,  # Seconds
+            'producer_waits': int,  # Times the buffer was full
+            'producer_waited': float,  # Seconds
+            'done': bool,
+        }
+        ```
+        """
+        with self._lock:
+            return {
+                'buffered': len(self._buffer),
+                'buffered_bytes': self._bytes,
+                'max_records': self.max_records,
+                'max_bytes': self.max_bytes,
+                'peak': self._peak,
+                'mean_occupancy': (
+                    self._occupancy / self._nexts if self._nexts else 0.0
+                ),
+                'produced': self._produced,
+                'consumed': self._consumed,
+                'consumer_waits': self._consumer_waits,
+                'consumer_waited': self._consumer_waited,
+                'producer_waits': self._producer_waits,
+                'producer_waited': self._producer_waited,
+                'done': self._done,
+            }
+
 
 class RecordStreamingService(object):
     """
@@ -15,6 +441,7 @@ class RecordStreamingService(object):
     def __init__(self, client: base_client.BaseASpaceClient):
         self._client = client
 
+    @tracing.traced
     def repositories(self):
         """
         Streams all repository records from the ArchivesSpace instance.
@@ -29,7 +456,7 @@ class RecordStreamingService(object):
         Returns a list of valid repository URIs in the ArchivesSpace
         instance, or raises an error.
         """
-        repo_uris = (
+        return self._clean_repo_uris(
             repository_uris
             if repository_uris is not None else
             [
@@ -39,6 +466,13 @@ class RecordStreamingService(object):
             ]
         )
 
+    @staticmethod
+    def _clean_repo_uris(repo_uris: list) -> list:
+        """
+        Asserts that all of the repository URIs are valid, and returns them
+        without leading or trailing slashes.
+        """
+
         def valid_repo_uri(repo_uri):
             return (
                 (type(repo_uri) is str) and VALID_REPO_URI_RE.match(repo_uri)
@@ -51,7 +485,807 @@ class RecordStreamingService(object):
 
         return [uri.strip('/') for uri in repo_uris]
 
-    def uris(self, plural_record_type: str,) -> iter:
+    @staticmethod
+    def _list_params(modified_since=None, **params) -> dict:
+        """
+        Returns the parameters of a request to a list endpoint, including the
+        `modified_since` parameter if a Unix timestamp or `datetime` is
+        specified.
+        """
+        if modified_since is not None:
+            if isinstance(modified_since, datetime.datetime):
+                modified_since = modified_since.timestamp()
+            params['modified_since'] = max(int(modified_since), 0)
+
+        return params
+
+    def _all_ids(self, list_uri: str, modified_since=None) -> list:
+        """
+        Returns the list of IDs for the records under the `list_uri` endpoint,
+        using the `all_ids=true` parameter. If `modified_since` is specified,
+        only the IDs of records modified since then are returned.
+        """
+        return self._client.get(
+            list_uri,
+            params=self._list_params(modified_since, all_ids='true'),
+        ).json()
+
+    def _iter_all_ids(self, list_uri: str, modified_since=None) -> iter:
+        """
+        Streams the IDs for the records under the `list_uri` endpoint, using
+        the `all_ids=true` parameter. Large lists are decoded and yielded
+        while the response is still being downloaded. Both use the client's
+        `json_loads` function.
+        """
+        resp = self._client.get(
+            list_uri,
+            params=self._list_params(modified_since, all_ids='true'),
+            stream=True,
+        )
+
+        with resp:
+            resp.raise_for_status()
+            length = resp.headers.get('Content-Length', '')
+
+            if (length.isdigit()
+                    and int(length) <= constants.JSON_STREAM_THRESHOLD):
+                yield from resp.json()
+                return
+
+            yield from json_decoding.iter_json_array(
+                resp.iter_content(constants.JSON_STREAM_CHUNK_SIZE),
+                json_loads=getattr(self._client, 'json_loads', None),
+            )
+
+    def _get_page(self, list_uri: str, page: int, page_size: int,
+                  modified_since=None) -> dict:
+        """
+        Returns a page of the records under the `list_uri` endpoint, using
+        the `page` and `page_size` parameters. Raises a
+        `requests.HTTPError` if the page could not be listed.
+        """
+        resp = self._client.get(
+            list_uri,
+            params=self._list_params(
+                modified_since, page=page, page_size=page_size),
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def _iter_pages(self, list_uri: str,
+                    page_size: int = constants.DEFAULT_PAGE_SIZE,
+                    prefetch: int = constants.DEFAULT_PAGE_PREFETCH,
+                    modified_since=None, offset: int = 0,) -> iter:
+        """
+        Streams the records under the `list_uri` endpoint page by page, in
+        the order ArchivesSpace lists them, skipping the first `offset`
+        records. The next `prefetch` pages are requested on a background
+        thread while each page is streamed.
+        """
+        list_uri = '/%s' % list_uri.strip('/')
+        get_page = functools.partial(
+            self._get_page, list_uri,
+            page_size=page_size,
+            modified_since=modified_since,
+        )
+
+        # Pages before the one that contains the record at `offset` are not
+        # requested.
+        first_page, skip = divmod(max(offset, 0), page_size)
+
+        page = get_page(first_page + 1)
+        results = page['results'][skip:]
+        page_numbers = iter(
+            range(first_page + 2, (page.get('last_page') or 1) + 1))
+
+        if not prefetch or prefetch < 1:
+            yield from results
+            for page_number in page_numbers:
+                yield from get_page(page_number)['results']
+            return
+
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+        pending = collections.deque()
+
+        try:
+            while True:
+                for page_number in itertools.islice(
+                        page_numbers, prefetch - len(pending)):
+
+                    # Runs in a copy of the caller's context, so that the
+                    # request is traced as part of the stream.
+                    pending.append(executor.submit(
+                        contextvars.copy_context().run, get_page, page_number,
+                    ))
+
+                yield from results
+
+                if not pending:
+                    return
+
+                results = pending.popleft().result()['results']
+
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _list_uris(self, plural_record_type: str,
+                   repository_uris: list = None,) -> list:
+        """
+        Returns the list endpoints of a repository relative record type, one
+        per repository.
+        """
+        plural_record_type = plural_record_type.strip('/')
+
+        return [
+            '%s/%s' % (repo_uri, plural_record_type)
+            for repo_uri in self._get_repo_uris(repository_uris)
+        ]
+
+    @staticmethod
+    def _batches(rec_ids: list, batch_size: int) -> iter:
+        """
+        Splits a list of record IDs into lists of at most `batch_size` IDs.
+        """
+        rec_ids = iter(rec_ids)
+        batch_size = max(batch_size or 1, 1)
+
+        while True:
+            batch = list(itertools.islice(rec_ids, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _fetch_batch(self, list_uri: str, batch: list) -> dict:
+        """
+        Downloads the records under the `list_uri` endpoint that have the IDs
+        in `batch`, returning a dict that maps IDs to records. Batches of
+        more than 1 ID are downloaded in 1 request, using the `id_set`
+        parameter.
+
+        Records that have been deleted since their IDs were listed are left
+        out, whichever way the batch is downloaded. Raises an `HTTPError` if
+        the request fails for any other reason.
+        """
+        if len(batch) == 1:
+            resp = self._client.get('%s/%d' % (list_uri, batch[0]))
+            if resp.status_code == 404:
+                return {}
+
+            resp.raise_for_status()
+            return {batch[0]: resp.json()}
+
+        resp = self._client.get(
+            list_uri,
+            params={'id_set': self._id_set(batch)},
+        )
+        resp.raise_for_status()
+
+        return self._records_by_id(resp.json())
+
+    def _get_batch(self, list_uri: str, batch: list,
+                   modified_ids: set = None) -> list:
+        """
+        Returns the records under the `list_uri` endpoint that have the IDs
+        in `batch`, in the same order as `batch`.
+
+        If the client has a `cache`, downloaded records are stored in it. If
+        `modified_ids` is also specified, records that are not in
+        `modified_ids` are read from the cache, when they are there.
+        """
+        cache = getattr(self._client, 'cache', None)
+        records = {}
+
+        if cache is not None and modified_ids is not None:
+            for rec_id in batch:
+                if rec_id in modified_ids:
+                    continue
+
+                entry = cache.get(
+                    '%s/%d' % (list_uri, rec_id),
+                    scope=self._client.cache_scope,
+                )
+                if entry is not None:
+                    records[rec_id] = json_decoding.loads(entry['body'])
+
+        missing = [rec_id for rec_id in batch if rec_id not in records]
+
+        if missing:
+            fetched = self._fetch_batch(list_uri, missing)
+            records.update(fetched)
+
+            if cache is not None:
+                for record in fetched.values():
+                    if 'uri' in record:
+                        cache.put(
+                            record['uri'],
+                            json_decoding.dumps(record),
+                            scope=self._client.cache_scope,
+                        )
+
+        return [records[_id] for _id in batch if _id in records]
+
+    @staticmethod
+    def _id_set(batch: list) -> str:
+        """
+        Formats a batch of record IDs for the `id_set` parameter.
+        """
+        return ','.join(str(_id) for _id in batch)
+
+    @staticmethod
+    def _record_id(record: dict) -> int:
+        """
+        Returns the ID of a record, which is the last part of its URI.
+        """
+        return int(record['uri'].rsplit('/', 1)[-1])
+
+    @classmethod
+    def _records_by_id(cls, records: list) -> dict:
+        """
+        Maps the IDs of the records returned for an `id_set` request to the
+        records. The id_set parameter does not guarantee the order of the
+        results, so they are matched back up with the requested IDs, and
+        records deleted since the ID list was pulled are missing.
+        """
+        return {cls._record_id(record): record for record in records}
+
+    def _modified_ids(self, list_uri: str, since: float) -> set:
+        """
+        Returns the set of IDs for the records under the `list_uri` endpoint
+        that have been modified since the Unix timestamp `since`, using the
+        `modified_since` parameter.
+        """
+        return set(self._client.get(
+            list_uri,
+            params={
+                'all_ids': 'true',
+                'modified_since': max(
+                    int(since - constants.CACHE_SYNC_MARGIN), 0),
+            },
+        ).json())
+
+    def _modified_since_sync(self, list_uri: str, sync_time: float,
+                             modified_since=None,) -> set:
+        """
+        Returns the set of IDs for the records under the `list_uri` endpoint
+        that have been modified since the cache's `sync_time`, or `None` if
+        every record being streamed must be downloaded.
+
+        That is the case when the endpoint has never been synced, or when
+        the records being streamed were listed with a `modified_since`
+        timestamp no earlier than the sync time, so that the listing already
+        only holds records modified since then.
+        """
+        if not sync_time:
+            return None
+
+        since = self._list_params(modified_since).get('modified_since')
+        if since is not None and (
+                since >= int(sync_time - constants.CACHE_SYNC_MARGIN)):
+            return None
+
+        return self._modified_ids(list_uri, sync_time)
+
+    def _hydrate(self, list_uri: str, rec_ids: list,
+                 batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+                 concurrency: int = 1, ordered=True, complete=True,
+                 modified_since=None,) -> iter:
+        """
+        Streams the records under the `list_uri` endpoint that have the
+        specified IDs. Records are downloaded `batch_size` at a time using the
+        `id_set` parameter. A `batch_size` of `None` or 1 GETs each record
+        individually.
+
+        Batches are downloaded by `concurrency` worker threads. If `ordered`
+        is True, records are streamed in the same order as `rec_ids`.
+
+        If the client has a `cache`, only the records that have been modified
+        since the last complete pass over `list_uri` are downloaded. If
+        `complete` is False, `rec_ids` are not all of the records under
+        `list_uri`, so the pass is not recorded as complete. `modified_since`
+        is the timestamp that `rec_ids` were listed with, if any.
+        """
+        list_uri = '/%s' % list_uri.strip('/')
+        cache = getattr(self._client, 'cache', None)
+        started = time.time()
+        sync_time = (
+            cache.get_sync_time(list_uri, scope=self._client.cache_scope)
+            if cache else
+            None
+        )
+
+        modified_ids = self._modified_since_sync(
+            list_uri, sync_time, modified_since)
+
+        records = (
+            record
+
+            for batch in util.concurrent_map(
+                lambda batch: self._get_batch(
+                    list_uri, batch, modified_ids=modified_ids),
+                self._batches(rec_ids, batch_size),
+                concurrency=concurrency,
+                ordered=ordered,
+            )
+
+            for record in batch
+        )
+
+        if cache is None or not complete:
+            return records
+
+        return self._sync_when_exhausted(
+            records, cache, list_uri, started, self._client.cache_scope)
+
+    @staticmethod
+    def _sync_when_exhausted(records: iter, cache, list_uri: str,
+                             started: float, scope: str) -> iter:
+        """
+        Streams the records, then records the start of the pass over
+        `list_uri` as its sync time, once every record has been streamed.
+        """
+        yield from records
+        cache.set_sync_time(list_uri, started, scope=scope)
+
+    def _resume_ids(self, list_uri: str,
+                    checkpoint: sync_state.StreamCheckpoint,
+                    endpoint_extension: str = None,
+                    batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+                    concurrency: int = 1, modified_since=None,) -> iter:
+        """
+        Streams the steps of the records under the `list_uri` endpoint in
+        the order of their IDs, starting after the last ID that `checkpoint`
+        shows was streamed. Please see `CheckpointedStream`.
+        """
+        list_uri = '/%s' % list_uri.strip('/')
+        position = checkpoint.start(
+            list_uri,
+            checkpoint.IDS,
+            self._list_params(modified_since).get('modified_since'),
+        )
+
+        if position['complete']:
+            return
+
+        # Sorting the IDs gives every stream of the endpoint the same order,
+        # so the IDs that have been streamed are the ones up to the last.
+        rec_ids = sorted(self._all_ids(list_uri, modified_since))
+        if position['last_id'] is not None:
+            rec_ids = rec_ids[
+                bisect.bisect_right(rec_ids, position['last_id']):]
+
+        if endpoint_extension is None:
+            records = (
+                (self._record_id(record), record)
+
+                for record in self._hydrate(
+                    list_uri,
+                    rec_ids,
+                    batch_size=batch_size,
+                    concurrency=concurrency,
+                    complete=(
+                        modified_since is None and
+                        position['last_id'] is None
+                    ),
+                    modified_since=modified_since,
+                )
+            )
+        else:
+            records = util.concurrent_map(
+                lambda rec_id: (rec_id, self._client.get('%s/%d/%s' % (
+                    list_uri, rec_id, endpoint_extension.strip('/'),
+                )).json()),
+                rec_ids,
+                concurrency=concurrency,
+            )
+
+        try:
+            for rec_id, record in records:
+                yield record, functools.partial(
+                    checkpoint.advance, list_uri, rec_id)
+
+            yield _NO_RECORD, functools.partial(checkpoint.complete, list_uri)
+        finally:
+            checkpoint.save()
+
+    def _resume_pages(self, list_uri: str,
+                      checkpoint: sync_state.StreamCheckpoint,
+                      page_size: int = constants.DEFAULT_PAGE_SIZE,
+                      prefetch: int = constants.DEFAULT_PAGE_PREFETCH,
+                      modified_since=None,) -> iter:
+        """
+        Streams the steps of the records under the `list_uri` endpoint page
+        by page, skipping the records that `checkpoint` shows were streamed.
+        Please see `CheckpointedStream`.
+        """
+        list_uri = '/%s' % list_uri.strip('/')
+        position = checkpoint.start(
+            list_uri,
+            checkpoint.PAGES,
+            self._list_params(modified_since).get('modified_since'),
+        )
+
+        if position['complete']:
+            return
+
+        try:
+            for record in self._iter_pages(
+                    list_uri,
+                    page_size=page_size,
+                    prefetch=prefetch,
+                    modified_since=modified_since,
+                    offset=position['streamed']):
+                yield record, functools.partial(checkpoint.advance, list_uri)
+
+            yield _NO_RECORD, functools.partial(checkpoint.complete, list_uri)
+        finally:
+            checkpoint.save()
+
+    @staticmethod
+    def _checkpointed(list_uris: list,
+                      checkpoint: sync_state.StreamCheckpoint,
+                      resume) -> CheckpointedStream:
+        """
+        Returns a stream of the records under each of the `list_uris`
+        endpoints, streamed with `resume`, which clears the checkpoint once
+        every record has been streamed.
+        """
+
+        def steps():
+            for list_uri in list_uris:
+                yield from resume(list_uri, checkpoint)
+
+            yield _NO_RECORD, checkpoint.clear
+
+        return CheckpointedStream(steps(), checkpoint)
+
+    @classmethod
+    def _interleave(cls, listings: iter, batch_size: int, width: int) -> iter:
+        """
+        Splits the IDs of each `(list_uri, rec_ids, ...)` listing into
+        batches, yielding `(listing, batch)` pairs that take a batch from
+        each of up to `width` listings in turn.
+        """
+        listings = iter(listings)
+        active = collections.deque()
+
+        while True:
+            for listing in itertools.islice(listings, width - len(active)):
+                active.append((listing, cls._batches(listing[1], batch_size)))
+
+            if not active:
+                return
+
+            listing, batches = active.popleft()
+            batch = next(batches, None)
+
+            if batch is not None:
+                yield listing, batch
+                active.append((listing, batches))
+
+    def _fan_out(self, list_uris: list, endpoint_extension: str = None,
+                 batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+                 concurrency: int = 1, repository_concurrency: int = 1,
+                 ordered=True, interleaved=False, modified_since=None,):
+        """
+        Streams the records under each of the `list_uris` endpoints, listing
+        the IDs of `repository_concurrency` endpoints at a time, and
+        downloading their records on a pool of worker threads that all of
+        the endpoints share. Listing and record requests share a limit of
+        `concurrency` requests in flight, which is raised to
+        `repository_concurrency` if it is lower.
+
+        Records are grouped by endpoint, in the order of `list_uris`, unless
+        `interleaved` is True, in which case batches of records from the
+        endpoints being streamed take turns.
+        """
+        limit = max(concurrency or 1, repository_concurrency)
+        in_flight = threading.BoundedSemaphore(limit)
+        cache = (
+            getattr(self._client, 'cache', None)
+            if endpoint_extension is None else
+            None
+        )
+
+        def list_ids(list_uri):
+            list_uri = '/%s' % list_uri.strip('/')
+            started = time.time()
+            sync_time = (
+                cache.get_sync_time(list_uri, scope=self._client.cache_scope)
+                if cache else
+                None
+            )
+
+            with in_flight:
+                rec_ids = self._all_ids(list_uri, modified_since)
+
+            with in_flight:
+                modified_ids = self._modified_since_sync(
+                    list_uri, sync_time, modified_since)
+
+            return list_uri, rec_ids, modified_ids, started
+
+        def get_batch(task):
+            (list_uri, _, modified_ids, _), batch = task
+
+            with in_flight:
+                if endpoint_extension is None:
+                    return self._get_batch(
+                        list_uri, batch, modified_ids=modified_ids)
+
+                return [self._client.get('%s/%d/%s' % (
+                    list_uri, batch[0], endpoint_extension.strip('/'),
+                )).json()]
+
+        # Records with an endpoint extension are downloaded 1 at a time.
+        if endpoint_extension is not None:
+            batch_size = 1
+
+        listings = []
+        listed = util.concurrent_map(
+            list_ids,
+            list_uris,
+            concurrency=repository_concurrency,
+            ordered=ordered,
+        )
+
+        def tasks():
+            for listing in listed:
+                listings.append(listing)
+                yield listing
+
+        if interleaved:
+            batches = self._interleave(
+                tasks(), batch_size, repository_concurrency)
+        else:
+            batches = (
+                (listing, batch)
+                for listing in tasks()
+                for batch in self._batches(listing[1], batch_size)
+            )
+
+        yield from (
+            record
+
+            for batch in util.concurrent_map(
+                get_batch,
+                batches,
+                concurrency=limit,
+                ordered=ordered,
+            )
+
+            for record in batch
+        )
+
+        if cache is not None and modified_since is None:
+            for list_uri, _, _, started in listings:
+                cache.set_sync_time(
+                    list_uri, started, scope=self._client.cache_scope)
+
+    def _harvest_settings(self, processes: int, concurrency: int) -> dict:
+        """
+        Returns the picklable settings that `processes` harvesting worker
+        processes create their clients from. The password is not included,
+        only the session token.
+        """
+        from aspace import transports
+
+        client = self._client
+
+        if constants.X_AS_SESSION not in client.headers:
+            client.authenticate()
+
+        retry_policy = getattr(client, 'retry_policy', None)
+        session_store = getattr(client, 'session_store', None)
+        rate_limiter = getattr(client, 'rate_limiter', None)
+        concurrency_limiter = getattr(client, 'concurrency_limiter', None)
+        adapter = client.get_adapter(client.aspace_api_host)
+
+        return {
+            'api_host': client.aspace_api_host,
+            'username': client.aspace_username,
+            'password': None,
+            'session': client.headers[constants.X_AS_SESSION],
+            'session_store_path': (
+                session_store.path if session_store is not None else None
+            ),
+            'pool_maxsize': max(concurrency, constants.DEFAULT_POOL_MAXSIZE),
+            'transport': (
+                constants.TRANSPORT_HTTPX
+                if isinstance(adapter, transports.HTTPXAdapter) else
+                constants.TRANSPORT_REQUESTS
+            ),
+
+            # Each worker gets an equal share of the client's limits, so
+            # that the workers together stay within them.
+            'rate_limiter': (
+                rate_limiter.share(processes)
+                if rate_limiter is not None else
+                None
+            ),
+            'concurrency_limiter': (
+                concurrency_limiter.share(processes)
+                if concurrency_limiter is not None else
+                None
+            ),
+            'retry': (
+                {
+                    'max_attempts': retry_policy.max_attempts,
+                    'status_codes': retry_policy.status_codes,
+                    'methods': retry_policy.methods,
+                    'backoff_factor': retry_policy.backoff_factor,
+                    'max_backoff': retry_policy.max_backoff,
+                    'budget_ratio': retry_policy.budget_ratio,
+                    'budget_min_retries': retry_policy.budget_min_retries,
+                }
+                if retry_policy is not None else
+                None
+            ),
+        }
+
+    def _harvest(self, list_uris: list, transform=None, processes: int = None,
+                 batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+                 concurrency: int = 1,
+                 chunk_size: int = constants.DEFAULT_HARVEST_CHUNK_SIZE,
+                 ordered=True, max_pending: int = None, mp_context=None,
+                 modified_since=None,):
+        """
+        Splits the IDs of the records under each of the `list_uris` endpoints
+        into chunks, which are downloaded and transformed by a pool of
+        worker processes. Please see `harvest_records`.
+        """
+        # Imported here, since only harvests start worker processes.
+        import multiprocessing
+
+        processes = max(processes or os.cpu_count() or 1, 1)
+
+        chunks = (
+            (list_uri, chunk)
+            for list_uri in list_uris
+            for chunk in self._batches(
+                self._all_ids(list_uri, modified_since), chunk_size)
+        )
+
+        return (
+            result
+
+            for results in util.process_map(
+                functools.partial(
+                    _harvest_chunk,
+                    transform=transform,
+                    batch_size=batch_size,
+                    concurrency=concurrency,
+                ),
+                chunks,
+                processes=processes,
+                ordered=ordered,
+                max_buffered=max_pending,
+                mp_context=mp_context or multiprocessing.get_context('spawn'),
+                initializer=_start_harvest_worker,
+                initargs=(self._harvest_settings(processes, concurrency),),
+            )
+
+            for result in results
+        )
+
+    @tracing.traced
+    def harvest_records(self, plural_record_type: str, transform=None,
+                        processes: int = None,
+                        batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+                        concurrency: int = 1,
+                        chunk_size: int = (
+                            constants.DEFAULT_HARVEST_CHUNK_SIZE
+                        ),
+                        ordered=True, max_pending: int = None,
+                        mp_context=None, modified_since=None,):
+        """
+        Streams the results of `transform` for all records of a specific
+        type, like `records`, but downloads, decodes and transforms the
+        records in a pool of worker processes, so that throughput is not
+        limited to a single CPU core.
+
+        The `all_ids` list is split into chunks of `chunk_size` IDs, which
+        are handed out to the workers. Each worker has its own client, which
+        reuses this client's session token, and its session store and retry
+        settings. Each worker's client gets an equal share of the rate and
+        concurrency limits of this client's `rate_limiter` and
+        `concurrency_limiter`, so that together the workers stay within
+        them. This client's cache and router are not used by the workers.
+
+        The password is not passed to the workers. If the session expires
+        during a harvest, workers take a new token from this client's session
+        store, if it has one, and otherwise fail.
+
+        :plural_record_type: The desired record type, formatted as it
+        appears in the documentation for the related API endpoint.
+
+        :transform: Optional function called with each record in a worker
+        process, whose return value is streamed instead of the record. Must
+        be picklable, such as a function defined at the top level of a
+        module. Its return values must also be picklable.
+
+        :processes: Number of worker processes. Defaults to the number of
+        CPUs.
+
+        :batch_size: Number of records downloaded per request, using the
+        `id_set` parameter.
+
+        :concurrency: Number of threads used by each worker process to
+        download records.
+
+        :chunk_size: Number of record IDs handed to a worker at a time.
+
+        :ordered: If False, chunks of results are streamed as soon as they
+        are ready, rather than in the order of the `all_ids` list.
+
+        :max_pending: Maximum number of chunks that are being harvested or
+        waiting to be streamed at any time. Defaults to twice the number of
+        processes. Workers wait for the caller once this many chunks are
+        pending, so memory use stays bounded when the caller is slower than
+        the workers.
+
+        :mp_context: Optional multiprocessing context used to start the
+        workers. Defaults to the `spawn` start method, which is safe to use
+        from a program that has other threads running.
+
+        :modified_since: Optional Unix timestamp or `datetime`. If
+        specified, only records modified since then are streamed, using
+        ArchivesSpace's `modified_since` parameter. Please see
+        `sync_state.HighWaterMarks`.
+        """
+        return self._harvest(
+            ['/%s' % plural_record_type.strip('/')],
+            transform=transform,
+            processes=processes,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            ordered=ordered,
+            max_pending=max_pending,
+            mp_context=mp_context,
+            modified_since=modified_since,
+        )
+
+    @tracing.traced
+    def harvest_repository_relative_records(
+            self, plural_record_type: str, transform=None,
+            repository_uris: list = None, processes: int = None,
+            batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+            concurrency: int = 1,
+            chunk_size: int = constants.DEFAULT_HARVEST_CHUNK_SIZE,
+            ordered=True, max_pending: int = None, mp_context=None,
+            modified_since=None,):
+        """
+        Streams the results of `transform` for all records of a specific
+        type, like `repository_relative_records`, using a pool of worker
+        processes. Please see `harvest_records`.
+
+        :repository_uris: Optional list of repository URIs, which limits the
+        records that are downloaded. If omitted, records will be pulled from
+        all repositories.
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to records modified since then.
+        """
+        return self._harvest(
+            self._list_uris(
+                plural_record_type,
+                repository_uris=repository_uris,
+            ),
+            transform=transform,
+            processes=processes,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            chunk_size=chunk_size,
+            ordered=ordered,
+            max_pending=max_pending,
+            mp_context=mp_context,
+            modified_since=modified_since,
+        )
+
+    @tracing.traced
+    def uris(self, plural_record_type: str, modified_since=None,) -> iter:
         """
         Streams all URIs of a specific type from the ArchivesSpace instance,
         assuming that a `/:plural_record_type` endpoint exists, and supports
@@ -59,20 +1293,28 @@ class RecordStreamingService(object):
 
         :plural_record_type: The desired record type, formatted as it
         appears in the documentation for the related API endpoint.
+
+        :modified_since: Optional Unix timestamp or `datetime`. If
+        specified, only records modified since then are streamed, using
+        ArchivesSpace's `modified_since` parameter. Please see
+        `sync_state.HighWaterMarks`.
         """
         plural_record_type = plural_record_type.strip('/')
 
         return (
             '/%s/%d' % (plural_record_type, rec_id)
 
-            for rec_id in self._client.get(
-                '/%s?all_ids=true' % plural_record_type
-            ).json()
+            for rec_id in self._iter_all_ids(
+                '/%s' % plural_record_type, modified_since)
         )
 
+    @tracing.traced
     def repository_relative_uris(self, plural_record_type: str,
                                  repository_uris: list = None,
-                                 endpoint_extension: str = None,):
+                                 endpoint_extension: str = None,
+                                 modified_since=None,
+                                 repository_concurrency: int = 1,
+                                 interleaved=False,):
         """
         Streams all URIs of a specific type from the ArchivesSpace
         instance, assuming that a
@@ -90,49 +1332,187 @@ class RecordStreamingService(object):
         record URI. For example, specifying 'resources' and
         endpoint_extension='tree' supports the
         '/repositories/:repo_id/resources/:id/tree' endpoint.
+
+        :modified_since: Optional Unix timestamp or `datetime`. If
+        specified, only records modified since then are streamed, using
+        ArchivesSpace's `modified_since` parameter. Please see
+        `sync_state.HighWaterMarks`.
+
+        :repository_concurrency: Number of repositories whose IDs are listed
+        at the same time. Defaults to 1, which lists each repository's IDs
+        once the URIs of the previous repository have been streamed.
+
+        :interleaved: If True, the URIs of the repositories being listed at
+        the same time are streamed in turn, rather than grouped by
+        repository. Only has an effect when `repository_concurrency` is
+        greater than 1.
         """
-        plural_record_type = plural_record_type.strip('/')
+        list_uris = self._list_uris(
+            plural_record_type,
+            repository_uris=repository_uris,
+        )
+
+        if repository_concurrency > 1:
+            listed = util.concurrent_map(
+                lambda list_uri: (
+                    list_uri, self._all_ids(list_uri, modified_since)),
+                list_uris,
+                concurrency=repository_concurrency,
+            )
+
+            if interleaved:
+                rec_ids = (
+                    (listing[0], batch[0])
+                    for listing, batch in self._interleave(
+                        listed, 1, repository_concurrency)
+                )
+            else:
+                rec_ids = (
+                    (list_uri, rec_id)
+                    for list_uri, ids in listed
+                    for rec_id in ids
+                )
+        else:
+            rec_ids = (
+                (list_uri, rec_id)
+                for list_uri in list_uris
+                for rec_id in self._iter_all_ids(list_uri, modified_since)
+            )
 
         return (
-            '%s/%s/%d%s' %
+            '%s/%d%s' %
             (
-                repo_uri,
-                plural_record_type,
+                list_uri,
                 rec_id,
                 '' if endpoint_extension is None else
                 '/%s' % endpoint_extension.strip('/'),
             )
 
-            for repo_uri in self._get_repo_uris(repository_uris)
-
-            for rec_id in self._client.get(
-                '%s/%s?all_ids=true' %
-                (repo_uri, plural_record_type)
-            ).json()
+            for list_uri, rec_id in rec_ids
         )
 
-    def records(self, plural_record_type: str,):
+    @tracing.traced
+    def records(self, plural_record_type: str,
+                batch_size: int = constants.DEFAULT_ID_SET_BATCH_SIZE,
+                concurrency: int = 1, ordered=True, paged=False,
+                page_size: int = constants.DEFAULT_PAGE_SIZE,
+                prefetch: int = constants.DEFAULT_PAGE_PREFETCH,
+                modified_since=None,
+                checkpoint: sync_state.StreamCheckpoint = None,):
         """
         Streams all records of a specific type from the ArchivesSpace instance,
         assuming that a `/:plural_record_type` endpoint exists, and supports
-        the `all_ids=true` parameter.
+        the `all_ids=true` and `id_set` parameters.
 
         :plural_record_type: The desired record type, formatted as it
         appears in the documentation for the related API endpoint.
+
+        :batch_size: Number of records downloaded per request, using the
+        `id_set` parameter. Records are still streamed 1 by 1, in the order
+        of the `all_ids` list. Set to `None` to GET each record individually.
+
+        :concurrency: Number of worker threads used to download records. At
+        most twice this many requests are in flight or waiting to be
+        streamed at any time. Defaults to 1, which downloads records on the
+        calling thread.
+
+        :ordered: If False, records are streamed as soon as their requests
+        complete, rather than in the order of the `all_ids` list. Only has an
+        effect when `concurrency` is greater than 1.
+
+        :paged: If True, records are streamed straight from the `results` of
+        each page of the list endpoint, using the `page` and `page_size`
+        parameters, instead of downloading the `all_ids` list first. The
+        first record arrives after a single request, and memory use does
+        not grow with the number of records. `batch_size`, `concurrency` and
+        `ordered` are ignored, and the client's `cache` is not used. Records
+        created or deleted during the stream can shift the pages, so a
+        record may be skipped or streamed twice.
+
+        :page_size: Number of records per page, when `paged` is True.
+        ArchivesSpace caps it at its configured maximum page size.
+
+        :prefetch: Number of pages requested ahead of the page being
+        streamed, when `paged` is True. Set to 0 to request each page once
+        the previous one has been streamed.
+
+        :modified_since: Optional Unix timestamp or `datetime`. If
+        specified, only records modified since then are streamed, using
+        ArchivesSpace's `modified_since` parameter. Please see
+        `sync_state.HighWaterMarks`.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the
+        position of the stream is saved to as records are streamed. A stream
+        given a checkpoint that an earlier stream stopped part of the way
+        through continues from where it stopped. Unless `paged` is True,
+        records are streamed in the order of their IDs, whatever `ordered`
+        is.
         """
-        return (
-            self._client.get(uri).json()
-            for uri in self.uris(plural_record_type)
+        list_uri = '/%s' % plural_record_type.strip('/')
+
+        if checkpoint is not None:
+            return self._checkpointed(
+                [list_uri],
+                checkpoint,
+                functools.partial(
+                    self._resume_pages,
+                    page_size=page_size,
+                    prefetch=prefetch,
+                    modified_since=modified_since,
+                )
+                if paged else
+                functools.partial(
+                    self._resume_ids,
+                    batch_size=batch_size,
+                    concurrency=concurrency,
+                    modified_since=modified_since,
+                ),
+            )
+
+        if paged:
+            return self._iter_pages(
+                list_uri,
+                page_size=page_size,
+                prefetch=prefetch,
+                modified_since=modified_since,
+            )
+
+        return self._hydrate(
+            list_uri,
+            self._all_ids(list_uri, modified_since),
+            batch_size=batch_size,
+            concurrency=concurrency,
+            ordered=ordered,
+            complete=modified_since is None,
+            modified_since=modified_since,
         )
 
+    @tracing.traced
     def repository_relative_records(self, plural_record_type: str,
                                     repository_uris: list = None,
-                                    endpoint_extension: str = None,):
+                                    endpoint_extension: str = None,
+                                    batch_size: int = (
+                                        constants.DEFAULT_ID_SET_BATCH_SIZE
+                                    ),
+                                    concurrency: int = 1, ordered=True,
+                                    paged=False,
+                                    page_size: int = (
+                                        constants.DEFAULT_PAGE_SIZE
+                                    ),
+                                    prefetch: int = (
+                                        constants.DEFAULT_PAGE_PREFETCH
+                                    ),
+                                    modified_since=None,
+                                    checkpoint: (
+                                        sync_state.StreamCheckpoint
+                                    ) = None,
+                                    repository_concurrency: int = 1,
+                                    interleaved=False,):
         """
         Streams all records of a specific type from the ArchivesSpace
         instance, assuming that a
         `/repositories/:repo_id/:plural_record_type` endpoint
-        exists, and supports the `all_ids=true` parameter.
+        exists, and supports the `all_ids=true` and `id_set` parameters.
 
         :plural_record_type: The desired record type, formatted as it
         appears in the documentation for the related API endpoint.
@@ -144,21 +1524,148 @@ class RecordStreamingService(object):
         :endpoint_extension: Optional extension to put at the end of each
         record URI. For example, specifying 'resources' and
         endpoint_extension='tree' supports the
-        '/repositories/:repo_id/resources/:id/tree' endpoint.
+        '/repositories/:repo_id/resources/:id/tree' endpoint. Records with an
+        endpoint extension are always downloaded 1 at a time.
+
+        :batch_size: Number of records downloaded per request, using the
+        `id_set` parameter. Records are still streamed 1 by 1, in the order
+        of the `all_ids` list. Set to `None` to GET each record individually.
+
+        :concurrency: Number of worker threads used to download records. At
+        most twice this many requests are in flight or waiting to be
+        streamed at any time. Defaults to 1, which downloads records on the
+        calling thread.
+
+        :ordered: If False, records are streamed as soon as their requests
+        complete, rather than in the order of the `all_ids` list. Only has an
+        effect when `concurrency` is greater than 1.
+
+        :paged: If True, records are streamed straight from the pages of each
+        repository's list endpoint, rather than downloading its `all_ids`
+        list first. Has no effect with an `endpoint_extension`. Please see
+        `records`.
+
+        :page_size: Number of records per page, when `paged` is True.
+
+        :prefetch: Number of pages requested ahead of the page being
+        streamed, when `paged` is True.
+
+        :modified_since: Optional Unix timestamp or `datetime`. If
+        specified, only records modified since then are streamed, using
+        ArchivesSpace's `modified_since` parameter. Please see
+        `sync_state.HighWaterMarks`.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the
+        position of the stream in each repository is saved to. Repositories
+        that were streamed completely are skipped when the stream is
+        resumed. Please see `records`.
+
+        :repository_concurrency: Number of repositories streamed at the same
+        time. Their IDs are listed concurrently, and their records are
+        downloaded by a pool of `concurrency` worker threads that they
+        share, so that at most `concurrency` requests, or
+        `repository_concurrency` if it is greater, are in flight across all
+        of them. Defaults to 1, which streams 1 repository after another.
+        Has no effect on `paged` or checkpointed streams.
+
+        :interleaved: If True, batches of records from the repositories being
+        streamed at the same time are streamed in turn, rather than grouped
+        by repository. Only has an effect when `repository_concurrency` is
+        greater than 1.
         """
 
+        if checkpoint is not None:
+            return self._checkpointed(
+                self._list_uris(
+                    plural_record_type,
+                    repository_uris=repository_uris,
+                ),
+                checkpoint,
+                functools.partial(
+                    self._resume_pages,
+                    page_size=page_size,
+                    prefetch=prefetch,
+                    modified_since=modified_since,
+                )
+                if paged and endpoint_extension is None else
+                functools.partial(
+                    self._resume_ids,
+                    endpoint_extension=endpoint_extension,
+                    batch_size=batch_size,
+                    concurrency=concurrency,
+                    modified_since=modified_since,
+                ),
+            )
+
+        if repository_concurrency > 1 and not (
+                paged and endpoint_extension is None):
+            return self._fan_out(
+                self._list_uris(
+                    plural_record_type,
+                    repository_uris=repository_uris,
+                ),
+                endpoint_extension=endpoint_extension,
+                batch_size=batch_size,
+                concurrency=concurrency,
+                repository_concurrency=repository_concurrency,
+                ordered=ordered,
+                interleaved=interleaved,
+                modified_since=modified_since,
+            )
+
+        if endpoint_extension is not None:
+            return util.concurrent_map(
+                lambda uri: self._client.get(uri).json(),
+                self.repository_relative_uris(
+                    plural_record_type,
+                    repository_uris=repository_uris,
+                    endpoint_extension=endpoint_extension,
+                    modified_since=modified_since,
+                ),
+                concurrency=concurrency,
+                ordered=ordered,
+            )
+
+        if paged:
+            return (
+                record
+
+                for list_uri in self._list_uris(
+                    plural_record_type,
+                    repository_uris=repository_uris,
+                )
+
+                for record in self._iter_pages(
+                    list_uri,
+                    page_size=page_size,
+                    prefetch=prefetch,
+                    modified_since=modified_since,
+                )
+            )
+
         return (
-            self._client.get(uri).json()
+            record
 
-            for uri in self.repository_relative_uris(
+            for list_uri in self._list_uris(
                 plural_record_type,
                 repository_uris=repository_uris,
-                endpoint_extension=endpoint_extension,
+            )
+
+            for record in self._hydrate(
+                list_uri,
+                self._all_ids(list_uri, modified_since),
+                batch_size=batch_size,
+                concurrency=concurrency,
+                ordered=ordered,
+                complete=modified_since is None,
+                modified_since=modified_since,
             )
         )
 
+    @tracing.traced
     def resources(self, repository_uris: list = None,
-                  endpoint_extension: str = None,):
+                  endpoint_extension: str = None, modified_since=None,
+                  checkpoint: sync_state.StreamCheckpoint = None,):
         """
         Streams all resources from the ArchivesSpace instance.
 
@@ -169,16 +1676,26 @@ class RecordStreamingService(object):
         :endpoint_extension: Optional extension to put at the end of each
         record URI. For example, adding `'tree/root'` to generate tree uris
         like `/repositories/:repo_id/resources/:id/tree/root`
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to resources modified since then.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the stream
+        saves its position to, and resumes from. Please see `records`.
         """
 
         return self.repository_relative_records(
             plural_record_type='resources',
             repository_uris=repository_uris,
             endpoint_extension=endpoint_extension,
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
 
+    @tracing.traced
     def resource_trees(self, repository_uris: list = None,
-                       large_tree_extension: str = None):
+                       large_tree_extension: str = None, modified_since=None,
+                       checkpoint: sync_state.StreamCheckpoint = None,):
         """
         Streams all resource trees from the ArchivesSpace instance, using the
         `/repositories/:repo_id/resources/:id/tree` endpoint. The base
@@ -192,6 +1709,12 @@ class RecordStreamingService(object):
         :large_tree_extension: Optional extension on the tree endpoint. If
         specified, the text is added to the end of the tree uris:
         `/repositories/:repo_id/resources/:id/tree/{tree_ext...}`
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to the trees of resources modified since then.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the stream
+        saves its position to, and resumes from. Please see `records`.
         """
 
         endpoint_extension = 'tree'
@@ -204,84 +1727,159 @@ class RecordStreamingService(object):
 
         return self.resources(
             repository_uris=repository_uris,
-            endpoint_extension=endpoint_extension
+            endpoint_extension=endpoint_extension,
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
 
-    def resource_ordered_records(self, repository_uris: list = None,):
+    @tracing.traced
+    def resource_ordered_records(self, repository_uris: list = None,
+                                 modified_since=None,
+                                 checkpoint: (
+                                     sync_state.StreamCheckpoint
+                                 ) = None,):
         """
         Streams all resource ordered_records from the ArchivesSpace instance.
 
         :repository_uris: Optional list of repository URIs, which limits the
         records that are downloaded. If omitted, records will be pulled from
         all repositories.
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to resources modified since then.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the stream
+        saves its position to, and resumes from. Please see `records`.
         """
 
         return self.resources(
             repository_uris=repository_uris,
             endpoint_extension='ordered_records',
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
 
-    def accessions(self, repository_uris: list = None,):
+    @tracing.traced
+    def accessions(self, repository_uris: list = None, modified_since=None,
+                   checkpoint: sync_state.StreamCheckpoint = None,):
         """
         Streams all accession records from the ArchivesSpace instance.
 
         :repository_uris: Optional list of repository URIs, which limits the
         records that are downloaded. If omitted, records will be pulled from
         all repositories.
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to records modified since then.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the stream
+        saves its position to, and resumes from. Please see `records`.
         """
 
         return self.repository_relative_records(
             plural_record_type='accessions',
             repository_uris=repository_uris,
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
 
-    def archival_objects(self, repository_uris: list = None,):
+    @tracing.traced
+    def archival_objects(self, repository_uris: list = None,
+                         modified_since=None,
+                         checkpoint: sync_state.StreamCheckpoint = None,):
         """
         Streams all archival object records from the ArchivesSpace instance.
 
         :repository_uris: Optional list of repository URIs, which limits the
         records that are downloaded. If omitted, records will be pulled from
         all repositories.
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to records modified since then.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the stream
+        saves its position to, and resumes from. Please see `records`.
         """
 
         return self.repository_relative_records(
             plural_record_type='archival_objects',
             repository_uris=repository_uris,
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
 
-    def users(self):
+    @tracing.traced
+    def users(self, modified_since=None,
+              checkpoint: sync_state.StreamCheckpoint = None,):
         """
-        Streams all user records from the ArchivesSpace instance.
+        Streams all user records from the ArchivesSpace instance, or only
+        those modified since the `modified_since` timestamp.
+        Resumes from the `checkpoint`, if one is specified.
         """
-        return self.records('users')
+        return self.records(
+            'users', modified_since=modified_since, checkpoint=checkpoint)
 
-    def people(self):
+    @tracing.traced
+    def people(self, modified_since=None,
+               checkpoint: sync_state.StreamCheckpoint = None,):
         """
-        Streams all person agents from the ArchivesSpace instance.
+        Streams all person agents from the ArchivesSpace instance, or only
+        those modified since the `modified_since` timestamp.
+        Resumes from the `checkpoint`, if one is specified.
         """
-        return self.records('agents/people')
+        return self.records(
+            'agents/people',
+            modified_since=modified_since,
+            checkpoint=checkpoint,
+        )
 
-    def corporate_entities(self):
+    @tracing.traced
+    def corporate_entities(self, modified_since=None,
+                           checkpoint: sync_state.StreamCheckpoint = None,):
         """
-        Streams all corporate entity agents from the ArchivesSpace instance.
+        Streams all corporate entity agents from the ArchivesSpace instance,
+        or only those modified since the `modified_since` timestamp.
+        Resumes from the `checkpoint`, if one is specified.
         """
-        return self.records('agents/corporate_entities')
+        return self.records(
+            'agents/corporate_entities',
+            modified_since=modified_since,
+            checkpoint=checkpoint,
+        )
 
-    def families(self):
+    @tracing.traced
+    def families(self, modified_since=None,
+                 checkpoint: sync_state.StreamCheckpoint = None,):
         """
-        Streams all family agents from the ArchivesSpace instance.
+        Streams all family agents from the ArchivesSpace instance, or only
+        those modified since the `modified_since` timestamp.
+        Resumes from the `checkpoint`, if one is specified.
         """
-        return self.records('agents/families')
+        return self.records(
+            'agents/families',
+            modified_since=modified_since,
+            checkpoint=checkpoint,
+        )
 
-    def software(self):
+    @tracing.traced
+    def software(self, modified_since=None,
+                 checkpoint: sync_state.StreamCheckpoint = None,):
         """
-        Streams all software agents from the ArchivesSpace instance.
+        Streams all software agents from the ArchivesSpace instance, or only
+        those modified since the `modified_since` timestamp.
+        Resumes from the `checkpoint`, if one is specified.
         """
-        return self.records('agents/software')
+        return self.records(
+            'agents/software',
+            modified_since=modified_since,
+            checkpoint=checkpoint,
+        )
 
-    def all_agents(self):
+    @tracing.traced
+    def all_agents(self, modified_since=None):
         """
-        Streams all agent records from the ArchivesSpace instance.
+        Streams all agent records from the ArchivesSpace instance, or only
+        those modified since the `modified_since` timestamp.
         """
 
         return (
@@ -294,42 +1892,69 @@ class RecordStreamingService(object):
                 self.software,
             ]
 
-            for record in stream()
+            for record in stream(modified_since=modified_since)
         )
 
-    def top_containers(self, repository_uris: list = None,):
+    @tracing.traced
+    def top_containers(self, repository_uris: list = None,
+                       modified_since=None,
+                       checkpoint: sync_state.StreamCheckpoint = None,):
         """
         Streams all top_container records from the ArchivesSpace instance.
 
         :repository_uris: Optional list of repository URIs, which limits the
         records that are downloaded. If omitted, records will be pulled from
         all repositories.
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to records modified since then.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the stream
+        saves its position to, and resumes from. Please see `records`.
         """
 
         return self.repository_relative_records(
             plural_record_type='top_containers',
             repository_uris=repository_uris,
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
 
-    def subjects(self):
+    @tracing.traced
+    def subjects(self, modified_since=None,
+                 checkpoint: sync_state.StreamCheckpoint = None,):
         """
-        Streams all subject records from the ArchivesSpace instance.
+        Streams all subject records from the ArchivesSpace instance, or only
+        those modified since the `modified_since` timestamp.
+        Resumes from the `checkpoint`, if one is specified.
         """
 
         return self.records(
-            plural_record_type='subjects'
+            plural_record_type='subjects',
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
 
-    def jobs(self, repository_uris: list = None,):
+    @tracing.traced
+    def jobs(self, repository_uris: list = None, modified_since=None,
+             checkpoint: sync_state.StreamCheckpoint = None,):
         """
         Streams all job records from the ArchivesSpace instance.
 
         :repository_uris: Optional list of repository URIs, which limits the
         records that are downloaded. If omitted, records will be pulled from
         all repositories.
+
+        :modified_since: Optional Unix timestamp or `datetime`, which limits
+        the stream to records modified since then.
+
+        :checkpoint: Optional `sync_state.StreamCheckpoint`, which the stream
+        saves its position to, and resumes from. Please see `records`.
         """
 
         return self.repository_relative_records(
             plural_record_type="jobs",
             repository_uris=repository_uris,
+            modified_since=modified_since,
+            checkpoint=checkpoint,
         )
@@ -1,6 +1,6 @@
 import re
 
-from aspace import constants, base_client
+from aspace import constants, base_client, tracing
 
 
 class SchemaQueryingService(object):
@@ -13,6 +13,7 @@ class SchemaQueryingService(object):
         self._client = client
         self._schema_cache = {}
 
+    @tracing.traced
     def get_schema(self, schema_name: str) -> dict:
         """
         Gets the schema for the specified schema_name. The schema name must be
@@ -6,6 +6,7 @@ import json
 from aspace import base_client
 from aspace import enums
 from aspace import constants
+from aspace import tracing
 from aspace import util
 
 VALID_TOP_CONTAINER_URI_RE = re.compile(
@@ -30,6 +31,7 @@ class TopContainerManagementService(object):
         match = VALID_TOP_CONTAINER_URI_RE.match(top_container_uri)
         return bool(match)
 
+    @tracing.traced
     def get(self, tc_uri: str) -> dict:
         """
         Gets a top container using a top container URI.
@@ -38,6 +40,7 @@ class TopContainerManagementService(object):
         """
         return self._client.get(tc_uri).json()
 
+    @tracing.traced
     def linked_record_uris(self, top_container: Union[str, dict],
                            linked_record_type: str = None,
                            ) -> List[str]:
@@ -90,6 +93,7 @@ class TopContainerManagementService(object):
             for result in results:
                 linked_record_uris.add(result['uri'])
 
+    @tracing.traced
     def linked_records(self, top_container: Union[str, dict],
                        linked_record_type: str = None,
                        ) -> List[str]:
@@ -5,6 +5,7 @@ import random
 
 from aspace import base_client
 from aspace import constants
+from aspace import tracing
 from aspace.client_extensions import record_streams
 
 VALID_USER_URI_RE = re.compile(constants.VALID_USER_URI_REGEX)
@@ -20,6 +21,7 @@ class UserManagementService(object):
         self._client = client
         self._record_streams = record_streams.RecordStreamingService(client)
 
+    @tracing.traced
     def get_all(self) -> list:
         """
         Returns a list of all of the non-system user records in the
@@ -41,6 +43,7 @@ class UserManagementService(object):
         assert all_users_resp, all_users_resp.text
         return all_users_resp.json().get('results', [])
 
+    @tracing.traced
     def stream(self) -> iter:
         """
         Streams all non-system user records from the ArchivesSpace instance.
@@ -71,6 +74,7 @@ class UserManagementService(object):
             params={'password': password}
         )
 
+    @tracing.traced
     def change_password(self, user: Union[int, str, dict],
                         new_password: Union[str, callable],):
         """
@@ -91,6 +95,7 @@ class UserManagementService(object):
         user_record = self.get(user)
         return self._change_password(user_record, new_password)
 
+    @tracing.traced
     def change_all_passwords(self, new_password: Union[str, callable],
                              include_admin=False) -> list:
         """
@@ -116,6 +121,7 @@ class UserManagementService(object):
             if (not user['username'] == 'admin') or include_admin
         ]
 
+    @tracing.traced
     def randomize_all_passwords(self, password_characters: str = None,
                                 password_length: int = 16,
                                 new_admin_password: str = None,
@@ -148,6 +154,7 @@ class UserManagementService(object):
             resp = self.change_password('admin', new_admin_password)
             assert resp.ok, resp.text
 
+    @tracing.traced
     def get(self, user: Union[int, str, dict]) -> dict:
         """
         Gets a user based on a URI, user ID, username, or a dict
@@ -183,6 +190,7 @@ class UserManagementService(object):
 
         assert False, 'Unable to find user: "{}"'.format(user)
 
+    @tracing.traced
     def get_by_username(self, user: str) -> dict:
         """
         Attempts to get a user record using a username through the following
@@ -203,6 +211,7 @@ class UserManagementService(object):
         assert user_record, 'No user found with username: "{}"'.format(user)
         return user_record
 
+    @tracing.traced
     def create(self, user: dict, password: str) -> requests.Response:
         """
         Creates a new user and returns the HTTP response from the server.
@@ -218,6 +227,7 @@ class UserManagementService(object):
             params={'password': password},
         )
 
+    @tracing.traced
     def current_user(self) -> requests.Response:
         """
         Returns the HTTP response from the `/users/current-user` endpoint.
@@ -14,3 +14,89 @@ DEFAULT_PASSWORD_CHARACTER_SET = (
     + 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
     + '0123456789'
 )
+
+# ArchivesSpace rejects `id_set` lists that are larger than its configured
+# maximum page size, which defaults to 250.
+DEFAULT_ID_SET_BATCH_SIZE = 100
+
+# Number of records requested per page by paged record streams, and the
+# number of pages requested ahead of the one being streamed.
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_PAGE_PREFETCH = 1
+
+DEFAULT_ASYNC_MAX_CONNECTIONS = 100
+DEFAULT_ASYNC_CONCURRENCY = 16
+
+# Defaults match the requests library's HTTPAdapter.
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_BLOCK = False
+
+# Seconds that BaseASpaceClient.warm_up waits for all of its requests to
+# hold a connection at once.
+DEFAULT_WARM_UP_TIMEOUT = 10
+
+# Libraries that BaseASpaceClient can send its requests with. Please see the
+# transports module.
+TRANSPORT_REQUESTS = 'requests'
+TRANSPORT_HTTPX = 'httpx'
+DEFAULT_TRANSPORT = TRANSPORT_REQUESTS
+
+DEFAULT_RETRY_MAX_ATTEMPTS = 4
+DEFAULT_RETRY_STATUS_CODES = (429, 502, 503, 504)
+DEFAULT_RETRY_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+DEFAULT_RETRY_BACKOFF_FACTOR = 0.5
+DEFAULT_RETRY_MAX_BACKOFF = 30.0
+DEFAULT_RETRY_BUDGET_RATIO = 0.2
+DEFAULT_RETRY_BUDGET_MIN_RETRIES = 10
+
+DEFAULT_ADAPTIVE_INITIAL_LIMIT = 4
+DEFAULT_ADAPTIVE_MIN_LIMIT = 1
+DEFAULT_ADAPTIVE_MAX_LIMIT = 64
+DEFAULT_ADAPTIVE_LATENCY_TOLERANCE = 3.0
+DEFAULT_ADAPTIVE_BACKOFF_RATIO = 0.5
+DEFAULT_ADAPTIVE_WINDOW_SIZE = 100
+
+# Number of record IDs sent to a harvesting worker process at a time.
+DEFAULT_HARVEST_CHUNK_SIZE = 1000
+
+# Size of the chunks read from responses that are decoded incrementally.
+# Responses with a known length below the threshold are decoded in 1 call.
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+JSON_STREAM_THRESHOLD = 1024 * 1024
+
+DEFAULT_CACHE_MAX_BYTES = 1024 ** 3
+
+# Subtracted from the start of the last complete pass over a list endpoint,
+# or from a sync's high-water mark, when asking ArchivesSpace which records
+# have been modified since, to allow for clock differences between the client
+# and the server.
+CACHE_SYNC_MARGIN = 300
+
+# A checkpointed stream saves its position once this many records have been
+# streamed, or this many seconds have passed, since it last saved.
+DEFAULT_CHECKPOINT_RECORDS = 1000
+DEFAULT_CHECKPOINT_SECONDS = 10
+
+# Number of records that a read-ahead stream keeps buffered ahead of its
+# consumer.
+DEFAULT_READ_AHEAD_RECORDS = 500
+
+# Strategies used by routing.BackendRouter to spread reads across nodes.
+ROUTING_LEAST_OUTSTANDING = 'least_outstanding'
+ROUTING_ROUND_ROBIN = 'round_robin'
+DEFAULT_ROUTING_STRATEGY = ROUTING_LEAST_OUTSTANDING
+
+# A node is ejected after this many consecutive failed requests, and probed
+# every DEFAULT_ROUTING_PROBE_INTERVAL seconds until it is ready again.
+DEFAULT_ROUTING_MAX_FAILURES = 3
+DEFAULT_ROUTING_PROBE_INTERVAL = 5.0
+DEFAULT_ROUTING_PROBE_TIMEOUT = 5.0
+
+# Upper bounds, in seconds, of the request latency histogram buckets. These
+# match the default buckets of the Prometheus client libraries.
+DEFAULT_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+DEFAULT_METRICS_PREFIX = 'aspace_client'
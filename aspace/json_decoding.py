@@ -0,0 +1,243 @@
+r"""
+Contains the JSON decoding used for responses from ArchivesSpace. Uses
+orjson when it is installed, and the standard library's json module
+otherwise.
+"""
+
+import codecs
+import json
+
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# The error raised by `Response.json()` for invalid JSON. requests only has
+# its own JSONDecodeError from 2.27, and raised the decoder's error before.
+JSONDecodeError = getattr(
+    requests.exceptions, 'JSONDecodeError', json.JSONDecodeError)
+
+
+def loads(data):
+    """
+    Decodes a JSON document from `str` or `bytes`, using the fastest
+    available decoder.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """
+    Encodes an object as UTF-8 JSON bytes, using the fastest available
+    encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+class JSONResponse(requests.Response):
+    """
+    Extends the Response class from the requests Python library, decoding
+    JSON with a pluggable `json_loads` function, straight from the response
+    bytes.
+    """
+
+    json_loads = staticmethod(loads)
+
+    # Called once with the response, after its body has been read, so that
+    # the client can measure it.
+    on_complete = None
+    decoded_bytes = 0
+
+    def iter_content(self, *args, **kwargs):
+        """
+        Extends `Response.iter_content`, counting the decoded bytes of the
+        body as they are read.
+        """
+        for chunk in super().iter_content(*args, **kwargs):
+            if isinstance(chunk, bytes):
+                self.decoded_bytes += len(chunk)
+            yield chunk
+
+    def complete(self):
+        """
+        Calls `on_complete` the first time it is called.
+        """
+        on_complete, self.on_complete = self.on_complete, None
+        if on_complete is not None:
+            on_complete(self)
+
+    def close(self):
+        self.complete()
+        super().close()
+
+    def json(self, **kwargs):
+        """
+        Decodes the body of the response using `json_loads`. Keyword
+        arguments, and bodies that are not UTF-8, fall back to the requests
+        implementation.
+
+        Raises `JSONDecodeError` if the body is not valid JSON, as the
+        requests implementation does, whichever decoder is used.
+        """
+        if kwargs or (self.encoding or 'utf-8').lower() not in (
+                'utf-8', 'utf8'):
+            return super().json(**kwargs)
+
+        try:
+            return self.json_loads(self.content)
+        except ValueError as error:
+            raise JSONDecodeError(
+                getattr(error, 'msg', str(error)),
+                getattr(error, 'doc', ''),
+                getattr(error, 'pos', 0),
+            ) from error
+
+
+def _skip_whitespace(buffer: str, position: int) -> int:
+    while position < len(buffer) and buffer[position] in ' \t\r\n':
+        position += 1
+    return position
+
+
+def iter_json_array(chunks, encoding='utf-8', json_loads=None):
+    """
+    Incrementally decodes a JSON array from an iterable of `bytes` or `str`
+    chunks, yielding each element as soon as it has been received. Memory use
+    is bounded by the size of a chunk plus the largest element, rather than
+    the size of the array. Raises a `ValueError` if the chunks are not a
+    single valid JSON array.
+
+    The complete elements in each chunk are decoded at once with
+    `json_loads`, which defaults to `loads`, so arrays of small values, such
+    as `all_ids` lists, decode nearly as fast as with a single call. Elements
+    that span chunks are decoded 1 at a time.
+    """
+    json_loads = json_loads or loads
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    buffer = ''
+    position = 0
+    started = False
+    finished = False
+
+    # Whether the next token must be an element, rather than a separator,
+    # and whether the array has had an element yet.
+    need_value = True
+    empty = True
+
+    chunks = iter(chunks)
+
+    while True:
+        chunk = next(chunks, None)
+        final = chunk is None
+
+        if final:
+            buffer += text_decoder.decode(b'', final=True)
+        elif isinstance(chunk, bytes):
+            buffer += text_decoder.decode(chunk)
+        else:
+            buffer += chunk
+
+        if not started:
+            position = _skip_whitespace(buffer, position)
+            if position < len(buffer):
+                if buffer[position] != '[':
+                    raise ValueError(
+                        'Expected a JSON array, found: %r' %
+                        buffer[position:position + 20]
+                    )
+                started = True
+                position += 1
+
+        while started and not finished:
+
+            # Decodes every element up to the last comma in 1 call. If that
+            # comma is inside an element, the slice is not valid JSON, and
+            # the elements are decoded 1 at a time instead.
+            if need_value:
+                cut = buffer.rfind(',', position)
+                segment = buffer[position:cut] if cut != -1 else ''
+
+                if segment.strip():
+                    try:
+                        values = json_loads('[' + segment + ']')
+                    except ValueError:
+                        values = None
+
+                    if values is not None:
+                        yield from values
+                        position = cut + 1
+                        empty = False
+                        continue
+
+            position = _skip_whitespace(buffer, position)
+            if position >= len(buffer):
+                break
+
+            token = buffer[position]
+
+            if not need_value:
+                if token == ',':
+                    need_value = True
+                    position += 1
+                elif token == ']':
+                    finished = True
+                    position += 1
+                else:
+                    raise ValueError(
+                        "Expected ',' or ']' in JSON array, found: %r" %
+                        buffer[position:position + 20]
+                    )
+                continue
+
+            if token == ']' and empty:
+                finished = True
+                position += 1
+                continue
+
+            if token in ',]':
+                raise ValueError(
+                    'Expected a value in JSON array, found: %r' %
+                    buffer[position:position + 20]
+                )
+
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if final:
+                    raise
+                break
+
+            # A value is only complete once the next separator has arrived,
+            # since a number can continue in the next chunk, as in `3` `.5`.
+            if not final and (
+                    end >= len(buffer) or buffer[end] not in ' \t\r\n,]'):
+                break
+
+            yield value
+            position = end
+            need_value = False
+            empty = False
+
+        # Drops the part of the buffer that has already been decoded.
+        buffer = buffer[position:]
+        position = 0
+
+        if finished and buffer.strip():
+            raise ValueError(
+                'Unexpected data after JSON array: %r' % buffer[:20])
+
+        if final:
+            if not finished:
+                raise ValueError('Unexpected end of JSON array')
+            return
+
+        if finished:
+            buffer = ''
@@ -0,0 +1,388 @@
+r"""
+Contains classes that BaseASpaceClient uses to limit the load that it puts
+on an ArchivesSpace instance.
+"""
+
+import re
+import threading
+import time
+
+from aspace import constants
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limits the number of requests in flight, adjusting the limit using
+    additive increase, multiplicative decrease (AIMD). The limit grows by
+    roughly 1 for every round of requests that complete at a healthy latency,
+    and is cut by `backoff_ratio` when a request fails with a server error,
+    or when its latency climbs past `latency_tolerance` times the fastest
+    latency recently observed for the same endpoint.
+
+    Each endpoint has its own baseline latency, since a cheap request, such
+    as an `all_ids` listing, takes a fraction of the time of an `id_set`
+    batch, even when the server is healthy.
+
+    Threads that would go over the limit wait until a request completes.
+    """
+
+    def __init__(self, initial_limit: int = (
+                     constants.DEFAULT_ADAPTIVE_INITIAL_LIMIT),
+                 min_limit: int = constants.DEFAULT_ADAPTIVE_MIN_LIMIT,
+                 max_limit: int = constants.DEFAULT_ADAPTIVE_MAX_LIMIT,
+                 latency_tolerance: float = (
+                     constants.DEFAULT_ADAPTIVE_LATENCY_TOLERANCE),
+                 backoff_ratio: float = (
+                     constants.DEFAULT_ADAPTIVE_BACKOFF_RATIO),
+                 window_size: int = constants.DEFAULT_ADAPTIVE_WINDOW_SIZE,):
+        """
+        :initial_limit: Number of requests allowed in flight to start with.
+
+        :min_limit: The limit never drops below this number.
+
+        :max_limit: The limit never grows past this number.
+
+        :latency_tolerance: A request is considered slow if it takes longer
+        than this multiple of the baseline latency of its endpoint, which is
+        the fastest latency seen in the previous `window_size` requests to
+        the endpoint.
+
+        :backoff_ratio: The limit is multiplied by this ratio when requests
+        are slow or failing.
+
+        :window_size: Number of requests to an endpoint after which its
+        baseline latency is recalculated, so that it can follow the server's
+        real capacity.
+        """
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.window_size = max(window_size, 1)
+
+        self._limit = float(
+            min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+        # Maps each endpoint to its baseline latency, and the fastest
+        # latency and number of requests in its current window.
+        self._baselines = {}
+        self._last_decrease = 0.0
+
+        self._increases = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """
+        The number of requests currently allowed in flight.
+        """
+        return int(self._limit)
+
+    def acquire(self):
+        """
+        Waits until a request can be sent without going over the limit.
+        """
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, failed=False, endpoint: str = '',
+                sample_latency=True):
+        """
+        Marks a request as completed, and adjusts the limit based on its
+        `latency` in seconds, and whether it `failed`.
+
+        :endpoint: The endpoint that the request was sent to, whose baseline
+        latency it is compared with.
+
+        :sample_latency: If False, the latency is ignored, and only failures
+        adjust the limit. Used for requests whose latency says little about
+        the load on the server, such as streamed requests, which are only
+        timed until their headers arrive.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            slow = False
+
+            if sample_latency:
+                baseline = self._observe(endpoint, latency)
+                slow = latency > baseline * self.latency_tolerance
+
+            if failed or slow:
+                self._decrease(latency)
+            else:
+                self._increase()
+
+            self._condition.notify_all()
+
+    def _observe(self, endpoint: str, latency: float) -> float:
+        """
+        Adds `latency` to the window of `endpoint`, and returns the
+        endpoint's baseline latency.
+        """
+        state = self._baselines.get(endpoint)
+        if state is None:
+            state = self._baselines[endpoint] = {
+                'baseline': latency,
+                'window_min': None,
+                'window_count': 0,
+            }
+
+        if state['window_min'] is None or latency < state['window_min']:
+            state['window_min'] = latency
+
+        baseline = state['baseline'] = min(state['baseline'], latency)
+        state['window_count'] += 1
+
+        if state['window_count'] >= self.window_size:
+            state['baseline'] = state['window_min']
+            state['window_min'] = None
+            state['window_count'] = 0
+
+        return baseline
+
+    def _increase(self):
+        if self._limit < self.max_limit:
+
+            # Grows the limit by 1 once a full limit's worth of requests
+            # have completed successfully.
+            self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+            self._increases += 1
+
+    def _decrease(self, latency: float):
+        now = time.monotonic()
+
+        # Requests that were already in flight when the limit was cut report
+        # the same congestion, so only 1 cut is made per round trip.
+        if now - self._last_decrease < latency:
+            return
+
+        self._last_decrease = now
+        self._limit = max(self._limit * self.backoff_ratio, self.min_limit)
+        self._decreases += 1
+
+    def call(self, func, *args, endpoint: str = '', sample_latency=True,
+             **kwargs):
+        """
+        Calls `func` once a request slot is available, timing the call. The
+        call is counted as failed if it raises, or returns a response with a
+        status code of 429 or in the 500 series. Please see `release` for
+        `endpoint` and `sample_latency`.
+        """
+        self.acquire()
+        start = time.monotonic()
+        failed = True
+
+        try:
+            resp = func(*args, **kwargs)
+            status_code = getattr(resp, 'status_code', 200)
+            failed = status_code == 429 or status_code >= 500
+            return resp
+        finally:
+            self.release(
+                time.monotonic() - start,
+                failed=failed,
+                endpoint=endpoint,
+                sample_latency=sample_latency,
+            )
+
+    def share(self, parts: int) -> dict:
+        """
+        Returns the keyword arguments of a new limiter that allows 1 of
+        `parts` equal shares of this limiter's limits, so that `parts`
+        clients in other processes can together stay within them.
+        """
+        parts = max(parts, 1)
+
+        with self._condition:
+            return {
+                'initial_limit': max(int(self._limit) // parts, 1),
+                'min_limit': max(self.min_limit // parts, 1),
+                'max_limit': max(self.max_limit // parts, 1),
+                'latency_tolerance': self.latency_tolerance,
+                'backoff_ratio': self.backoff_ratio,
+                'window_size': self.window_size,
+            }
+
+    def stats(self) -> dict:
+        """
+        Returns the limiter's current state:
+
+        ```
+        {
+            'limit': int,
+            'in_flight': int,
+            'baseline_latencies': {endpoint: float},  # Seconds
+            'increases': int,
+            'decreases': int,
+        }
+        ```
+        """
+        with self._condition:
+            return {
+                'limit': int(self._limit),
+                'in_flight': self._in_flight,
+                'baseline_latencies': {
+                    endpoint: state['baseline']
+                    for endpoint, state in self._baselines.items()
+                },
+                'increases': self._increases,
+                'decreases': self._decreases,
+            }
+
+
+class TokenBucket(object):
+    """
+    Limits the rate of requests to `rate` per second, allowing bursts of up
+    to `burst` requests. Safe to share between threads. Threads that go over
+    the rate reserve a token and sleep until it becomes available, so
+    waiting threads are served in order.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        """
+        :rate: Number of requests allowed per second.
+
+        :burst: Number of requests that can be sent at once after a quiet
+        period. Defaults to `rate`, with a minimum of 1.
+        """
+        assert rate > 0, 'The rate must be greater than 0: %s' % rate
+
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waited = 0.0
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Takes `tokens` from the bucket, sleeping until they are available.
+        Returns the number of seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._tokens + (now - self._updated) * self.rate,
+                self.burst,
+            )
+            self._updated = now
+
+            # Tokens are taken straight away, even if that leaves the bucket
+            # in debt. The debt is paid off by waiting.
+            self._tokens -= tokens
+            wait = max(-self._tokens / self.rate, 0.0)
+            self._waited += wait
+
+        if wait:
+            time.sleep(wait)
+
+        return wait
+
+    def stats(self) -> dict:
+        """
+        Returns the bucket's settings and the total time spent waiting.
+        """
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'waited': self._waited,
+            }
+
+
+class RateLimiter(object):
+    """
+    Limits the rate of requests sent by a client, using a global
+    `TokenBucket` and optional buckets for endpoints that match URI patterns.
+    A request takes a token from the global bucket, and from the bucket of
+    the first endpoint pattern that matches its URI.
+    """
+
+    def __init__(self, rate: float = None, burst: float = None,
+                 endpoint_rates: dict = None):
+        """
+        :rate: Requests per second allowed for the whole client. If `None`,
+        only the endpoint rates apply.
+
+        :burst: Burst size of the global bucket. Please see `TokenBucket`.
+
+        :endpoint_rates: Optional dict mapping regular expressions to either
+        a rate or a `(rate, burst)` tuple. Patterns are searched for in the
+        request's URI, relative to the API host. For example,
+        `{r'/search': 2, r'^/users': (1, 1)}`.
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.endpoint_buckets = [
+            (
+                re.compile(pattern),
+                TokenBucket(*limit)
+                if isinstance(limit, (tuple, list)) else
+                TokenBucket(limit)
+            )
+            for pattern, limit in (endpoint_rates or {}).items()
+        ]
+
+    def acquire(self, uri: str) -> float:
+        """
+        Takes a token for a request to `uri`, sleeping until one is
+        available. Returns the number of seconds spent waiting.
+        """
+        waited = 0.0
+
+        for pattern, bucket in self.endpoint_buckets:
+            if pattern.search(uri):
+                waited += bucket.acquire()
+                break
+
+        if self.bucket is not None:
+            waited += self.bucket.acquire()
+
+        return waited
+
+    def call(self, uri: str, func, *args, **kwargs):
+        """
+        Calls `func` once the rate limit allows a request to `uri`.
+        """
+        self.acquire(uri)
+        return func(*args, **kwargs)
+
+    def share(self, parts: int) -> dict:
+        """
+        Returns the keyword arguments of a new limiter whose rates are each
+        divided by `parts`, so that `parts` clients in other processes can
+        together stay within this limiter's rates. Burst sizes are divided
+        too, with a minimum of 1.
+        """
+        parts = max(parts, 1)
+
+        def divide(bucket):
+            return bucket.rate / parts, max(bucket.burst / parts, 1)
+
+        rate, burst = (
+            divide(self.bucket) if self.bucket is not None else (None, None))
+
+        return {
+            'rate': rate,
+            'burst': burst,
+            'endpoint_rates': {
+                pattern.pattern: divide(bucket)
+                for pattern, bucket in self.endpoint_buckets
+            },
+        }
+
+    def stats(self) -> dict:
+        """
+        Returns the stats of the global bucket, and of each endpoint bucket
+        keyed by its pattern.
+        """
+        return {
+            'global': self.bucket.stats() if self.bucket else None,
+            'endpoints': {
+                pattern.pattern: bucket.stats()
+                for pattern, bucket in self.endpoint_buckets
+            },
+        }
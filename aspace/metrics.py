@@ -0,0 +1,373 @@
+r"""
+Contains classes that BaseASpaceClient uses to measure the requests that it
+sends to ArchivesSpace.
+"""
+
+import bisect
+import collections
+import threading
+
+from aspace import constants
+
+
+def _escape_label(value) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _sample(name: str, labels: dict, value) -> str:
+    """
+    Formats a sample in the Prometheus text exposition format.
+    """
+    label_text = ','.join(
+        '%s="%s"' % (key, _escape_label(label))
+        for key, label in labels.items()
+    )
+    return '%s{%s} %s' % (name, label_text, value)
+
+
+class BandwidthMeter(object):
+    """
+    Counts the bytes received by a client for each endpoint template, both as
+    sent over the wire (compressed) and after decoding (uncompressed). Safe
+    to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = collections.defaultdict(lambda: {
+            'responses': 0,
+            'wire_bytes': 0,
+            'decoded_bytes': 0,
+            'encodings': collections.Counter(),
+        })
+
+    def record(self, endpoint: str, wire_bytes: int, decoded_bytes: int,
+               encoding: str = None):
+        """
+        Counts a response from `endpoint`.
+
+        :wire_bytes: Size of the body as received over the network.
+
+        :decoded_bytes: Size of the body after it was decompressed.
+
+        :encoding: The response's `Content-Encoding`, if any.
+        """
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats['responses'] += 1
+            stats['wire_bytes'] += wire_bytes
+            stats['decoded_bytes'] += decoded_bytes
+            stats['encodings'][encoding or 'identity'] += 1
+
+    @staticmethod
+    def _ratio(stats: dict) -> float:
+        if not stats['wire_bytes']:
+            return None
+        return stats['decoded_bytes'] / stats['wire_bytes']
+
+    def snapshot(self) -> dict:
+        """
+        Returns the byte counts for each endpoint template, and in total:
+
+        ```
+        {
+            'total': {
+                'responses': int,
+                'wire_bytes': int,
+                'decoded_bytes': int,
+                'compression_ratio': float,  # decoded_bytes / wire_bytes
+            },
+            'endpoints': {
+                '/repositories/:id/archival_objects': {
+                    ...same as total...,
+                    'encodings': {'gzip': int, 'identity': int},
+                },
+            },
+        }
+        ```
+        """
+        with self._lock:
+            endpoints = {
+                endpoint: dict(
+                    stats,
+                    encodings=dict(stats['encodings']),
+                    compression_ratio=self._ratio(stats),
+                )
+                for endpoint, stats in self._endpoints.items()
+            }
+
+        total = {
+            key: sum(stats[key] for stats in endpoints.values())
+            for key in ('responses', 'wire_bytes', 'decoded_bytes')
+        }
+        total['compression_ratio'] = self._ratio(total)
+
+        return {'total': total, 'endpoints': endpoints}
+
+    def reset(self):
+        """
+        Clears all of the counts.
+        """
+        with self._lock:
+            self._endpoints.clear()
+
+    def prometheus_text(self, prefix: str = constants.DEFAULT_METRICS_PREFIX
+                        ) -> str:
+        """
+        Returns the byte counts in the Prometheus text exposition format.
+        """
+        endpoints = self.snapshot()['endpoints']
+        lines = []
+
+        for key, help_text in (
+                ('wire_bytes', 'Response bytes received over the network.'),
+                ('decoded_bytes', 'Response bytes after decompression.')):
+            name = '%s_response_%s_total' % (prefix, key)
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s counter' % name)
+            lines.extend(
+                _sample(name, {'endpoint': endpoint}, stats[key])
+                for endpoint, stats in sorted(endpoints.items())
+            )
+
+        return '\n'.join(lines) + '\n'
+
+
+class RequestMetrics(object):
+    """
+    Counts the requests sent by a client for each endpoint template, with
+    their status codes, a histogram of their latencies, and the number of
+    times a 412 forced a re-authentication. Recording a request only takes a
+    lock and a few dict updates, so the metrics can be left on in
+    production. Safe to share between threads.
+    """
+
+    def __init__(self, buckets=constants.DEFAULT_LATENCY_BUCKETS):
+        """
+        :buckets: Sorted upper bounds, in seconds, of the latency histogram
+        buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._endpoints = collections.defaultdict(lambda: {
+            'requests': 0,
+            'errors': 0,
+            'reauthentications': 0,
+            'responses': collections.Counter(),
+            'latency_sum': 0.0,
+
+            # The last count is for latencies above the largest bucket.
+            'latency_counts': [0] * (len(self.buckets) + 1),
+        })
+
+    def record(self, method: str, endpoint: str, status_code: int,
+               latency: float):
+        """
+        Counts a request to `endpoint`, which took `latency` seconds. A
+        `status_code` of `None` counts a request that raised an error.
+        """
+        index = bisect.bisect_left(self.buckets, latency)
+
+        with self._lock:
+            stats = self._endpoints[endpoint]
+            stats['requests'] += 1
+            stats['responses'][method, status_code or 'error'] += 1
+            stats['latency_sum'] += latency
+            stats['latency_counts'][index] += 1
+
+            if status_code is None:
+                stats['errors'] += 1
+
+    def record_reauthentication(self, endpoint: str):
+        """
+        Counts a request to `endpoint` that received a 412, and was replayed
+        after re-authenticating.
+        """
+        with self._lock:
+            self._endpoints[endpoint]['reauthentications'] += 1
+
+    def _quantile(self, counts: list, quantile: float) -> float:
+        """
+        Estimates a latency quantile from the histogram, by interpolating
+        within the bucket that it falls in.
+        """
+        total = sum(counts)
+        if not total:
+            return None
+
+        rank = quantile * total
+        seen = 0
+
+        for index, count in enumerate(counts):
+            if seen + count >= rank and count:
+                if index >= len(self.buckets):
+                    return self.buckets[-1] if self.buckets else None
+
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+
+            seen += count
+
+        return None
+
+    def _copy(self) -> dict:
+        """
+        Returns a copy of the counts, sorted by endpoint template.
+        """
+        with self._lock:
+            return {
+                endpoint: dict(
+                    stats,
+                    responses=dict(stats['responses']),
+                    latency_counts=list(stats['latency_counts']),
+                )
+                for endpoint, stats in sorted(self._endpoints.items())
+            }
+
+    def snapshot(self) -> dict:
+        """
+        Returns the counts for each endpoint template, and in total:
+
+        ```
+        {
+            'total': {
+                'requests': int,
+                'errors': int,             # Requests that raised an error
+                'reauthentications': int,  # Requests replayed after a 412
+            },
+            'endpoints': {
+                '/repositories/:id/archival_objects/:id': {
+                    ...same as total...,
+                    'status_codes': {200: int, 412: int, ...},
+                    'methods': {'GET': int, ...},
+                    'latency': {
+                        'count': int,
+                        'sum': float,  # Seconds
+                        'mean': float,
+                        'p50': float,  # Estimated from the histogram
+                        'p90': float,
+                        'p99': float,
+                        'buckets': [(0.005, int), ..., (inf, int)],
+                    },
+                },
+            },
+        }
+        ```
+
+        The histogram bucket counts are cumulative, as in Prometheus.
+        """
+        raw = self._copy()
+        endpoints = {}
+
+        for endpoint, stats in raw.items():
+            status_codes = collections.Counter()
+            methods = collections.Counter()
+
+            for (method, status_code), count in stats['responses'].items():
+                status_codes[status_code] += count
+                methods[method] += count
+
+            counts = stats['latency_counts']
+            cumulative = 0
+            buckets = []
+
+            for upper, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                buckets.append((upper, cumulative))
+
+            endpoints[endpoint] = {
+                'requests': stats['requests'],
+                'errors': stats['errors'],
+                'reauthentications': stats['reauthentications'],
+                'status_codes': dict(status_codes),
+                'methods': dict(methods),
+                'latency': {
+                    'count': stats['requests'],
+                    'sum': stats['latency_sum'],
+                    'mean': (
+                        stats['latency_sum'] / stats['requests']
+                        if stats['requests'] else None
+                    ),
+                    'p50': self._quantile(counts, 0.5),
+                    'p90': self._quantile(counts, 0.9),
+                    'p99': self._quantile(counts, 0.99),
+                    'buckets': buckets,
+                },
+            }
+
+        total = {
+            key: sum(stats[key] for stats in endpoints.values())
+            for key in ('requests', 'errors', 'reauthentications')
+        }
+
+        return {'total': total, 'endpoints': endpoints}
+
+    def reset(self):
+        """
+        Clears all of the counts.
+        """
+        with self._lock:
+            self._endpoints.clear()
+
+    def prometheus_text(self, prefix: str = constants.DEFAULT_METRICS_PREFIX
+                        ) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        raw = self._copy()
+        requests_name = prefix + '_requests_total'
+        latency_name = prefix + '_request_duration_seconds'
+        reauth_name = prefix + '_reauthentications_total'
+
+        lines = [
+            '# HELP %s Requests sent, by endpoint, method and status code.'
+            % requests_name,
+            '# TYPE %s counter' % requests_name,
+        ]
+
+        for endpoint, stats in raw.items():
+            for (method, status_code), count in sorted(
+                    stats['responses'].items(), key=str):
+                lines.append(_sample(requests_name, {
+                    'endpoint': endpoint,
+                    'method': method,
+                    'code': status_code,
+                }, count))
+
+        lines.append(
+            '# HELP %s Latency of requests, by endpoint.' % latency_name)
+        lines.append('# TYPE %s histogram' % latency_name)
+
+        for endpoint, stats in raw.items():
+            cumulative = 0
+
+            for upper, count in zip(self.buckets + (float('inf'),),
+                                    stats['latency_counts']):
+                cumulative += count
+                lines.append(_sample(latency_name + '_bucket', {
+                    'endpoint': endpoint,
+                    'le': '+Inf' if upper == float('inf') else repr(upper),
+                }, cumulative))
+
+            lines.append(_sample(latency_name + '_sum',
+                                 {'endpoint': endpoint}, stats['latency_sum']))
+            lines.append(_sample(latency_name + '_count',
+                                 {'endpoint': endpoint}, stats['requests']))
+
+        lines.append(
+            '# HELP %s Requests replayed after a 412, by endpoint.'
+            % reauth_name)
+        lines.append('# TYPE %s counter' % reauth_name)
+        lines.extend(
+            _sample(reauth_name, {'endpoint': endpoint},
+                    stats['reauthentications'])
+            for endpoint, stats in raw.items()
+        )
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,195 @@
+r"""
+Contains the RetryPolicy class, used by BaseASpaceClient to retry requests
+that fail because of transient server or network errors.
+"""
+
+import collections
+import random
+import threading
+import time
+
+import requests
+
+from aspace import constants
+
+
+class RetryPolicy(object):
+    """
+    Decides whether, and when, a failed request is retried. Retries use
+    exponential backoff with full jitter, and are limited by a retry budget
+    that is shared by every thread using the policy, so that retries cannot
+    multiply the load on an ArchivesSpace instance that is already failing.
+    """
+
+    RETRYABLE_EXCEPTIONS = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.ChunkedEncodingError,
+        requests.exceptions.Timeout,
+    )
+
+    def __init__(self, max_attempts: int = constants.DEFAULT_RETRY_MAX_ATTEMPTS,
+                 status_codes=constants.DEFAULT_RETRY_STATUS_CODES,
+                 methods=constants.DEFAULT_RETRY_METHODS,
+                 backoff_factor: float = constants.DEFAULT_RETRY_BACKOFF_FACTOR,
+                 max_backoff: float = constants.DEFAULT_RETRY_MAX_BACKOFF,
+                 budget_ratio: float = constants.DEFAULT_RETRY_BUDGET_RATIO,
+                 budget_min_retries: int = (
+                     constants.DEFAULT_RETRY_BUDGET_MIN_RETRIES
+                 ),):
+        """
+        :max_attempts: Maximum number of times a request is sent, including
+        the first attempt.
+
+        :status_codes: HTTP response codes that are retried.
+
+        :methods: HTTP methods that are retried. Only idempotent methods
+        should be listed. ArchivesSpace uses POST for updates, so POST is not
+        retried by default.
+
+        :backoff_factor: The delay before retry `n` is a random number of
+        seconds between 0 and `backoff_factor * 2 ** (n - 1)`. A
+        `Retry-After` header from the server takes precedence.
+
+        :max_backoff: Upper bound, in seconds, for the delay before a retry.
+
+        :budget_ratio: Each request earns this fraction of a retry, so that
+        at most roughly this proportion of requests are retries.
+
+        :budget_min_retries: Number of retries that are always available,
+        so that a client that has only sent a few requests can still retry.
+        Also caps how many unused retries can be saved up.
+        """
+        self.max_attempts = max(max_attempts, 1)
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget_ratio = budget_ratio
+        self.budget_min_retries = budget_min_retries
+
+        self._lock = threading.Lock()
+        self._budget = float(budget_min_retries)
+        self._requests = 0
+        self._retries = 0
+        self._budget_exhausted = 0
+        self._retries_by_reason = collections.Counter()
+
+    def is_retryable(self, method: str, resp: requests.Response = None,
+                     error: Exception = None) -> bool:
+        """
+        Returns True if a request with the given method, that resulted in
+        either `resp` or `error`, is eligible for a retry.
+        """
+        if (method or '').upper() not in self.methods:
+            return False
+
+        if error is not None:
+            return isinstance(error, self.RETRYABLE_EXCEPTIONS)
+
+        return resp is not None and resp.status_code in self.status_codes
+
+    def record_request(self):
+        """
+        Counts a new request, adding to the retry budget.
+        """
+        with self._lock:
+            self._requests += 1
+            self._budget = min(
+                self._budget + self.budget_ratio,
+                max(self.budget_min_retries, 1),
+            )
+
+    def acquire_retry(self, reason: str) -> bool:
+        """
+        Takes a retry out of the budget. Returns False, without taking a
+        retry, if the budget has been used up.
+        """
+        with self._lock:
+            if self._budget < 1:
+                self._budget_exhausted += 1
+                return False
+
+            self._budget -= 1
+            self._retries += 1
+            self._retries_by_reason[reason] += 1
+            return True
+
+    def backoff(self, retry_number: int, resp: requests.Response = None
+                ) -> float:
+        """
+        Returns the number of seconds to wait before the specified retry.
+        """
+        retry_after = (
+            resp.headers.get('Retry-After') if resp is not None else None
+        )
+
+        if retry_after and retry_after.strip().isdigit():
+            return min(float(retry_after), self.max_backoff)
+
+        return random.uniform(
+            0,
+            min(self.backoff_factor * 2 ** (retry_number - 1),
+                self.max_backoff),
+        )
+
+    def stats(self) -> dict:
+        """
+        Returns the number of requests and retries seen by the policy:
+
+        ```
+        {
+            'requests': int,          # Requests sent, excluding retries
+            'retries': int,           # Retries sent
+            'budget_exhausted': int,  # Retries refused by the retry budget
+            'retries_by_reason': {'503': int, 'ConnectionError': int, ...},
+        }
+        ```
+        """
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'retries': self._retries,
+                'budget_exhausted': self._budget_exhausted,
+                'retries_by_reason': dict(self._retries_by_reason),
+            }
+
+    def send(self, send, request: requests.PreparedRequest
+             ) -> requests.Response:
+        """
+        Calls `send(request)` until it succeeds, fails with an error that is
+        not retryable, runs out of attempts, or the retry budget is used up.
+        """
+        self.record_request()
+        attempt = 1
+
+        while True:
+            resp = error = None
+
+            try:
+                resp = send(request)
+            except self.RETRYABLE_EXCEPTIONS as e:
+                error = e
+
+            if (attempt >= self.max_attempts
+                    or not self.is_retryable(request.method, resp, error)):
+                if error is not None:
+                    raise error
+                return resp
+
+            reason = (
+                type(error).__name__ if error is not None else
+                str(resp.status_code)
+            )
+
+            if not self.acquire_retry(reason):
+                if error is not None:
+                    raise error
+                return resp
+
+            delay = self.backoff(attempt, resp)
+
+            if resp is not None:
+                resp.close()
+
+            time.sleep(delay)
+            attempt += 1
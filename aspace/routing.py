@@ -0,0 +1,250 @@
+r"""
+Contains the BackendRouter class, which BaseASpaceClient uses to spread
+requests across several ArchivesSpace backend nodes.
+"""
+
+import itertools
+import threading
+import time
+
+import requests
+
+from aspace import constants
+
+
+class BackendRouter(object):
+    """
+    Chooses the ArchivesSpace backend node that each request is sent to.
+    Reads are spread across every healthy node, either to the node with the
+    fewest requests in flight, or in turn. Writes can be pinned to the
+    primary node, which is the first host listed.
+
+    A node that fails `max_failures` requests in a row, with a connection
+    error or a gateway status code, is ejected. Ejected nodes are probed in
+    the background with the same check as `wait_until_ready`, and rejoin
+    once the probe succeeds. If every node has been ejected, requests are
+    spread across all of them rather than failing outright.
+
+    The nodes must share a database, so that session tokens are valid on
+    every node.
+    """
+
+    READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+    FAILURE_STATUS_CODES = frozenset((502, 503, 504))
+
+    FAILURE_EXCEPTIONS = (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+    )
+
+    def __init__(self, hosts: list,
+                 strategy: str = constants.DEFAULT_ROUTING_STRATEGY,
+                 pin_writes=False,
+                 max_failures: int = constants.DEFAULT_ROUTING_MAX_FAILURES,
+                 probe_interval: float = (
+                     constants.DEFAULT_ROUTING_PROBE_INTERVAL),
+                 probe_timeout: float = (
+                     constants.DEFAULT_ROUTING_PROBE_TIMEOUT),):
+        """
+        :hosts: Urls of the API of each backend node. The first is the
+        primary node.
+
+        :strategy: `constants.ROUTING_LEAST_OUTSTANDING` sends each read to
+        the node with the fewest requests in flight.
+        `constants.ROUTING_ROUND_ROBIN` sends reads to each node in turn.
+
+        :pin_writes: If True, requests that are not reads are always sent to
+        the primary node.
+
+        :max_failures: Number of consecutive failed requests after which a
+        node is ejected.
+
+        :probe_interval: Number of seconds between probes of an ejected node.
+
+        :probe_timeout: Number of seconds to wait for a probe's response.
+        """
+        hosts = [
+            host.strip() if host.strip().endswith('/') else host.strip() + '/'
+            for host in hosts
+        ]
+
+        assert hosts, 'At least 1 host is required.'
+        assert strategy in (
+            constants.ROUTING_LEAST_OUTSTANDING,
+            constants.ROUTING_ROUND_ROBIN,
+        ), 'Unknown routing strategy: %s' % strategy
+
+        self.hosts = hosts
+        self.primary = hosts[0]
+        self.strategy = strategy
+        self.pin_writes = pin_writes
+        self.max_failures = max(max_failures, 1)
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+
+        # Called with a host and a timeout, returning True if the node is
+        # ready. Set by the client that uses the router.
+        self.probe = None
+
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+        self._nodes = {
+            host: {
+                'healthy': True,
+                'outstanding': 0,
+                'requests': 0,
+                'failures': 0,
+                'consecutive_failures': 0,
+                'ejections': 0,
+                'probe_at': 0.0,
+                'probing': False,
+            }
+            for host in hosts
+        }
+
+    def choose(self, method: str) -> str:
+        """
+        Returns the host that a request with the given method is sent to.
+        """
+        if self.pin_writes and (method or '').upper() not in self.READ_METHODS:
+            return self.primary
+
+        with self._lock:
+            self._probe_ejected()
+
+            candidates = [
+                host for host in self.hosts if self._nodes[host]['healthy']
+            ] or self.hosts
+
+            # Starts from a different node each time, so that ties between
+            # nodes with the same number of requests in flight are shared.
+            start = next(self._turn) % len(candidates)
+            candidates = candidates[start:] + candidates[:start]
+
+            if self.strategy == constants.ROUTING_ROUND_ROBIN:
+                return candidates[0]
+
+            return min(
+                candidates,
+                key=lambda host: self._nodes[host]['outstanding'],
+            )
+
+    def call(self, host: str, func, *args, **kwargs):
+        """
+        Calls `func`, which sends a request to `host`, counting the request
+        as in flight until it returns, and recording whether it failed.
+        """
+        with self._lock:
+            self._nodes[host]['outstanding'] += 1
+            self._nodes[host]['requests'] += 1
+
+        failed = True
+
+        try:
+            resp = func(*args, **kwargs)
+            failed = (
+                getattr(resp, 'status_code', 200) in self.FAILURE_STATUS_CODES
+            )
+            return resp
+        except self.FAILURE_EXCEPTIONS:
+            raise
+        except BaseException:
+
+            # Other errors, such as invalid requests, say nothing about the
+            # health of the node.
+            failed = False
+            raise
+        finally:
+            self._release(host, failed)
+
+    def _release(self, host: str, failed: bool):
+        with self._lock:
+            node = self._nodes[host]
+            node['outstanding'] -= 1
+
+            if not failed:
+                node['consecutive_failures'] = 0
+                return
+
+            node['failures'] += 1
+            node['consecutive_failures'] += 1
+
+            if (node['healthy']
+                    and node['consecutive_failures'] >= self.max_failures):
+                node['healthy'] = False
+                node['ejections'] += 1
+                node['probe_at'] = time.monotonic() + self.probe_interval
+
+    def _probe_ejected(self):
+        """
+        Starts a background probe of each ejected node that is due one. Must
+        be called with the lock held.
+        """
+        if self.probe is None:
+            return
+
+        now = time.monotonic()
+
+        for host, node in self._nodes.items():
+            if node['healthy'] or node['probing'] or now < node['probe_at']:
+                continue
+
+            node['probing'] = True
+            threading.Thread(
+                target=self._run_probe,
+                args=(host,),
+                daemon=True,
+            ).start()
+
+    def _run_probe(self, host: str) -> bool:
+        try:
+            ready = bool(self.probe(host, self.probe_timeout))
+        except Exception:
+            ready = False
+
+        with self._lock:
+            node = self._nodes[host]
+            node['probing'] = False
+
+            if ready:
+                node['healthy'] = True
+                node['consecutive_failures'] = 0
+            else:
+                if node['healthy']:
+                    node['healthy'] = False
+                    node['ejections'] += 1
+                node['probe_at'] = time.monotonic() + self.probe_interval
+
+        return ready
+
+    def probe_all(self) -> list:
+        """
+        Probes every node straight away, updating their health. Returns the
+        hosts of the nodes that are ready.
+        """
+        return [host for host in self.hosts if self._run_probe(host)]
+
+    def stats(self) -> dict:
+        """
+        Returns the state of each node, keyed by host:
+
+        ```
+        {
+            'healthy': bool,
+            'outstanding': int,  # Requests in flight
+            'requests': int,
+            'failures': int,
+            'ejections': int,
+        }
+        ```
+        """
+        with self._lock:
+            return {
+                host: {
+                    key: node[key]
+                    for key in ('healthy', 'outstanding', 'requests',
+                                'failures', 'ejections')
+                }
+                for host, node in self._nodes.items()
+            }
@@ -0,0 +1,117 @@
+r"""
+Contains the FileSessionStore class, which lets short-lived processes share
+ArchivesSpace session tokens instead of each logging in.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+class FileSessionStore(object):
+    """
+    Persists `X-ArchivesSpace-Session` tokens in a JSON file, keyed by API
+    host and username. Reads and writes hold an exclusive lock on a
+    `.lock` file next to the store, so the store can be shared by many
+    processes. The store is created with permissions that only allow the
+    current user to read it.
+    """
+
+    def __init__(self, path: str):
+        """
+        :path: Path of the JSON file that tokens are stored in.
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self._lock_path = self.path + '.lock'
+        self._thread_lock = threading.Lock()
+
+    @staticmethod
+    def _key(api_host: str, username: str) -> str:
+        return '%s@%s' % (username, api_host.rstrip('/'))
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """
+        Holds the store's lock, across threads and processes.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with self._thread_lock:
+            fd = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                elif msvcrt is not None:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+                yield
+
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+                os.close(fd)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r') as store_file:
+                return json.load(store_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, sessions: dict):
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path))
+
+        try:
+            with os.fdopen(fd, 'w') as temp_file:
+                json.dump(sessions, temp_file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, api_host: str, username: str) -> str:
+        """
+        Returns the stored session token for the user on the API host, or
+        `None`.
+        """
+        with self._locked():
+            return self._read().get(self._key(api_host, username))
+
+    def save(self, api_host: str, username: str, session: str):
+        """
+        Stores the session token for the user on the API host.
+        """
+        with self._locked():
+            sessions = self._read()
+            sessions[self._key(api_host, username)] = session
+            self._write(sessions)
+
+    def discard(self, api_host: str, username: str, session: str = None):
+        """
+        Removes the stored session token for the user on the API host. If
+        `session` is specified, the token is only removed if it matches, so
+        that a token refreshed by another process is kept.
+        """
+        with self._locked():
+            sessions = self._read()
+            key = self._key(api_host, username)
+
+            if key in sessions and session in (None, sessions[key]):
+                del sessions[key]
+                self._write(sessions)
@@ -0,0 +1,291 @@
+r"""
+Contains the state that long-running and incremental syncs keep between
+runs, in small JSON files:
+
+- `HighWaterMarks`: Remembers when incremental syncs last completed, so that
+  the next run only streams the records that have been modified since.
+- `StreamCheckpoint`: Remembers how far a record stream has got, so that a
+  stream that stopped part of the way through can be resumed.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from aspace import constants
+
+
+def _read_json(path: str) -> dict:
+    """
+    Returns the contents of a JSON state file, or an empty dict if it does not
+    exist or cannot be read.
+    """
+    try:
+        with open(path, 'r') as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, state: dict):
+    """
+    Replaces the contents of a JSON state file atomically, so that a process
+    that dies part of the way through a write leaves the old state in place.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+    try:
+        with os.fdopen(fd, 'w') as temp_file:
+            json.dump(state, temp_file, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class HighWaterMarks(object):
+    """
+    Persists the start time of the last successful run of each named sync in
+    a JSON file. A run's start time is only saved once the run completes, so
+    a run that fails is repeated from the previous high-water mark.
+
+    ```
+    marks = HighWaterMarks('~/.aspace/nightly.json')
+
+    with marks.run('accessions') as modified_since:
+        for accession in client.streams.accessions(
+                modified_since=modified_since):
+            ...
+    ```
+    """
+
+    def __init__(self, path: str,
+                 margin: float = constants.CACHE_SYNC_MARGIN):
+        """
+        :path: Path of the JSON file that the marks are stored in.
+
+        :margin: Seconds subtracted from each mark when it is used as a
+        `modified_since` timestamp, to allow for clock differences between
+        the client and ArchivesSpace.
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.margin = margin
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> float:
+        """
+        Returns the start time of the last successful run of `name`, as a
+        Unix timestamp, or `None` if it has never completed.
+        """
+        with self._lock:
+            return _read_json(self.path).get(name)
+
+    def set(self, name: str, timestamp: float):
+        """
+        Records `timestamp` as the high-water mark of `name`.
+        """
+        with self._lock:
+            marks = _read_json(self.path)
+            marks[name] = timestamp
+            _write_json(self.path, marks)
+
+    def reset(self, name: str):
+        """
+        Forgets the high-water mark of `name`, so that its next run streams
+        every record.
+        """
+        with self._lock:
+            marks = _read_json(self.path)
+            if marks.pop(name, None) is not None:
+                _write_json(self.path, marks)
+
+    def modified_since(self, name: str) -> float:
+        """
+        Returns the `modified_since` timestamp for the next run of `name`,
+        which is its high-water mark minus the `margin`, or `None` if it has
+        never completed.
+        """
+        mark = self.get(name)
+        if mark is None:
+            return None
+        return max(mark - self.margin, 0)
+
+    @contextlib.contextmanager
+    def run(self, name: str):
+        """
+        Context manager for a run of `name`, which yields the
+        `modified_since` timestamp to stream with. If the block completes
+        without raising, the time the run started becomes the new
+        high-water mark.
+        """
+        started = time.time()
+        yield self.modified_since(name)
+        self.set(name, started)
+
+
+class StreamCheckpoint(object):
+    """
+    Persists the position of a record stream in each of the list endpoints it
+    streams from, in a JSON file, so that a stream that stopped part of the
+    way through, because the process crashed or was restarted, can be
+    resumed by passing the same checkpoint to the same stream.
+
+    Streams that download records by ID record the last ID that was
+    streamed, and resume after it, without downloading the records before
+    it again. Paged streams record the number of records streamed, and
+    resume from the page that contains the next record. List endpoints that
+    were streamed completely are skipped. Once the whole stream has been
+    streamed, the checkpoint is cleared, so the next stream starts over.
+
+    Positions are saved every `save_every` records or `save_interval`
+    seconds, and when the stream is closed or fails. A record counts as
+    streamed once the next record is asked for, so the record being
+    processed when the stream stopped is streamed again. If the process is
+    killed, records streamed since the last save are streamed again.
+
+    ```
+    checkpoint = StreamCheckpoint('~/.aspace/archival_objects.json')
+
+    for archival_object in client.streams.archival_objects(
+            checkpoint=checkpoint):
+        ...
+    ```
+    """
+
+    # Modes of the streams that checkpoints are saved by.
+    IDS = 'all_ids'
+    PAGES = 'pages'
+
+    def __init__(self, path: str,
+                 save_every: int = constants.DEFAULT_CHECKPOINT_RECORDS,
+                 save_interval: float = constants.DEFAULT_CHECKPOINT_SECONDS):
+        """
+        :path: Path of the JSON file that the checkpoint is stored in.
+
+        :save_every: Number of records streamed between saves.
+
+        :save_interval: Maximum number of seconds between saves, while
+        records are being streamed.
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._positions = None
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    def _load(self) -> dict:
+        """
+        Returns the positions of the stream, reading them from the file the
+        first time. Must be called with the lock held.
+        """
+        if self._positions is None:
+            self._positions = _read_json(self.path).get('positions', {})
+        return self._positions
+
+    def position(self, list_uri: str) -> dict:
+        """
+        Returns a copy of the saved position of the stream in `list_uri`, or
+        `None` if it has not been started.
+        """
+        with self._lock:
+            position = self._load().get(list_uri)
+            return dict(position) if position is not None else None
+
+    def start(self, list_uri: str, mode: str,
+              modified_since: int = None) -> dict:
+        """
+        Returns a copy of the position of the stream in `list_uri`, starting
+        it if the checkpoint does not have one. Raises a `ValueError` if the
+        position was saved by a stream with a different `mode` or
+        `modified_since` timestamp, which cannot be resumed from it.
+        """
+        with self._lock:
+            positions = self._load()
+            position = positions.get(list_uri)
+
+            if position is None:
+                position = positions[list_uri] = {
+                    'mode': mode,
+                    'modified_since': modified_since,
+                    'streamed': 0,
+                    'last_id': None,
+                    'complete': False,
+                }
+            elif (position['mode'], position['modified_since']) != (
+                    mode, modified_since):
+                raise ValueError(
+                    'The checkpoint of %s in %s was saved by a stream with '
+                    'mode=%r and modified_since=%r, so cannot be resumed by '
+                    'one with mode=%r and modified_since=%r.' % (
+                        list_uri, self.path,
+                        position['mode'], position['modified_since'],
+                        mode, modified_since,
+                    )
+                )
+
+            return dict(position)
+
+    def advance(self, list_uri: str, rec_id: int = None):
+        """
+        Counts a record of `list_uri` as streamed, saving the checkpoint if
+        a save is due.
+        """
+        with self._lock:
+            position = self._load()[list_uri]
+            position['streamed'] += 1
+            if rec_id is not None:
+                position['last_id'] = rec_id
+
+            self._unsaved += 1
+            due = (
+                self._unsaved >= self.save_every or
+                time.monotonic() - self._saved_at >= self.save_interval
+            )
+
+        if due:
+            self.save()
+
+    def complete(self, list_uri: str):
+        """
+        Records that every record of `list_uri` has been streamed, and saves
+        the checkpoint.
+        """
+        with self._lock:
+            self._load()[list_uri]['complete'] = True
+            self._unsaved += 1
+
+        self.save()
+
+    def save(self):
+        """
+        Writes any positions that have changed since the last save to the
+        file.
+        """
+        with self._lock:
+            if not self._unsaved or self._positions is None:
+                return
+
+            _write_json(self.path, {'positions': self._positions})
+            self._unsaved = 0
+            self._saved_at = time.monotonic()
+
+    def clear(self):
+        """
+        Forgets every position and removes the file, so that the next stream
+        starts from the beginning.
+        """
+        with self._lock:
+            self._positions = {}
+            self._unsaved = 0
+
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
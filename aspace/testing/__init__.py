@@ -0,0 +1,9 @@
+r"""
+This package contains tools for testing and benchmarking code that uses
+this package, without an ArchivesSpace instance:
+
+- `server.StandInServer`, a local stand-in for the ArchivesSpace API, which
+  serves synthetic data and can inject latency and faults.
+"""
+
+import aspace.testing.server
@@ -0,0 +1,1158 @@
+r"""
+Contains the StandInServer class, a small local HTTP server that imitates the
+parts of the ArchivesSpace API used by this package. It serves a synthetic
+`Dataset` of configurable size, and can inject latency, expired sessions,
+server errors and slow response bodies, so that the client can be tested and
+benchmarked without an ArchivesSpace instance.
+
+The server can also be run from the command line:
+
+```
+python -m aspace.testing.server --port 8089 --records-per-type 1000 \
+    --latency 0.02
+```
+"""
+
+import argparse
+import collections
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+import uuid
+
+from aspace import enums, json_decoding, util
+
+
+# Record types that belong to a repository, and record types that do not.
+REPOSITORY_RECORD_TYPES = (
+    'resources',
+    'archival_objects',
+    'accessions',
+    'digital_objects',
+    'top_containers',
+    'jobs',
+)
+
+GLOBAL_RECORD_TYPES = (
+    'subjects',
+    'agents/people',
+    'agents/corporate_entities',
+    'agents/families',
+    'agents/software',
+    'users',
+)
+
+JSONMODEL_TYPES = {
+    'resources': 'resource',
+    'archival_objects': 'archival_object',
+    'accessions': 'accession',
+    'digital_objects': 'digital_object',
+    'top_containers': 'top_container',
+    'jobs': 'job',
+    'subjects': 'subject',
+    'agents/people': 'agent_person',
+    'agents/corporate_entities': 'agent_corporate_entity',
+    'agents/families': 'agent_family',
+    'agents/software': 'agent_software',
+    'users': 'user',
+}
+
+SCHEMA_NAMES = tuple(sorted(JSONMODEL_TYPES.values())) + ('repository',)
+
+DEFAULT_PAGE_SIZE = 10
+DEFAULT_MAX_PAGE_SIZE = 250
+
+
+class Dataset(object):
+    """
+    A synthetic ArchivesSpace data set. Records are generated on demand from
+    their type and ID, so large data sets use little memory. Records that are
+    updated through the server, or touched with `touch`, are kept in memory
+    and reported by `all_ids` and paged queries with a `modified_since`
+    parameter.
+    """
+
+    def __init__(self, repositories: int = 2, records_per_type: int = 100,
+                 counts: dict = None, record_size: int = 0,
+                 enumeration_values: int = 5,):
+        """
+        :repositories: Number of repositories. Repository IDs start at 2, as
+        in ArchivesSpace, where repository 1 is reserved.
+
+        :records_per_type: Number of records of each type, in each
+        repository for repository-relative types.
+
+        :counts: Optional dict that overrides the number of records of
+        specific types, such as `{'users': 10, 'archival_objects': 5000}`.
+
+        :record_size: Approximate number of extra bytes of note text added
+        to each record, to imitate larger records.
+
+        :enumeration_values: Number of values in each enumeration.
+        """
+        self.repositories = repositories
+        self.counts = {
+            record_type: records_per_type
+            for record_type in REPOSITORY_RECORD_TYPES + GLOBAL_RECORD_TYPES
+        }
+        self.counts.update(counts or {})
+        self.record_size = record_size
+        self.created_at = time.time()
+
+        self._lock = threading.Lock()
+        self._updated = {}
+        self._modified = {}
+        self._next_job_ids = {}
+
+        self.enumerations = {
+            enumeration.value: {
+                'uri': '/config/enumerations/%d' % enumeration.value,
+                'name': enumeration.name.lower(),
+                'jsonmodel_type': 'enumeration',
+                'lock_version': 0,
+                'values': [
+                    '%s_%d' % (enumeration.name.lower(), index)
+                    for index in range(1, enumeration_values + 1)
+                ],
+                'enumeration_values': [
+                    {
+                        'uri': '/config/enumeration_values/%d' % (
+                            enumeration.value * 1000 + index),
+                        'value': '%s_%d' % (enumeration.name.lower(), index),
+                        'position': index - 1,
+                    }
+                    for index in range(1, enumeration_values + 1)
+                ],
+            }
+            for enumeration in enums.Enumeration
+        }
+
+    @property
+    def repository_ids(self) -> range:
+        return range(2, self.repositories + 2)
+
+    def count(self, record_type: str, repo_id: int = None) -> int:
+        """
+        Returns the number of records of a type, in a repository for
+        repository-relative types, including jobs created through the
+        server.
+        """
+        if record_type in REPOSITORY_RECORD_TYPES:
+            if repo_id not in self.repository_ids:
+                return 0
+            if record_type == 'jobs':
+                with self._lock:
+                    return self._next_job_ids.get(
+                        repo_id, self.counts['jobs'] + 1) - 1
+
+        elif record_type not in GLOBAL_RECORD_TYPES or repo_id is not None:
+            return 0
+
+        return self.counts[record_type]
+
+    @staticmethod
+    def list_uri(record_type: str, repo_id: int = None) -> str:
+        if repo_id is None:
+            return '/%s' % record_type
+        return '/repositories/%d/%s' % (repo_id, record_type)
+
+    def ids(self, record_type: str, repo_id: int = None,
+            modified_since: float = None) -> list:
+        """
+        Returns the IDs of the records of a type, optionally only those
+        modified at or after the `modified_since` Unix timestamp.
+        """
+        count = self.count(record_type, repo_id)
+
+        if not modified_since or modified_since <= self.created_at:
+            return list(range(1, count + 1))
+
+        prefix = self.list_uri(record_type, repo_id) + '/'
+
+        with self._lock:
+            return sorted(
+                int(uri[len(prefix):])
+                for uri, modified in self._modified.items()
+                if uri.startswith(prefix) and modified >= modified_since
+                and uri[len(prefix):].isdigit()
+            )
+
+    def touch(self, uri: str):
+        """
+        Marks a record as modified now.
+        """
+        with self._lock:
+            self._modified[uri] = time.time()
+
+    def repository(self, repo_id: int) -> dict:
+        if repo_id not in self.repository_ids:
+            return None
+
+        return {
+            'uri': '/repositories/%d' % repo_id,
+            'jsonmodel_type': 'repository',
+            'repo_code': 'REPO%d' % repo_id,
+            'name': 'Repository %d' % repo_id,
+            'lock_version': 0,
+        }
+
+    def _mtime(self, uri: str) -> str:
+        with self._lock:
+            modified = self._modified.get(uri, self.created_at)
+        return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(modified))
+
+    def record(self, record_type: str, rec_id: int, repo_id: int = None
+               ) -> dict:
+        """
+        Returns a record, or `None` if it does not exist.
+        """
+        if not 1 <= rec_id <= self.count(record_type, repo_id):
+            return None
+
+        uri = '%s/%d' % (self.list_uri(record_type, repo_id), rec_id)
+
+        with self._lock:
+            if uri in self._updated:
+                return dict(self._updated[uri])
+
+        jsonmodel_type = JSONMODEL_TYPES[record_type]
+        mtime = self._mtime(uri)
+        record = {
+            'uri': uri,
+            'jsonmodel_type': jsonmodel_type,
+            'lock_version': 0,
+            'title': '%s %d' % (jsonmodel_type.replace('_', ' ').title(),
+                                rec_id),
+            'system_mtime': mtime,
+            'user_mtime': mtime,
+        }
+
+        if repo_id is not None:
+            record['repository'] = {'ref': '/repositories/%d' % repo_id}
+
+        if record_type == 'archival_objects':
+            resources = max(self.counts['resources'], 1)
+            record['resource'] = {'ref': '/repositories/%d/resources/%d' % (
+                repo_id, (rec_id - 1) % resources + 1)}
+
+            top_container_id = self.top_container_id(rec_id)
+            if top_container_id:
+                record['instances'] = [{
+                    'instance_type': 'mixed_materials',
+                    'sub_container': {'top_container': {
+                        'ref': '/repositories/%d/top_containers/%d' % (
+                            repo_id, top_container_id),
+                    }},
+                }]
+
+        elif record_type == 'jobs':
+            statuses = list(enums.JobStatus)
+            record['status'] = statuses[rec_id % len(statuses)].value
+            record['job_type'] = 'import_job'
+
+        elif record_type == 'users':
+            record['username'] = 'admin' if rec_id == 1 else 'user%d' % rec_id
+            record['name'] = record['title']
+            record['is_system_user'] = False
+            record['is_admin'] = rec_id == 1
+
+        if self.record_size:
+            record['notes'] = [{
+                'jsonmodel_type': 'note_multipart',
+                'content': ['x' * self.record_size],
+            }]
+
+        return record
+
+    def top_container_id(self, archival_object_id: int) -> int:
+        """
+        Returns the ID of the top container that an archival object is
+        linked to. Archival objects are spread evenly across top containers.
+        """
+        top_containers = self.counts['top_containers']
+        if not top_containers:
+            return None
+        return (archival_object_id - 1) % top_containers + 1
+
+    def update(self, uri: str, record: dict) -> dict:
+        """
+        Stores a new version of a record, returning it.
+        """
+        with self._lock:
+            previous = self._updated.get(uri, {})
+            record = dict(record, uri=uri)
+            record['lock_version'] = previous.get(
+                'lock_version', record.get('lock_version', 0)) + 1
+            self._updated[uri] = record
+            self._modified[uri] = time.time()
+            return record
+
+    def create_job(self, repo_id: int, job: dict) -> dict:
+        with self._lock:
+            job_id = self._next_job_ids.get(repo_id, self.counts['jobs'] + 1)
+            self._next_job_ids[repo_id] = job_id + 1
+
+        uri = '/repositories/%d/jobs/%d' % (repo_id, job_id)
+        return self.update(uri, dict(
+            job,
+            jsonmodel_type='job',
+            status=enums.JobStatus.QUEUED.value,
+            lock_version=-1,
+        ))
+
+
+class FaultProfile(object):
+    """
+    The faults that a StandInServer injects into its responses. Random
+    faults are drawn from a generator seeded with `seed`, so that runs can
+    be repeated.
+    """
+
+    def __init__(self, latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503,
+                 session_lifetime: float = None, body_rate: float = None,
+                 seed: int = None,):
+        """
+        :latency: Seconds added to every response.
+
+        :latency_jitter: Up to this many extra seconds are added to each
+        response at random.
+
+        :error_rate: Fraction of requests that fail with `error_status`.
+
+        :error_status: Status code of injected errors.
+
+        :session_lifetime: Seconds after which a session token expires, and
+        requests using it receive a 412. If `None`, sessions do not expire.
+
+        :body_rate: If set, response bodies are sent at this many bytes per
+        second, to imitate a slow network or a slow server.
+
+        :seed: Seed for the random number generator.
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.session_lifetime = session_lifetime
+        self.body_rate = body_rate
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.latency_jitter)
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """
+    Handles requests to a StandInServer.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    # Small responses are otherwise held back by Nagle's algorithm, adding
+    # tens of milliseconds of latency to every keep-alive request.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _handle(self, method: str):
+        stand_in = self.server.stand_in
+        parsed = urllib.parse.urlsplit(self.path)
+        path = parsed.path.rstrip('/') or '/'
+
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        params = urllib.parse.parse_qs(parsed.query)
+        if self.headers.get('Content-Type', '').startswith(
+                'application/x-www-form-urlencoded'):
+            params.update(urllib.parse.parse_qs(body.decode('utf-8')))
+
+        stand_in._begin(method, path)
+        try:
+            delay = stand_in.faults.delay()
+            if delay:
+                time.sleep(delay)
+
+            status, payload = stand_in._respond(
+                method, path, params, body, self.headers)
+            self._send(status, payload)
+        finally:
+            stand_in._end()
+
+    def _send(self, status: int, payload):
+        faults = self.server.stand_in.faults
+
+        if isinstance(payload, str):
+            content_type = 'text/plain; charset=utf-8'
+            data = payload.encode('utf-8')
+        else:
+            content_type = 'application/json'
+            data = json_decoding.dumps(payload)
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+
+        if not faults.body_rate:
+            self.wfile.write(data)
+            return
+
+        # Sends the body in small chunks, pausing between them.
+        chunk_size = 4096
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start:start + chunk_size]
+            self.wfile.write(chunk)
+            self.wfile.flush()
+            time.sleep(len(chunk) / faults.body_rate)
+
+
+class StandInServer(object):
+    """
+    A local stand-in for the ArchivesSpace API, serving a `Dataset` on a
+    background thread. It implements the endpoints used by this package:
+
+    - `POST /users/:username/login`, and session checks that answer 412
+    - `GET /`, `/version` and `/repositories`
+    - record lists with `all_ids`, `modified_since`, `id_set` and
+      `page`/`page_size`, record GETs and updates, for every record type
+    - `/repositories/:repo_id/resources/:id/tree` and `ordered_records`
+    - `/search` and `/repositories/:repo_id/search` paging, including the
+      top container filter used by `TopContainerManagementService`
+    - `/config/enumerations`, jobs, `/schemas` and `/users`
+
+    Use it as a context manager, or call `start` and `stop`:
+
+    ```
+    with StandInServer(Dataset(records_per_type=1000)) as server:
+        client = ASpaceClient(server.url, 'admin', 'admin')
+    ```
+    """
+
+    def __init__(self, dataset: Dataset = None, faults: FaultProfile = None,
+                 host: str = '127.0.0.1', port: int = 0,
+                 username: str = 'admin', password: str = 'admin',
+                 max_page_size: int = DEFAULT_MAX_PAGE_SIZE,):
+        """
+        :dataset: The data to serve. Defaults to a `Dataset()`.
+
+        :faults: The faults to inject. Defaults to no faults.
+
+        :host: Address that the server listens on.
+
+        :port: Port that the server listens on. If 0, a free port is chosen.
+
+        :username: Username accepted by the login endpoint, along with the
+        usernames of the data set's users.
+
+        :password: Password accepted by the login endpoint, for every user.
+
+        :max_page_size: Largest `page_size` served, as in ArchivesSpace.
+        """
+        self.dataset = dataset or Dataset()
+        self.faults = faults or FaultProfile()
+        self.username = username
+        self.password = password
+        self.max_page_size = max_page_size
+
+        self._httpd = http.server.ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+        self._thread = None
+
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._forced_errors = collections.deque()
+        self._requests = collections.Counter()
+        self._logins = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+
+        self._routes = [
+            (re.compile(pattern), methods, handler)
+            for pattern, methods, handler in (
+                (r'^/$', ('GET',), self._system_info),
+                (r'^/version$', ('GET',), self._version),
+                (r'^/users/(?P<username>[^/]+)/login$', ('POST',),
+                 self._login),
+                (r'^/repositories$', ('GET',), self._repositories),
+                (r'^/repositories/(?P<repo_id>\d+)$', ('GET',),
+                 self._repository),
+                (r'^(?:/repositories/(?P<repo_id>\d+))?/search$',
+                 ('GET', 'POST'), self._search),
+                (r'^/repositories/(?P<repo_id>\d+)/jobs/import_types$',
+                 ('GET',), self._import_types),
+                (r'^/repositories/(?P<repo_id>\d+)/jobs_with_files$',
+                 ('POST',), self._create_job),
+                (r'^/repositories/(?P<repo_id>\d+)/jobs/(?P<id>\d+)/'
+                 r'(?P<action>output_files|log|cancel)$',
+                 ('GET', 'POST'), self._job_action),
+                (r'^/repositories/(?P<repo_id>\d+)/resources/(?P<id>\d+)/'
+                 r'(?P<extension>tree(?:/.*)?|ordered_records)$',
+                 ('GET',), self._resource_extension),
+                (r'^/users/current-user$', ('GET',), self._current_user),
+                (r'^/users$', ('POST',), self._create_user),
+                (r'^/config/enumerations$', ('GET',), self._enumerations),
+                (r'^/config/enumerations/migration$', ('POST',),
+                 self._merge_enumeration_values),
+                (r'^/config/enumerations/names/(?P<name>\w+)$', ('GET',),
+                 self._enumeration),
+                (r'^/config/enumerations/(?P<id>\d+)$', ('GET', 'POST'),
+                 self._enumeration),
+                (r'^/config/enumeration_values/(?P<id>\d+)/position$',
+                 ('POST',), self._enumeration_value_position),
+                (r'^/schemas$', ('GET',), self._schemas),
+                (r'^/schemas/(?P<name>\w+)$', ('GET',), self._schemas),
+                (r'^(?:/repositories/(?P<repo_id>\d+))?/'
+                 r'(?P<type>[a-z_]+|agents/[a-z_]+)$', ('GET',),
+                 self._list_records),
+                (r'^(?:/repositories/(?P<repo_id>\d+))?/'
+                 r'(?P<type>[a-z_]+|agents/[a-z_]+)/(?P<id>\d+)$',
+                 ('GET', 'POST', 'DELETE'), self._record),
+            )
+        ]
+
+    @property
+    def url(self) -> str:
+        """
+        The url of the server's API, such as `http://127.0.0.1:49152`.
+        """
+        host, port = self._httpd.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def start(self):
+        """
+        Starts serving requests on a background thread. Returns self.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever,
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server and closes its socket.
+        """
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def serve_forever(self):
+        """
+        Serves requests on the calling thread, until interrupted.
+        """
+        self._httpd.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def expire_sessions(self):
+        """
+        Expires every session token, so that the next request of every
+        client receives a 412.
+        """
+        with self._lock:
+            self._sessions.clear()
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        """
+        Makes the next `count` requests, other than logins, fail with
+        `status`.
+        """
+        with self._lock:
+            self._forced_errors.extend([status] * count)
+
+    def stats(self) -> dict:
+        """
+        Returns the number of requests served for each method and endpoint
+        template, and the number of logins:
+
+        ```
+        {
+            'requests': {'GET /repositories/:id/archival_objects': int, ...},
+            'logins': int,
+            'max_in_flight': int,  # Most requests handled at once
+        }
+        ```
+        """
+        with self._lock:
+            return {
+                'requests': dict(self._requests),
+                'logins': self._logins,
+                'max_in_flight': self._max_in_flight,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._requests.clear()
+            self._logins = 0
+            self._max_in_flight = 0
+
+    def _begin(self, method: str, path: str):
+        with self._lock:
+            endpoint = util.endpoint_template(path)
+            self._requests['%s %s' % (method, endpoint)] += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def _end(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _check_session(self, headers) -> tuple:
+        """
+        Returns an error response if the request does not have a valid
+        session token, otherwise `None`.
+        """
+        token = headers.get('X-ArchivesSpace-Session')
+
+        with self._lock:
+            created = self._sessions.get(token)
+
+            if created is None:
+                return 412, {'code': 'SESSION_GONE',
+                             'error': 'No valid session'}
+
+            lifetime = self.faults.session_lifetime
+            if lifetime is not None and time.time() - created > lifetime:
+                del self._sessions[token]
+                return 412, {'code': 'SESSION_EXPIRED',
+                             'error': 'Session timed out'}
+
+        return None
+
+    def _respond(self, method: str, path: str, params: dict, body: bytes,
+                 headers) -> tuple:
+        """
+        Returns the status code and payload of the response to a request.
+        """
+        path_matched = False
+
+        for pattern, methods, handler in self._routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+
+            if method not in methods:
+                path_matched = True
+                continue
+
+            public = handler in (self._system_info, self._version,
+                                 self._login)
+
+            if not public:
+                error = self._check_session(headers)
+                if error is not None:
+                    return error
+
+                with self._lock:
+                    forced = (
+                        self._forced_errors.popleft()
+                        if self._forced_errors else
+                        None
+                    )
+
+                if forced is not None:
+                    return forced, {'error': 'Injected error'}
+
+            if handler != self._login and self.faults.should_fail():
+                return self.faults.error_status, {'error': 'Injected error'}
+
+            return handler(
+                method,
+                {key: value for key, value in match.groupdict().items()
+                 if value is not None},
+                params,
+                body,
+            )
+
+        if path_matched:
+            return 405, {'error': 'Method not allowed'}
+
+        return 404, {'error': 'Sinatra::NotFound'}
+
+    @staticmethod
+    def _param(params: dict, name: str, default=None):
+        values = params.get(name) or params.get(name + '[]')
+        return values[0] if values else default
+
+    @staticmethod
+    def _json_body(body: bytes) -> dict:
+        try:
+            return json.loads(body.decode('utf-8')) if body else {}
+        except ValueError:
+            return {}
+
+    def _page(self, items: list, params: dict, to_result) -> tuple:
+        """
+        Returns a page of `items` in the ArchivesSpace paging format.
+        """
+        page = int(self._param(params, 'page', 1))
+        page_size = min(
+            int(self._param(params, 'page_size', DEFAULT_PAGE_SIZE)),
+            self.max_page_size,
+        )
+        page_size = max(page_size, 1)
+        last_page = max((len(items) + page_size - 1) // page_size, 1)
+        start = (page - 1) * page_size
+
+        return 200, {
+            'first_page': 1,
+            'last_page': last_page,
+            'this_page': page,
+            'offset_first': start + 1,
+            'offset_last': min(start + page_size, len(items)),
+            'total_hits': len(items),
+            'results': [
+                to_result(item) for item in items[start:start + page_size]
+            ],
+        }
+
+    def _system_info(self, method, args, params, body):
+        return 200, {
+            'databaseProductName': 'StandIn',
+            'databaseProductVersion': '1.0',
+            'archivesSpaceVersion': 'v2.8.1',
+        }
+
+    def _version(self, method, args, params, body):
+        return 200, 'ArchivesSpace (v2.8.1)'
+
+    def _login(self, method, args, params, body):
+        username = args['username']
+        user_match = re.match(r'^user(\d+)$', username)
+        known = username in (self.username, 'admin') or (
+            user_match is not None
+            and 1 < int(user_match.group(1)) <= self.dataset.count('users')
+        )
+
+        if not known or self._param(params, 'password') != self.password:
+            return 403, {'error': 'Login failed'}
+
+        token = uuid.uuid4().hex
+
+        with self._lock:
+            self._sessions[token] = time.time()
+            self._logins += 1
+
+        return 200, {
+            'session': token,
+            'user': {'username': username, 'jsonmodel_type': 'user'},
+        }
+
+    def _repositories(self, method, args, params, body):
+        return 200, [
+            self.dataset.repository(repo_id)
+            for repo_id in self.dataset.repository_ids
+        ]
+
+    def _repository(self, method, args, params, body):
+        repository = self.dataset.repository(int(args['repo_id']))
+        if repository is None:
+            return 404, {'error': 'Repository not found'}
+        return 200, repository
+
+    def _list_records(self, method, args, params, body):
+        record_type = args['type']
+        repo_id = int(args['repo_id']) if 'repo_id' in args else None
+
+        if (record_type not in REPOSITORY_RECORD_TYPES
+                and record_type not in GLOBAL_RECORD_TYPES):
+            return 404, {'error': 'Sinatra::NotFound'}
+
+        modified_since = self._param(params, 'modified_since')
+        modified_since = float(modified_since) if modified_since else None
+
+        if self._param(params, 'all_ids') in ('true', 'True', '1'):
+            return 200, self.dataset.ids(
+                record_type, repo_id, modified_since=modified_since)
+
+        id_set = self._param(params, 'id_set')
+        if id_set:
+            records = (
+                self.dataset.record(record_type, int(rec_id), repo_id)
+                for rec_id in id_set.split(',') if rec_id.strip().isdigit()
+            )
+            return 200, [record for record in records if record is not None]
+
+        if self._param(params, 'page'):
+            return self._page(
+                self.dataset.ids(
+                    record_type, repo_id, modified_since=modified_since),
+                params,
+                lambda rec_id: self.dataset.record(
+                    record_type, rec_id, repo_id),
+            )
+
+        return 400, {'error': {
+            'page': ['Must provide either page, id_set or all_ids']}}
+
+    def _record(self, method, args, params, body):
+        record_type = args['type']
+        repo_id = int(args['repo_id']) if 'repo_id' in args else None
+        record = self.dataset.record(record_type, int(args['id']), repo_id)
+
+        if record is None:
+            return 404, {'error': 'Record not found'}
+
+        if method == 'GET':
+            return 200, record
+
+        if method == 'DELETE':
+            return 200, {'status': 'Deleted', 'id': int(args['id'])}
+
+        updated = self.dataset.update(
+            record['uri'], self._json_body(body) or record)
+        return 200, {
+            'status': 'Updated',
+            'id': int(args['id']),
+            'lock_version': updated['lock_version'],
+            'uri': updated['uri'],
+        }
+
+    def _resource_extension(self, method, args, params, body):
+        repo_id = int(args['repo_id'])
+        resource = self.dataset.record('resources', int(args['id']), repo_id)
+
+        if resource is None:
+            return 404, {'error': 'Record not found'}
+
+        resources = max(self.dataset.counts['resources'], 1)
+        children = [
+            '/repositories/%d/archival_objects/%d' % (repo_id, rec_id)
+            for rec_id in range(
+                int(args['id']),
+                self.dataset.counts['archival_objects'] + 1,
+                resources,
+            )
+        ]
+
+        if args['extension'] == 'ordered_records':
+            return 200, {'uris': [
+                {'ref': uri, 'level': level, 'depth': depth}
+                for uri, level, depth in (
+                    [(resource['uri'], 'collection', 0)]
+                    + [(uri, 'file', 1) for uri in children]
+                )
+            ]}
+
+        return 200, {
+            'jsonmodel_type': 'resource_tree',
+            'record_uri': resource['uri'],
+            'title': resource['title'],
+            'child_count': len(children),
+            'children': [
+                {
+                    'jsonmodel_type': 'resource_tree',
+                    'record_uri': uri,
+                    'title': 'Archival Object %s' % uri.rsplit('/', 1)[1],
+                    'children': [],
+                }
+                for uri in children
+            ],
+        }
+
+    def _search(self, method, args, params, body):
+        repo_ids = (
+            [int(args['repo_id'])] if 'repo_id' in args else
+            list(self.dataset.repository_ids)
+        )
+
+        if not self._param(params, 'page'):
+            return 400, {'error': {'page': ['Parameter is required']}}
+
+        record_types = [
+            record_type for record_type in REPOSITORY_RECORD_TYPES
+            if JSONMODEL_TYPES[record_type] in (
+                params.get('type[]') or params.get('type')
+                or [JSONMODEL_TYPES[record_type]]
+            )
+        ]
+
+        search_filter = self._json_body(
+            (self._param(params, 'filter') or '').encode('utf-8'))
+        query = search_filter.get('query', {})
+
+        # The only filter that is supported is the one used to find the
+        # records linked to a top container.
+        top_container_uri = (
+            query.get('value')
+            if query.get('field') == 'top_container_uri_u_sstr' else
+            None
+        )
+
+        hits = []
+
+        for repo_id in repo_ids:
+            if top_container_uri is not None:
+                match = re.match(r'^/repositories/(\d+)/top_containers/(\d+)$',
+                                 top_container_uri)
+                if (match is None or int(match.group(1)) != repo_id
+                        or 'archival_objects' not in record_types):
+                    continue
+
+                top_containers = max(self.dataset.counts['top_containers'], 1)
+                hits.extend(
+                    ('archival_objects', rec_id, repo_id)
+                    for rec_id in range(
+                        int(match.group(2)),
+                        self.dataset.count('archival_objects', repo_id) + 1,
+                        top_containers,
+                    )
+                )
+                continue
+
+            for record_type in record_types:
+                hits.extend(
+                    (record_type, rec_id, repo_id)
+                    for rec_id in self.dataset.ids(record_type, repo_id)
+                )
+
+        def to_result(hit):
+            record = self.dataset.record(*hit)
+            return {
+                'id': record['uri'],
+                'uri': record['uri'],
+                'title': record['title'],
+                'jsonmodel_type': record['jsonmodel_type'],
+                'json': json.dumps(record),
+            }
+
+        return self._page(hits, params, to_result)
+
+    def _import_types(self, method, args, params, body):
+        return 200, [
+            {'name': import_type.value, 'description': import_type.name}
+            for import_type in enums.DataImportTypes
+        ]
+
+    def _create_job(self, method, args, params, body):
+        repo_id = int(args['repo_id'])
+
+        if repo_id not in self.dataset.repository_ids:
+            return 404, {'error': 'Repository not found'}
+
+        job = self.dataset.create_job(repo_id, {'job_type': 'import_job'})
+        return 200, {
+            'status': 'Created',
+            'id': int(job['uri'].rsplit('/', 1)[1]),
+            'lock_version': job['lock_version'],
+            'uri': job['uri'],
+        }
+
+    def _job_action(self, method, args, params, body):
+        repo_id = int(args['repo_id'])
+        job = self.dataset.record('jobs', int(args['id']), repo_id)
+
+        if job is None:
+            return 404, {'error': 'Record not found'}
+
+        if args['action'] == 'output_files':
+            return 200, []
+
+        if args['action'] == 'log':
+            return 200, 'Job %s: %s\n' % (job['uri'], job['status'])
+
+        if method != 'POST':
+            return 405, {'error': 'Method not allowed'}
+
+        job['status'] = enums.JobStatus.CANCELED.value
+        self.dataset.update(job['uri'], job)
+        return 200, {'status': 'Updated', 'uri': job['uri']}
+
+    def _current_user(self, method, args, params, body):
+        return 200, self.dataset.record('users', 1)
+
+    def _create_user(self, method, args, params, body):
+        user = self._json_body(body)
+
+        with self._lock:
+            self.dataset.counts['users'] += 1
+            rec_id = self.dataset.counts['users']
+
+        created = self.dataset.update('/users/%d' % rec_id, dict(
+            user, jsonmodel_type='user', lock_version=-1))
+        return 200, {
+            'status': 'Created',
+            'id': rec_id,
+            'lock_version': created['lock_version'],
+            'uri': created['uri'],
+        }
+
+    def _enumerations(self, method, args, params, body):
+        return 200, list(self.dataset.enumerations.values())
+
+    def _enumeration(self, method, args, params, body):
+        if 'name' in args:
+            enumeration = next((
+                enumeration
+                for enumeration in self.dataset.enumerations.values()
+                if enumeration['name'] == args['name']
+            ), None)
+        else:
+            enumeration = self.dataset.enumerations.get(int(args['id']))
+
+        if enumeration is None:
+            return 404, {'error': 'Enumeration not found'}
+
+        if method == 'GET':
+            return 200, enumeration
+
+        update = self._json_body(body)
+
+        with self._lock:
+            enumeration['lock_version'] += 1
+            for value in update.get('values', []):
+                if value not in enumeration['values']:
+                    enumeration['values'].append(value)
+                    enumeration['enumeration_values'].append({
+                        'uri': '/config/enumeration_values/%d' % (
+                            int(enumeration['uri'].rsplit('/', 1)[1]) * 1000
+                            + len(enumeration['values'])),
+                        'value': value,
+                        'position': len(enumeration['values']) - 1,
+                    })
+
+        return 200, {'status': 'Updated', 'uri': enumeration['uri'],
+                     'lock_version': enumeration['lock_version']}
+
+    def _merge_enumeration_values(self, method, args, params, body):
+        merge = self._json_body(body)
+        enum_id = int((merge.get('enum_uri') or '/0').rsplit('/', 1)[1])
+        enumeration = self.dataset.enumerations.get(enum_id)
+
+        if enumeration is None or merge.get('from') not in enumeration[
+                'values']:
+            return 400, {'error': 'Invalid enumeration value'}
+
+        with self._lock:
+            enumeration['values'].remove(merge['from'])
+            enumeration['enumeration_values'] = [
+                value for value in enumeration['enumeration_values']
+                if value['value'] != merge['from']
+            ]
+
+        return 200, {'status': 'Updated'}
+
+    def _enumeration_value_position(self, method, args, params, body):
+        value_id = int(args['id'])
+        enumeration = self.dataset.enumerations.get(value_id // 1000)
+        position = int(self._param(params, 'position', 0))
+
+        for value in (enumeration or {}).get('enumeration_values', []):
+            if value['uri'].endswith('/%d' % value_id):
+                value['position'] = position
+                return 200, {'status': 'Updated'}
+
+        return 404, {'error': 'Enumeration value not found'}
+
+    def _schemas(self, method, args, params, body):
+        def schema(name):
+            return {
+                '$schema': 'http://www.archivesspace.org/archivesspace.json',
+                'version': 1,
+                'type': 'object',
+                'uri': '/%s' % name,
+                'properties': {
+                    'uri': {'type': 'string', 'required': False},
+                    'title': {'type': 'string', 'maxLength': 8192},
+                    'lock_version': {'type': ['integer', 'string']},
+                    'jsonmodel_type': {'type': 'string'},
+                },
+            }
+
+        if 'name' not in args:
+            return 200, {name: schema(name) for name in SCHEMA_NAMES}
+
+        if args['name'] not in SCHEMA_NAMES:
+            return 404, {'error': 'Schema not found'}
+
+        return 200, schema(args['name'])
+
+
+def main(argv: list = None):
+    """
+    Runs a StandInServer from the command line.
+    """
+    parser = argparse.ArgumentParser(
+        description='Runs a local stand-in for the ArchivesSpace API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--repositories', type=int, default=2)
+    parser.add_argument('--records-per-type', type=int, default=100)
+    parser.add_argument('--users', type=int, default=None)
+    parser.add_argument('--record-size', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--latency-jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--session-lifetime', type=float, default=None)
+    parser.add_argument('--body-rate', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        Dataset(
+            repositories=args.repositories,
+            records_per_type=args.records_per_type,
+            counts={'users': args.users} if args.users is not None else None,
+            record_size=args.record_size,
+        ),
+        FaultProfile(
+            latency=args.latency,
+            latency_jitter=args.latency_jitter,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            session_lifetime=args.session_lifetime,
+            body_rate=args.body_rate,
+            seed=args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+
+    print('Serving a stand-in ArchivesSpace API at %s' % server.url)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
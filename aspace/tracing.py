@@ -0,0 +1,309 @@
+r"""
+Contains the Tracer class, and the `traced` decorator used by the services
+in `client_extensions`, which record the requests made by each high-level
+operation as child spans of that operation.
+"""
+
+import collections.abc
+import contextlib
+import contextvars
+import functools
+import inspect
+import random
+import threading
+import time
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+
+# The span that new spans are children of. Context variables follow asyncio
+# tasks, and `util.concurrent_map` copies them into its worker threads.
+_current_span = contextvars.ContextVar('aspace_current_span', default=None)
+
+
+def current_span():
+    """
+    Returns the span that is currently open in this context, or `None`.
+    """
+    return _current_span.get()
+
+
+class Span(object):
+    """
+    A timed operation. Spans started while another span is open in the same
+    context are its children, and share its `trace_id`.
+    """
+
+    def __init__(self, name: str, parent=None, attributes: dict = None):
+        self.name = name
+        self.span_id = '%016x' % random.getrandbits(64)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = (
+            parent.trace_id if parent is not None else
+            '%032x' % random.getrandbits(128)
+        )
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.end_time = None
+        self.error = None
+
+    @property
+    def duration(self) -> float:
+        """
+        Seconds between the start and end of the span, or `None` if the span
+        has not finished.
+        """
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def __repr__(self):
+        return '<Span %s %s parent=%s>' % (
+            self.name, self.span_id, self.parent_id)
+
+
+class Tracer(object):
+    """
+    Creates spans, calling `on_start` with each span as it starts, and
+    `on_finish` with each span once it has finished. The hooks are called on
+    the thread that starts or finishes the span, so they must be thread-safe.
+    """
+
+    def __init__(self, on_start=None, on_finish=None):
+        """
+        :on_start: Optional function called with each new `Span`.
+
+        :on_finish: Optional function called with each finished `Span`.
+        """
+        self.on_start = on_start
+        self.on_finish = on_finish
+
+    def start_span(self, name: str, attributes: dict = None) -> Span:
+        """
+        Starts a span that is a child of the current span. The span does not
+        become the current span. Please see `span`.
+        """
+        span = Span(name, parent=current_span(), attributes=attributes)
+
+        if self.on_start is not None:
+            self.on_start(span)
+
+        return span
+
+    def finish_span(self, span: Span, error: BaseException = None):
+        """
+        Finishes a span, recording the `error` that ended it, if any.
+        """
+        span.end_time = time.time()
+        span.error = error
+
+        if self.on_finish is not None:
+            self.on_finish(span)
+
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: dict = None):
+        """
+        Context manager that starts a span, makes it the current span while
+        the block runs, and finishes it afterwards.
+        """
+        span = self.start_span(name, attributes)
+        token = _current_span.set(span)
+        error = None
+
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish_span(span, error)
+
+    def trace_iterator(self, span: Span, iterator) -> iter:
+        """
+        Yields from `iterator`, with `span` as the current span while each
+        item is produced. The span is finished once the iterator is
+        exhausted, raises, or is closed.
+        """
+        error = None
+
+        try:
+            while True:
+                token = _current_span.set(span)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    _current_span.reset(token)
+
+                yield item
+
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+            self.finish_span(span, error)
+
+    async def trace_async_iterator(self, span: Span, iterator):
+        """
+        asyncio counterpart of `trace_iterator`.
+        """
+        error = None
+
+        try:
+            while True:
+                token = _current_span.set(span)
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    _current_span.reset(token)
+
+                yield item
+
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if hasattr(iterator, 'aclose'):
+                await iterator.aclose()
+            self.finish_span(span, error)
+
+
+def traced(func):
+    """
+    Decorates a method of a service in `client_extensions`, opening a span
+    named after the service and the method whenever the service's client has
+    a `tracer`. Methods that return an iterator, or an async iterator, keep
+    their span open until the iterator has been consumed. An iterator with a
+    `trace_with(tracer, span)` method is returned by that method instead of
+    being wrapped. Methods of a service whose client has no tracer are
+    called directly.
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            tracer = getattr(self._client, 'tracer', None)
+            if tracer is None:
+                return await func(self, *args, **kwargs)
+
+            with tracer.span(_span_name(self, func)):
+                return await func(self, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        tracer = getattr(self._client, 'tracer', None)
+        if tracer is None:
+            return func(self, *args, **kwargs)
+
+        span = tracer.start_span(_span_name(self, func))
+        token = _current_span.set(span)
+
+        try:
+            result = func(self, *args, **kwargs)
+        except BaseException as e:
+            _current_span.reset(token)
+            tracer.finish_span(span, e)
+            raise
+
+        _current_span.reset(token)
+
+        # Iterators that must keep their own type, such as checkpointed
+        # streams, which `ReadAhead` looks for, trace themselves.
+        trace_with = getattr(result, 'trace_with', None)
+        if trace_with is not None:
+            return trace_with(tracer, span)
+
+        if isinstance(result, collections.abc.Iterator):
+            return tracer.trace_iterator(span, result)
+
+        if isinstance(result, collections.abc.AsyncIterator):
+            return tracer.trace_async_iterator(span, result)
+
+        tracer.finish_span(span)
+        return result
+
+    return wrapper
+
+
+def _span_name(service, func) -> str:
+    return '%s.%s' % (type(service).__name__, func.__name__)
+
+
+class OpenTelemetryHooks(object):
+    """
+    Exports spans to OpenTelemetry. Pass the instance's `on_start` and
+    `on_finish` methods to a `Tracer`, or use `Tracer(**hooks.as_kwargs())`.
+
+    Requires the `opentelemetry-api` package, which can be installed with
+    `pip install aspace-client[opentelemetry]`.
+    """
+
+    def __init__(self, tracer=None):
+        """
+        :tracer: Optional OpenTelemetry tracer. Defaults to a tracer from
+        the global tracer provider.
+        """
+        if otel_trace is None:
+            raise ImportError(
+                'OpenTelemetryHooks requires opentelemetry-api. Install it '
+                'with `pip install aspace-client[opentelemetry]`.'
+            )
+
+        self.tracer = tracer or otel_trace.get_tracer('aspace')
+        self._lock = threading.Lock()
+        self._spans = {}
+
+    def as_kwargs(self) -> dict:
+        return {'on_start': self.on_start, 'on_finish': self.on_finish}
+
+    def on_start(self, span: Span):
+        with self._lock:
+            parent = self._spans.get(span.parent_id)
+
+        otel_span = self.tracer.start_span(
+            span.name,
+            context=(
+                otel_trace.set_span_in_context(parent)
+                if parent is not None else
+                None
+            ),
+            attributes=span.attributes,
+            start_time=int(span.start_time * 1e9),
+        )
+
+        with self._lock:
+            self._spans[span.span_id] = otel_span
+
+    def on_finish(self, span: Span):
+        with self._lock:
+            otel_span = self._spans.pop(span.span_id, None)
+
+        if otel_span is None:
+            return
+
+        otel_span.set_attributes(span.attributes)
+
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(otel_trace.Status(
+                otel_trace.StatusCode.ERROR, str(span.error)))
+
+        otel_span.end(end_time=int(span.end_time * 1e9))
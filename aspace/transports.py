@@ -0,0 +1,399 @@
+r"""
+Contains the transport adapters that BaseASpaceClient can send its requests
+with. Each is a `requests` transport adapter, mounted on the client, so that
+URL joining, authentication headers, re-authentication on a 412, retries,
+caching and metrics work the same way whichever one is used.
+
+- `"requests"`: The `HTTPAdapter` from the requests library, which sends
+  HTTP/1.1 requests through a pool of urllib3 connections.
+- `"httpx"`: `HTTPXAdapter`, which sends requests with httpx, and can
+  multiplex many concurrent requests over a single HTTP/2 connection.
+"""
+
+import collections
+import os
+import ssl
+import threading
+import weakref
+
+import requests
+
+from aspace import constants
+
+# httpx is imported when the first HTTPXAdapter is created, since importing
+# it takes longer than the rest of the client. Please see `_import_httpx`.
+httpx = None
+
+
+# Methods whose requests can safely be sent again.
+_IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+# Number of times a request is sent again after the connection it was sent
+# on was closed by the server before responding.
+_MAX_REPLAYS = 2
+
+
+def create_adapter(transport: str = constants.DEFAULT_TRANSPORT,
+                   pool_connections: int = constants.DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize: int = constants.DEFAULT_POOL_MAXSIZE,
+                   pool_block=constants.DEFAULT_POOL_BLOCK,
+                   http2=True) -> requests.adapters.BaseAdapter:
+    """
+    Returns a new transport adapter for the named `transport`, with the
+    client's connection pool settings.
+    """
+    if transport == constants.TRANSPORT_REQUESTS:
+        return requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    if transport == constants.TRANSPORT_HTTPX:
+        return HTTPXAdapter(
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            http2=http2,
+        )
+
+    raise ValueError('Unknown transport: %r. Expected one of %r.' % (
+        transport,
+        (constants.TRANSPORT_REQUESTS, constants.TRANSPORT_HTTPX),
+    ))
+
+
+def _import_httpx():
+    """
+    Imports httpx into this module, if it has not been imported yet.
+    """
+    global httpx
+
+    if httpx is not None:
+        return
+
+    try:
+        import httpx as module
+    except ImportError:
+        raise ImportError(
+            'HTTPXAdapter requires httpx. Install it with '
+            '`pip install aspace-client[http2]`.'
+        ) from None
+
+    httpx = module
+
+
+def _translate_error(error, request: requests.PreparedRequest):
+    """
+    Returns the requests exception that corresponds to an httpx exception,
+    so that retry policies and routers handle both transports alike.
+    """
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(error, request=request)
+
+    if isinstance(error, httpx.ReadTimeout):
+        return requests.exceptions.ReadTimeout(error, request=request)
+
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.Timeout(error, request=request)
+
+    if isinstance(error, (httpx.NetworkError, httpx.ProtocolError)):
+        return requests.exceptions.ConnectionError(error, request=request)
+
+    if isinstance(error, httpx.UnsupportedProtocol):
+        return requests.exceptions.InvalidSchema(error, request=request)
+
+    return requests.exceptions.RequestException(error, request=request)
+
+
+class _HTTPXRawResponse(object):
+    """
+    Stands in for the urllib3 response that `requests.Response.raw` usually
+    holds, reading the body of an httpx response.
+    """
+
+    def __init__(self, response, request: requests.PreparedRequest):
+        self._response = response
+        self._request = request
+        self._chunks = None
+        self._buffer = b''
+
+    def stream(self, chunk_size: int = None, decode_content=True):
+        """
+        Yields the decompressed body in chunks of up to `chunk_size` bytes.
+        """
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise _translate_error(e, self._request) from e
+
+    def read(self, amt: int = None) -> bytes:
+        """
+        Reads up to `amt` bytes of the decompressed body, or the rest of it.
+        """
+        if self._chunks is None:
+            self._chunks = self.stream()
+
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if amt is None:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+
+        return data
+
+    def tell(self) -> int:
+        """
+        Returns the number of bytes of the body received so far, before
+        decompression.
+        """
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+
+    release_conn = close
+
+
+class HTTPXAdapter(requests.adapters.BaseAdapter):
+    """
+    Transport adapter that sends requests with an `httpx.Client`. With
+    `http2`, concurrent requests to a host that supports HTTP/2 share a
+    single connection, rather than each needing a connection of its own.
+    HTTP/2 is negotiated over TLS, so plain `http://` hosts use HTTP/1.1.
+
+    TLS verification, client certificates and proxies are configured when
+    the adapter is created, from its keyword arguments and the environment,
+    rather than per request. Sending a request whose `verify`, `cert` or
+    `proxies` settings differ from the adapter's raises a `ValueError`, so
+    that they are never silently ignored. To use other settings, pass an
+    adapter created with them as the client's `transport`, for example
+    `HTTPXAdapter(verify='/path/to/ca.pem')`.
+
+    Requires httpx, and for HTTP/2 the h2 package, which can be installed
+    with `pip install aspace-client[http2]`.
+    """
+
+    def __init__(self, pool_maxsize: int = constants.DEFAULT_POOL_MAXSIZE,
+                 pool_block=constants.DEFAULT_POOL_BLOCK, http2=True,
+                 **kwargs):
+        """
+        :pool_maxsize: Maximum number of keep-alive connections kept open.
+        Each HTTP/2 connection carries many requests at once.
+
+        :pool_block: If True, at most `pool_maxsize` connections are opened,
+        and requests wait for a free connection once they are all in use.
+
+        :http2: If True, HTTP/2 is offered to hosts that support it.
+
+        Any other keyword arguments are passed to `httpx.Client`.
+        """
+        _import_httpx()
+
+        super().__init__()
+
+        # Matches the requests library, which does not time out, or follow
+        # redirects within the adapter, by default.
+        kwargs.setdefault('timeout', None)
+
+        # Matches the CA bundle that requests takes from the environment.
+        trust_env = kwargs.get('trust_env', True)
+        ca_bundle = (
+            os.environ.get('REQUESTS_CA_BUNDLE')
+            or os.environ.get('CURL_CA_BUNDLE')
+        ) if trust_env else None
+
+        self.verify = kwargs.pop('verify', ca_bundle or True)
+        self.cert = kwargs.get('cert')
+        self.trust_env = trust_env
+
+        if isinstance(self.verify, str):
+            kwargs['verify'] = ssl.create_default_context(cafile=self.verify)
+        else:
+            kwargs['verify'] = self.verify
+
+        try:
+            self.client = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=pool_maxsize if pool_block else None,
+                    max_keepalive_connections=pool_maxsize,
+                ),
+                follow_redirects=False,
+                **kwargs
+            )
+        except ImportError as e:
+            raise ImportError(
+                'HTTP/2 requires the h2 package. Install it with '
+                '`pip install aspace-client[http2]`.'
+            ) from e
+
+        self.pool_maxsize = pool_maxsize
+
+        # Offers the compression formats that this httpx can decode, which
+        # include brotli and zstd only when their packages are installed.
+        # BaseASpaceClient sends this as its Accept-Encoding header.
+        self.accept_encoding = ', '.join(
+            encoding
+            for encoding in getattr(
+                httpx._decoders, 'SUPPORTED_DECODERS', ('gzip', 'deflate'))
+            if encoding != 'identity'
+        )
+
+        self._lock = threading.Lock()
+        self._streams = weakref.WeakSet()
+        self._stats = {}
+
+    def send(self, request: requests.PreparedRequest, stream=False,
+             timeout=None, verify=True, cert=None, proxies=None):
+        """
+        Sends a `requests.PreparedRequest` with httpx, returning a
+        `requests.Response` whose body is read from the httpx response.
+        Raises a `ValueError` if `verify`, `cert` or `proxies` differ from
+        the adapter's settings.
+        """
+        self._check_settings(request, verify, cert, proxies)
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            timeout = httpx.Timeout(timeout)
+
+        # An HTTP/2 server can stop accepting streams on a connection, for
+        # example once it has served a maximum number of requests over it,
+        # which fails the requests that were about to be sent on it. Those
+        # requests were not processed, so idempotent ones are sent again, on
+        # a new connection. Several connections can be closed in quick
+        # succession under load, so more than one replay may be needed.
+        attempts = (
+            _MAX_REPLAYS + 1 if request.method in _IDEMPOTENT_METHODS else 1
+        )
+
+        while True:
+            attempts -= 1
+
+            try:
+                resp = self.client.send(
+                    self.client.build_request(
+                        request.method,
+                        request.url,
+                        headers=list(request.headers.items()),
+                        content=request.body,
+                        timeout=timeout,
+                    ),
+                    stream=True,
+                )
+                break
+            except (httpx.RemoteProtocolError, httpx.WriteError) as e:
+                if not attempts:
+                    raise _translate_error(e, request) from e
+            except httpx.HTTPError as e:
+                raise _translate_error(e, request) from e
+
+        self._record(resp)
+        return self.build_response(request, resp)
+
+    def _check_settings(self, request: requests.PreparedRequest, verify,
+                        cert, proxies):
+        """
+        Raises a `ValueError` if the per-request settings passed by
+        `requests.Session.send` differ from the settings that the adapter's
+        httpx client was created with.
+        """
+        # Proxies from the environment are also used by httpx, unless the
+        # adapter was created with `trust_env=False`. Only the proxy that
+        # applies to the request's url is compared.
+        proxy = requests.utils.select_proxy(request.url, proxies or {})
+        expected_proxy = requests.utils.select_proxy(
+            request.url,
+            requests.utils.get_environ_proxies(request.url)
+            if self.trust_env else
+            {},
+        )
+
+        for name, value, expected in (
+                ('verify', verify, self.verify),
+                ('cert', cert, self.cert),
+                ('proxy', proxy, expected_proxy)):
+            if value != expected:
+                raise ValueError(
+                    'HTTPXAdapter was created with %s=%r, but the request was '
+                    'sent with %s=%r. Create the adapter with the settings '
+                    'instead, and pass it as the client\'s transport.' % (
+                        name, expected, name, value)
+                )
+
+    def build_response(self, request: requests.PreparedRequest, resp):
+        """
+        Returns a `requests.Response` for an httpx response.
+        """
+        response = requests.Response()
+        response.status_code = resp.status_code
+        response.reason = resp.reason_phrase
+        response.headers = requests.structures.CaseInsensitiveDict(
+            resp.headers.items())
+        response.encoding = requests.utils.get_encoding_from_headers(
+            response.headers)
+        response.raw = _HTTPXRawResponse(resp, request)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.http_version = resp.http_version
+        return response
+
+    def _record(self, resp):
+        """
+        Counts a response, and the connection it arrived on, towards the
+        statistics of its host.
+        """
+        url = resp.request.url
+        host = '%s://%s:%s' % (
+            url.scheme,
+            url.host,
+            url.port or (443 if url.scheme == 'https' else 80),
+        )
+        network_stream = resp.extensions.get('network_stream')
+
+        with self._lock:
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = {
+                    'connections': 0,
+                    'requests': 0,
+                    'http_versions': collections.Counter(),
+                }
+
+            stats['requests'] += 1
+            stats['http_versions'][resp.http_version] += 1
+
+            if network_stream is not None and (
+                    network_stream not in self._streams):
+                self._streams.add(network_stream)
+                stats['connections'] += 1
+
+    def connection_stats(self) -> dict:
+        """
+        Returns connection reuse statistics for each host, keyed by host
+        url. Please see `BaseASpaceClient.connection_stats`. Instead of the
+        number of idle connections, includes the number of requests sent
+        with each HTTP version.
+        """
+        with self._lock:
+            return {
+                host: {
+                    'connections': stats['connections'],
+                    'requests': stats['requests'],
+                    'reused': max(
+                        stats['requests'] - stats['connections'], 0),
+                    'http_versions': dict(stats['http_versions']),
+                }
+                for host, stats in self._stats.items()
+            }
+
+    def close(self):
+        self.client.close()
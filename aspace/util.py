@@ -1,4 +1,9 @@
+import collections
+import contextvars
+import itertools
+import os
 import re
+from concurrent import futures
 
 
 def convert_to_enumeration_value(value: str, value_if_blank='unknown') -> str:
@@ -18,3 +23,228 @@ def convert_to_enumeration_value(value: str, value_if_blank='unknown') -> str:
     value = value.strip(' _')
     value = re.sub(r'_+', '_', value)
     return value or value_if_blank
+
+
+# Endpoints that take a username in place of a numeric ID, as a map from
+# the segments around the username to its placeholder.
+_NAMED_SEGMENTS = {
+    ('users', 'login'): ':username',
+    ('users', 'become-user'): ':username',
+}
+
+
+def endpoint_template(uri: str) -> str:
+    """
+    Normalizes a URI into the template of its endpoint, by removing the query
+    string and replacing numeric path segments with `:id`, and usernames
+    with `:username`, so that metrics are not kept for every record or user.
+
+    `"/repositories/2/archival_objects/15?resolve[]=x"` ->
+    `"/repositories/:id/archival_objects/:id"`
+
+    `"/users/admin/login"` -> `"/users/:username/login"`
+    """
+    path = uri.split('?', 1)[0].split('#', 1)[0]
+    segments = path.strip('/').split('/')
+
+    for index in range(1, len(segments) - 1):
+        placeholder = _NAMED_SEGMENTS.get(
+            (segments[index - 1], segments[index + 1]))
+        if placeholder:
+            segments[index] = placeholder
+
+    return '/' + '/'.join(
+        ':id' if segment.isdigit() else segment
+        for segment in segments
+    ).rstrip('/')
+
+
+def concurrent_map(func, iterable, concurrency: int = 1, ordered=True,
+                   max_buffered: int = None) -> iter:
+    """
+    Lazily maps `func` over `iterable`, calling `func` from a pool of
+    `concurrency` worker threads. Returns an iterator over the results.
+
+    At most `max_buffered` calls (defaults to twice the `concurrency`) are
+    in flight or waiting to be consumed at any one time, so the iterable is
+    only consumed as fast as the results are.
+
+    :ordered: If True, results are yielded in the order of `iterable`.
+    Otherwise results are yielded as soon as they are completed.
+
+    A `concurrency` of 1 or less maps `func` on the calling thread.
+    """
+    if not concurrency or concurrency <= 1:
+        return map(func, iterable)
+
+    max_buffered = max(max_buffered or concurrency * 2, concurrency)
+    return _concurrent_map(func, iterable, concurrency, ordered, max_buffered)
+
+
+def _concurrent_map(func, iterable, concurrency, ordered, max_buffered):
+    return _executor_map(
+        lambda: futures.ThreadPoolExecutor(max_workers=concurrency),
+
+        # Runs each call in a copy of the caller's context, so that the
+        # current tracing span carries over to the worker thread.
+        lambda executor, item: executor.submit(
+            contextvars.copy_context().run, func, item),
+
+        iterable,
+        ordered,
+        max_buffered,
+    )
+
+
+def process_map(func, iterable, processes: int = None, ordered=True,
+                max_buffered: int = None, mp_context=None, initializer=None,
+                initargs=()) -> iter:
+    """
+    Counterpart of `concurrent_map` that calls `func` from a pool of
+    `processes` worker processes, which defaults to the number of CPUs.
+    `func`, the items of `iterable` and the results must be picklable.
+
+    At most `max_buffered` calls (defaults to twice the number of processes)
+    are in flight or waiting to be consumed at any one time.
+
+    :mp_context: Optional multiprocessing context used to start the
+    workers. Defaults to the platform's default start method.
+
+    :initializer: Optional function called with `initargs` when each worker
+    process starts.
+    """
+    processes = max(processes or os.cpu_count() or 1, 1)
+    max_buffered = max(max_buffered or processes * 2, processes)
+
+    return _executor_map(
+        lambda: futures.ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=mp_context,
+            initializer=initializer,
+            initargs=initargs,
+        ),
+        lambda executor, item: executor.submit(func, item),
+        iterable,
+        ordered,
+        max_buffered,
+    )
+
+
+def _executor_map(create_executor, submit, iterable, ordered, max_buffered):
+    """
+    Implements `concurrent_map` and `process_map`. The executor is created
+    by `create_executor` once iteration starts, and `submit` is called with
+    the executor and each item of `iterable` to schedule a call.
+    """
+    items = iter(iterable)
+    executor = create_executor()
+    pending = collections.deque()
+
+    def submit_next():
+        for item in itertools.islice(items, 1):
+            pending.append(submit(executor, item))
+            return True
+        return False
+
+    try:
+        while len(pending) < max_buffered and submit_next():
+            pass
+
+        while pending:
+            if ordered:
+                result = pending.popleft().result()
+                submit_next()
+                yield result
+                continue
+
+            done, _ = futures.wait(
+                pending,
+                return_when=futures.FIRST_COMPLETED,
+            )
+
+            for future in done:
+                pending.remove(future)
+                submit_next()
+
+            for future in done:
+                yield future.result()
+
+    finally:
+        # Runs when the consumer stops iterating early, or a call raises.
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def async_concurrent_map(func, iterable, concurrency: int = 1,
+                               ordered=True, max_buffered: int = None):
+    """
+    asyncio counterpart of `concurrent_map`. Lazily awaits the coroutine
+    function `func` for each item of `iterable`, with at most `concurrency`
+    calls running at once, and asynchronously yields the results.
+    `iterable` can also be an async iterable, such as an async generator.
+
+    At most `max_buffered` calls (defaults to twice the `concurrency`) are
+    scheduled or waiting to be consumed at any one time.
+
+    :ordered: If True, results are yielded in the order of `iterable`.
+    Otherwise results are yielded as soon as they are completed.
+    """
+    # Imported here, since importing asyncio takes longer than the rest of
+    # this module, and only asynchronous clients need it.
+    import asyncio
+
+    concurrency = max(concurrency or 1, 1)
+    max_buffered = max(max_buffered or concurrency * 2, concurrency)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = collections.deque()
+
+    if hasattr(iterable, '__aiter__'):
+        items = iterable.__aiter__()
+    else:
+        items = iter(iterable)
+
+    async def call(item):
+        async with semaphore:
+            return await func(item)
+
+    async def submit_next():
+        try:
+            item = (
+                await items.__anext__()
+                if hasattr(items, '__anext__') else
+                next(items)
+            )
+        except (StopIteration, StopAsyncIteration):
+            return False
+
+        pending.append(asyncio.ensure_future(call(item)))
+        return True
+
+    try:
+        while len(pending) < max_buffered and await submit_next():
+            pass
+
+        while pending:
+            if ordered:
+                result = await pending.popleft()
+                await submit_next()
+                yield result
+                continue
+
+            done, _ = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            for task in done:
+                pending.remove(task)
+                await submit_next()
+
+            for task in done:
+                yield task.result()
+
+    finally:
+        for task in pending:
+            task.cancel()
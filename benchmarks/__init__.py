@@ -0,0 +1,8 @@
+r"""
+Benchmarks for this package, which run against the local stand-in server in
+`aspace.testing.server`. Run them from the root of the repository:
+
+```
+python -m benchmarks.throughput --output results.json
+```
+"""
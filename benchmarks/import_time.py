@@ -0,0 +1,149 @@
+r"""
+Measures how long it takes to import this package and its client in a fresh
+interpreter, which short-lived scripts pay on every run, and checks each
+against a budget:
+
+```
+python -m benchmarks.import_time
+python -m benchmarks.import_time --modules aspace.client --budget 0.1
+```
+
+Exits with status 1 if the median import time of any module is over budget,
+or if importing it pulls in a module that only optional features need.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+
+# Seconds that the median import of each module may take by default.
+# `aspace.client` includes the requests library, which it is built on.
+_DEFAULT_BUDGETS = {
+    'aspace': 0.02,
+    'aspace.client': 0.15,
+}
+
+# Modules that only optional features need, such as asynchronous clients,
+# the httpx transport and harvesting in worker processes, which importing
+# the client should not pull in.
+_OPTIONAL_MODULES = ('asyncio', 'httpx', 'multiprocessing', 'subprocess')
+
+# Run in a fresh interpreter for each measurement, so that nothing has been
+# imported beforehand.
+_MEASURE = r"""
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': seconds,
+    'modules': len([name for name in sys.modules if name.startswith('aspace')]),
+    'optional_modules': [
+        name for name in {optional_modules!r} if name in sys.modules
+    ],
+}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict:
+    """
+    Imports `module` in `runs` fresh interpreters, returning the import times,
+    and the wall time of each interpreter from start to exit.
+    """
+    imports = []
+    processes = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', _MEASURE.format(
+                module=module, optional_modules=_OPTIONAL_MODULES)],
+            check=True,
+            stdout=subprocess.PIPE,
+        ).stdout
+        processes.append(time.perf_counter() - start)
+        imports.append(json.loads(output.decode('utf-8')))
+
+    seconds = [result['seconds'] for result in imports]
+
+    return {
+        'module': module,
+        'runs': runs,
+        'import_median': statistics.median(seconds),
+        'import_min': min(seconds),
+        'import_max': max(seconds),
+        'process_median': statistics.median(processes),
+        'aspace_modules': imports[-1]['modules'],
+        'optional_modules': imports[-1]['optional_modules'],
+    }
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--modules', nargs='+', default=sorted(_DEFAULT_BUDGETS))
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument(
+        '--budget', type=float,
+        help='Seconds that the median import of each module may take. '
+             'Defaults to %s, and %s for other modules.' % (
+                 ', '.join('%s for %s' % (budget, module)
+                           for module, budget in _DEFAULT_BUDGETS.items()),
+                 _DEFAULT_BUDGETS['aspace']))
+    parser.add_argument(
+        '--output', help='File to write the JSON results to. Defaults to '
+                         'standard output.')
+    args = parser.parse_args(argv)
+
+    results = [measure(module, args.runs) for module in args.modules]
+
+    for result in results:
+        result['budget'] = (
+            args.budget if args.budget is not None else
+            _DEFAULT_BUDGETS.get(result['module'], _DEFAULT_BUDGETS['aspace'])
+        )
+
+    text = json.dumps({
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'results': results,
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(text + '\n')
+    else:
+        print(text)
+
+    failed = False
+
+    for result in results:
+        if result['import_median'] > result['budget']:
+            failed = True
+            print(
+                'Over budget: import %s took %.4fs (median), budget %.4fs' % (
+                    result['module'], result['import_median'],
+                    result['budget']),
+                file=sys.stderr,
+            )
+
+        if result['optional_modules']:
+            failed = True
+            print(
+                'import %s imported %s, which only optional features need'
+                % (result['module'], ', '.join(result['optional_modules'])),
+                file=sys.stderr,
+            )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+r"""
+Measures the end-to-end throughput of the record streams and services,
+against a local `StandInServer` with a fixed latency profile.
+
+Each scenario runs in a fresh process, so that its peak RSS and CPU time are
+measured on their own, while the server runs in this process. Results are
+written as JSON, and can be compared against the results of an earlier run:
+
+```
+python -m benchmarks.throughput --output baseline.json
+python -m benchmarks.throughput --compare baseline.json --tolerance 0.1
+```
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import aspace
+from aspace import constants, enums
+from aspace.client import ASpaceClient
+from aspace.testing.server import Dataset, FaultProfile, StandInServer
+
+
+# Seconds of latency, and of random jitter, added to every response.
+LATENCY_PROFILES = {
+    'none': (0.0, 0.0),
+    'lan': (0.002, 0.001),
+    'wan': (0.03, 0.01),
+}
+
+
+def _records(client, options):
+    return client.streams.records(
+        'subjects',
+        batch_size=options['batch_size'],
+        concurrency=options['concurrency'],
+    )
+
+
+def _repository_relative_records(client, options):
+    return client.streams.repository_relative_records(
+        'archival_objects',
+        batch_size=options['batch_size'],
+        concurrency=options['concurrency'],
+    )
+
+
+def _resource_trees(client, options):
+    return client.streams.resource_trees()
+
+
+def _linked_record_uris(client, options):
+
+    # The search index stores URIs with a leading slash.
+    return (
+        uri
+        for tc_uri in client.streams.repository_relative_uris(
+            'top_containers', repository_uris=['/repositories/2'])
+        for uri in client.top_containers.linked_record_uris(
+            '/' + tc_uri.lstrip('/'))
+    )
+
+
+def _get_by_status(client, options):
+    return client.jobs.get_by_status([
+        enums.JobStatus.COMPLETED,
+        enums.JobStatus.FAILED,
+    ])
+
+
+def _users_get_all(client, options):
+    return client.users.get_all()
+
+
+# Maps the name of each scenario to a function that returns an iterable of
+# records, and to the unit that latencies are measured in. Streams yield
+# batches of records from a single response, so the gaps between records say
+# nothing about latency, and the requests they send are timed instead.
+# Services that return a list are timed per call.
+SCENARIOS = {
+    'records': (_records, 'request'),
+    'repository_relative_records': (_repository_relative_records, 'request'),
+    'resource_trees': (_resource_trees, 'request'),
+    'linked_record_uris': (_linked_record_uris, 'request'),
+    'get_by_status': (_get_by_status, 'call'),
+    'users.get_all': (_users_get_all, 'call'),
+}
+
+
+def _percentile(values: list, percentile: float) -> float:
+    if not values:
+        return None
+
+    values = sorted(values)
+    index = min(int(round(percentile * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def _peak_rss() -> int:
+    """
+    Returns the peak resident set size of this process in bytes, or `None`
+    on platforms without the `resource` module.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, while macOS reports bytes.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _cpu_time() -> float:
+    if resource is None:
+        return time.process_time()
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_scenario(name: str, url: str, options: dict) -> dict:
+    """
+    Runs a scenario against the server at `url`, returning its measurements.
+    Called in a separate process.
+    """
+    scenario, latency_unit = SCENARIOS[name]
+    client = ASpaceClient(
+        url, 'admin', 'admin',
+        pool_maxsize=max(options['concurrency'],
+                         constants.DEFAULT_POOL_MAXSIZE),
+    )
+
+    records = 0
+    latencies = []
+
+    # Times each request from sending it until its headers are received,
+    # which is what `Response.elapsed` measures.
+    if latency_unit == 'request':
+        client.hooks['response'].append(
+            lambda resp, *args, **kwargs: latencies.append(
+                resp.elapsed.total_seconds()))
+
+    cpu_start = _cpu_time()
+    start = time.perf_counter()
+
+    for _ in range(options['repeat']):
+        call_start = time.perf_counter()
+
+        for _ in scenario(client, options):
+            records += 1
+
+        if latency_unit == 'call':
+            latencies.append(time.perf_counter() - call_start)
+
+    seconds = time.perf_counter() - start
+    cpu_seconds = _cpu_time() - cpu_start
+
+    return {
+        'name': name,
+        'records': records,
+        'seconds': seconds,
+        'records_per_second': records / seconds if seconds else None,
+        'latency_unit': latency_unit,
+        'latency_p50': _percentile(latencies, 0.5),
+        'latency_p99': _percentile(latencies, 0.99),
+        'latency_mean': statistics.mean(latencies) if latencies else None,
+        'peak_rss_bytes': _peak_rss(),
+        'cpu_seconds': cpu_seconds,
+        'cpu_seconds_per_record': cpu_seconds / records if records else None,
+        'requests': sum(
+            stats['requests']
+            for stats in client.metrics_snapshot()['endpoints'].values()
+        ),
+    }
+
+
+def run(options: dict) -> dict:
+    """
+    Starts a stand-in server, and runs each of the selected scenarios in a
+    fresh process. Returns the results.
+    """
+    latency, jitter = LATENCY_PROFILES[options['profile']]
+
+    dataset = Dataset(
+        repositories=options['repositories'],
+        records_per_type=options['records_per_type'],
+        counts={
+            'users': options['users'],
+            'top_containers': options['top_containers'],
+        },
+        record_size=options['record_size'],
+    )
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+
+    with StandInServer(dataset, FaultProfile(
+            latency=latency, latency_jitter=jitter, seed=options['seed'])
+            ) as server:
+
+        for name in options['scenarios']:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=context) as executor:
+                result = executor.submit(
+                    run_scenario, name, server.url, options).result()
+
+            results.append(result)
+            print(
+                '%-30s %10.1f records/s  p50 %.4fs  p99 %.4fs  '
+                'peak RSS %s' % (
+                    name,
+                    result['records_per_second'] or 0,
+                    result['latency_p50'] or 0,
+                    result['latency_p99'] or 0,
+                    result['peak_rss_bytes'],
+                ),
+                file=sys.stderr,
+            )
+
+    return {
+        'aspace_version': aspace.__version__,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'options': options,
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Returns a description of each scenario whose throughput dropped by more
+    than `tolerance` (a fraction) compared with `baseline`.
+    """
+    baseline_results = {
+        result['name']: result for result in baseline.get('results', [])
+    }
+
+    regressions = []
+
+    for result in report['results']:
+        previous = baseline_results.get(result['name'])
+        if not previous or not previous.get('records_per_second'):
+            continue
+
+        ratio = (result['records_per_second'] or 0) / (
+            previous['records_per_second'])
+
+        if ratio < 1 - tolerance:
+            regressions.append(
+                '%s: %.1f records/s, down from %.1f (%.0f%%)' % (
+                    result['name'],
+                    result['records_per_second'] or 0,
+                    previous['records_per_second'],
+                    (ratio - 1) * 100,
+                )
+            )
+
+    return regressions
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--scenarios', nargs='+', choices=sorted(SCENARIOS),
+        default=list(SCENARIOS))
+    parser.add_argument(
+        '--profile', choices=sorted(LATENCY_PROFILES), default='lan')
+    parser.add_argument('--repositories', type=int, default=2)
+    parser.add_argument('--records-per-type', type=int, default=500)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--top-containers', type=int, default=10)
+    parser.add_argument('--record-size', type=int, default=1024)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--output', help='File to write the JSON results to. Defaults to '
+                         'standard output.')
+    parser.add_argument(
+        '--compare', help='JSON results of an earlier run. Exits with status '
+                          '1 if throughput dropped by more than --tolerance.')
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    options = {
+        key: value for key, value in vars(args).items()
+        if key not in ('output', 'compare', 'tolerance')
+    }
+
+    report = run(options)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r') as baseline_file:
+            regressions = compare(report, json.load(baseline_file),
+                                  args.tolerance)
+
+        for regression in regressions:
+            print('Regression: %s' % regression, file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+r"""
+Compares the `"requests"` and `"httpx"` transports, sending concurrent
+record GETs at several levels of concurrency.
+
+By default, runs against a local `StandInServer`, which only speaks
+HTTP/1.1, so both transports use HTTP/1.1. To measure HTTP/2 multiplexing,
+point it at an ArchivesSpace instance behind an HTTP/2 proxy:
+
+```
+python -m benchmarks.transports --concurrency 8 32 128
+python -m benchmarks.transports --url https://aspace.example.edu/api \
+    --username admin --password admin --repository 2
+```
+"""
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+
+import aspace
+from aspace import constants, retry, util
+from aspace.client import ASpaceClient
+from aspace.testing.server import Dataset, FaultProfile, StandInServer
+
+from benchmarks.throughput import LATENCY_PROFILES, _percentile
+
+
+TRANSPORTS = (constants.TRANSPORT_REQUESTS, constants.TRANSPORT_HTTPX)
+
+
+def run_case(transport: str, concurrency: int, url: str,
+             options: dict) -> dict:
+    """
+    Sends `options['requests']` record GETs with `concurrency` threads
+    sharing a client that uses `transport`, returning its measurements.
+    Called in a separate process.
+    """
+    # Both transports retry requests that fail because a connection was
+    # closed under load, as they would in production.
+    client = ASpaceClient(
+        url, options['username'], options['password'],
+        transport=transport,
+        pool_maxsize=options['pool_maxsize'],
+        pool_block=True,
+        retry_policy=retry.RetryPolicy(),
+    )
+
+    list_uri = 'repositories/%d/%s' % (
+        options['repository'], options['record_type'])
+    ids = client.get(list_uri, params={'all_ids': True}).json()
+    uris = [
+        '%s/%d' % (list_uri, ids[i % len(ids)])
+        for i in range(options['requests'])
+    ]
+
+    def get(uri):
+        start = time.perf_counter()
+        resp = client.get(uri)
+        resp.raise_for_status()
+        resp.json()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = list(util.concurrent_map(get, uris, concurrency))
+    seconds = time.perf_counter() - start
+
+    connections = client.connection_stats()
+    client.close()
+
+    return {
+        'transport': transport,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'seconds': seconds,
+        'requests_per_second': len(latencies) / seconds if seconds else None,
+        'latency_p50': _percentile(latencies, 0.5),
+        'latency_p99': _percentile(latencies, 0.99),
+        'latency_mean': statistics.mean(latencies) if latencies else None,
+        'retries': client.retry_stats()['retries'],
+        'connections': sum(
+            stats['connections'] for stats in connections.values()),
+        'http_versions': {
+            version: count
+            for stats in connections.values()
+            for version, count in stats.get('http_versions', {}).items()
+        },
+    }
+
+
+def _run_cases(url: str, options: dict) -> list:
+    results = []
+    context = multiprocessing.get_context('spawn')
+
+    for concurrency in options['concurrency']:
+        for transport in options['transports']:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=1, mp_context=context) as executor:
+                result = executor.submit(
+                    run_case, transport, concurrency, url, options).result()
+
+            results.append(result)
+            print(
+                '%-8s concurrency %4d %10.1f requests/s  p50 %.4fs  '
+                'p99 %.4fs  %d connections' % (
+                    transport,
+                    concurrency,
+                    result['requests_per_second'] or 0,
+                    result['latency_p50'] or 0,
+                    result['latency_p99'] or 0,
+                    result['connections'],
+                ),
+                file=sys.stderr,
+            )
+
+    return results
+
+
+def run(options: dict) -> dict:
+    """
+    Runs every combination of transport and concurrency, each in a fresh
+    process, against `options['url']`, or a stand-in server if it is not
+    set. Returns the results.
+    """
+    if options['url']:
+        results = _run_cases(options['url'], options)
+    else:
+        latency, jitter = LATENCY_PROFILES[options['profile']]
+        dataset = Dataset(
+            repositories=1,
+            records_per_type=options['requests'],
+            record_size=options['record_size'],
+        )
+
+        with StandInServer(dataset, FaultProfile(
+                latency=latency, latency_jitter=jitter, seed=options['seed'])
+                ) as server:
+            results = _run_cases(server.url, options)
+
+    return {
+        'aspace_version': aspace.__version__,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'options': dict(options, password=None),
+        'results': results,
+    }
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--transports', nargs='+', choices=TRANSPORTS,
+        default=list(TRANSPORTS))
+    parser.add_argument(
+        '--concurrency', nargs='+', type=int, default=[8, 32, 128])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument(
+        '--pool-maxsize', type=int, default=constants.DEFAULT_POOL_MAXSIZE,
+        help='Connections per host. Requests over this limit wait for a '
+             'free connection, unless they share an HTTP/2 connection.')
+    parser.add_argument(
+        '--url', help='API url of an ArchivesSpace instance to run against, '
+                      'instead of a stand-in server.')
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin')
+    parser.add_argument('--repository', type=int, default=2)
+    parser.add_argument('--record-type', default='archival_objects')
+    parser.add_argument(
+        '--profile', choices=sorted(LATENCY_PROFILES), default='lan')
+    parser.add_argument('--record-size', type=int, default=1024)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--output', help='File to write the JSON results to. Defaults to '
+                         'standard output.')
+    args = parser.parse_args(argv)
+
+    options = {
+        key: value for key, value in vars(args).items() if key != 'output'
+    }
+
+    text = json.dumps(run(options), indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
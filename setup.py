@@ -35,10 +35,17 @@ setup(
     ],
 
     keywords='archivesspace archives api',
-    packages=find_packages(exclude=['contrib', 'docs', 'tests']),
+    packages=find_packages(exclude=['contrib', 'docs', 'tests', 'benchmarks']),
+    python_requires='>=3.7',
     install_requires=[
         'requests>=2.18,<3',
     ],
+    extras_require={
+        'async': ['httpx>=0.18'],
+        'http2': ['httpx[http2]>=0.18'],
+        'orjson': ['orjson'],
+        'opentelemetry': ['opentelemetry-api'],
+    },
 
     package_data={},
     project_urls={
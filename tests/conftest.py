@@ -0,0 +1,22 @@
+import pytest
+
+from aspace.client import ASpaceClient
+from aspace.testing.server import Dataset, StandInServer
+
+
+@pytest.fixture
+def dataset():
+    return Dataset(repositories=2, records_per_type=25)
+
+
+@pytest.fixture
+def server(dataset):
+    with StandInServer(dataset) as stand_in:
+        yield stand_in
+
+
+@pytest.fixture
+def client(server):
+    client = ASpaceClient(server.url, 'admin', 'admin')
+    yield client
+    client.close()
@@ -0,0 +1,151 @@
+import asyncio
+import configparser
+
+import pytest
+
+from aspace import util
+
+httpx = pytest.importorskip('httpx')
+
+from aspace.async_client import AsyncASpaceClient  # noqa: E402
+
+
+def _run(server, func):
+    """
+    Runs the coroutine function `func` with a new client of the server.
+    """
+
+    async def main():
+        async with AsyncASpaceClient(server.url, 'admin', 'admin') as client:
+            return await func(client)
+
+    return asyncio.run(main())
+
+
+def test_logs_in_before_the_first_request(server):
+
+    async def get(client):
+        return (await client.get('/subjects/1')).json()
+
+    assert _run(server, get)['uri'] == '/subjects/1'
+    assert server.stats()['logins'] == 1
+
+
+def test_concurrent_412s_share_one_login(server):
+
+    async def burst(client):
+        await client.authenticate()
+        server.expire_sessions()
+        server.reset_stats()
+
+        return await asyncio.gather(*[
+            client.get('/subjects/%d' % rec_id) for rec_id in range(1, 11)
+        ])
+
+    responses = _run(server, burst)
+
+    assert [resp.status_code for resp in responses] == [200] * 10
+    assert server.stats()['logins'] == 1
+
+
+def test_client_can_be_used_from_several_event_loops(server):
+    client = AsyncASpaceClient(server.url, 'admin', 'admin')
+
+    async def burst():
+        server.expire_sessions()
+        client._http = httpx.AsyncClient()
+
+        try:
+            responses = await asyncio.gather(*[
+                client.get('/subjects/%d' % rec_id) for rec_id in range(1, 6)
+            ])
+        finally:
+            await client.aclose()
+
+        return [resp.status_code for resp in responses]
+
+    assert asyncio.run(burst()) == [200] * 5
+    assert asyncio.run(burst()) == [200] * 5
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_records(server, ordered):
+
+    async def records(client):
+        return [
+            record['uri']
+            async for record in client.streams.records(
+                'subjects', batch_size=4, concurrency=4, ordered=ordered)
+        ]
+
+    uris = _run(server, records)
+    expected = ['/subjects/%d' % rec_id for rec_id in range(1, 26)]
+
+    if ordered:
+        assert uris == expected
+    else:
+        assert sorted(uris) == sorted(expected)
+
+
+def test_records_deleted_during_the_stream_are_skipped(dataset, server):
+
+    async def records(client):
+        stream = client.streams.records('subjects', batch_size=1)
+        uris = [(await stream.__anext__())['uri']]
+        dataset.counts['subjects'] = 20
+        return uris + [record['uri'] async for record in stream]
+
+    assert _run(server, records) == [
+        '/subjects/%d' % rec_id for rec_id in range(1, 21)]
+
+
+def test_resource_trees(server):
+
+    async def trees(client):
+        return [
+            tree['record_uri']
+            async for tree in client.streams.resource_trees(concurrency=4)
+        ]
+
+    assert _run(server, trees) == [
+        '/repositories/%d/resources/%d' % (repo_id, rec_id)
+        for repo_id in (2, 3)
+        for rec_id in range(1, 26)
+    ]
+
+
+def test_concurrent_map_accepts_async_iterables():
+
+    async def numbers():
+        for number in range(10):
+            await asyncio.sleep(0)
+            yield number
+
+    async def double(number):
+        await asyncio.sleep(0.001 * (number % 3))
+        return number * 2
+
+    async def main():
+        return [
+            result
+            async for result in util.async_concurrent_map(
+                double, numbers(), concurrency=3)
+        ]
+
+    assert asyncio.run(main()) == [number * 2 for number in range(10)]
+
+
+def test_init_from_config():
+    config = configparser.ConfigParser()
+    config.read_string(
+        '[aspace_credentials]\n'
+        'api_host = http://localhost:8089\n'
+        'username = someone\n'
+        'max_connections = 7\n'
+    )
+
+    client = AsyncASpaceClient.init_from_config(config)
+
+    assert client.aspace_api_host == 'http://localhost:8089/'
+    assert client.aspace_username == 'someone'
+    assert client._http._transport._pool._max_connections == 7
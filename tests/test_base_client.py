@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from aspace import limiters
+from aspace.client import ASpaceClient
+
+
+def test_412_is_replayed_after_logging_in(server, client):
+    server.expire_sessions()
+    server.reset_stats()
+
+    resp = client.get('/subjects/1')
+
+    assert resp.status_code == 200
+    assert server.stats()['logins'] == 1
+    assert server.stats()['requests']['GET /subjects/:id'] == 2
+
+
+def test_concurrent_412s_share_one_login(server, client):
+    server.expire_sessions()
+    server.reset_stats()
+
+    threads = 8
+    start = threading.Barrier(threads)
+    statuses = []
+
+    def get():
+        start.wait()
+        statuses.append(client.get('/subjects/1').status_code)
+
+    workers = [threading.Thread(target=get) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert statuses == [200] * threads
+    assert server.stats()['logins'] == 1
+
+
+@pytest.mark.parametrize('transport', ['requests', 'httpx'])
+def test_warm_up_opens_connections(server, transport):
+    if transport == 'httpx':
+        pytest.importorskip('httpx')
+
+    client = ASpaceClient(
+        server.url, 'admin', 'admin', pool_maxsize=8, transport=transport)
+
+    assert client.warm_up(4) == 4
+
+    stats = client.connection_stats()[server.url]
+    assert stats['connections'] == 4
+    assert client.bandwidth_meter.snapshot()['endpoints']['/'][
+        'responses'] == 4
+
+    # The warmed up connections are reused.
+    list(client.streams.records('subjects', concurrency=4))
+    assert client.connection_stats()[server.url]['connections'] == 4
+
+
+def test_warm_up_stays_within_a_blocking_pool(server):
+    client = ASpaceClient(
+        server.url, 'admin', 'admin', pool_maxsize=2, pool_block=True)
+
+    assert client.warm_up(4) == 2
+    assert client.connection_stats()[server.url]['connections'] == 2
+
+
+def test_warm_up_stays_within_the_concurrency_limit(server):
+    client = ASpaceClient(
+        server.url, 'admin', 'admin',
+        concurrency_limiter=limiters.AdaptiveConcurrencyLimiter(
+            initial_limit=3, max_limit=3),
+    )
+
+    assert client.warm_up(8) == 3
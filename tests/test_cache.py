@@ -0,0 +1,110 @@
+import threading
+import time
+
+from aspace.cache import ResponseCache
+from aspace.client import ASpaceClient
+
+
+def test_stream_reads_unmodified_records_from_cache(dataset, server,
+                                                    tmp_path):
+
+    # Backdates the data set, so that modified_since listings only report
+    # the records that have been touched.
+    dataset.created_at = time.time() - 3600
+
+    client = ASpaceClient(
+        server.url, 'admin', 'admin',
+        cache=ResponseCache(str(tmp_path)),
+    )
+
+    assert len(list(client.streams.records('subjects'))) == 25
+    assert client.cache_stats()['stores'] == 25
+
+    dataset.touch('/subjects/3')
+    server.reset_stats()
+
+    uris = [record['uri'] for record in client.streams.records('subjects')]
+
+    assert uris == ['/subjects/%d' % rec_id for rec_id in range(1, 26)]
+    assert client.cache_stats()['hits'] >= 24
+    assert server.stats()['requests']['GET /subjects/:id'] == 1
+
+
+def test_cache_is_scoped_by_user(server, tmp_path):
+    first = ASpaceClient(
+        server.url, 'admin', 'admin',
+        cache=ResponseCache(str(tmp_path)),
+    )
+    list(first.streams.records('subjects'))
+
+    second = ASpaceClient(
+        server.url, 'admin', 'admin',
+        cache=ResponseCache(str(tmp_path)),
+    )
+    second.aspace_username = 'someone_else'
+
+    assert second.cache.get_sync_time(
+        '/subjects', scope=second.cache_scope) is None
+    assert second.cache.get(
+        '/subjects/1', scope=second.cache_scope) is None
+    assert first.cache.get(
+        '/subjects/1', scope=first.cache_scope) is not None
+
+
+def test_sync_times_of_different_lists_are_kept(tmp_path):
+
+    # Separate instances stand in for processes sharing the directory.
+    caches = [ResponseCache(str(tmp_path)) for _ in range(8)]
+
+    def record(index):
+        for repeat in range(20):
+            caches[index].set_sync_time(
+                '/list/%d' % index, index + repeat, scope='a')
+
+    threads = [
+        threading.Thread(target=record, args=(index,))
+        for index in range(len(caches))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    cache = ResponseCache(str(tmp_path))
+    assert [
+        cache.get_sync_time('/list/%d' % index, scope='a')
+        for index in range(len(caches))
+    ] == [index + 19 for index in range(len(caches))]
+    assert cache.get_sync_time('/list/0', scope='b') is None
+
+    cache.clear()
+    assert cache.get_sync_time('/list/0', scope='a') is None
+
+
+def test_size_is_read_from_disk_when_first_needed(tmp_path):
+    first = ResponseCache(str(tmp_path), max_bytes=10000)
+    for rec_id in range(5):
+        first.put('/subjects/%d' % rec_id, b'x' * 1000)
+
+    second = ResponseCache(str(tmp_path), max_bytes=10000)
+    assert second._index is None
+
+    assert second.get('/subjects/0')['body'] == b'x' * 1000
+    assert second._index is None
+
+    stats = second.stats()
+    assert stats['entries'] == 5
+    assert 5000 < stats['bytes'] < 10000
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=3500)
+    for rec_id in range(3):
+        cache.put('/subjects/%d' % rec_id, b'x' * 1000)
+
+    cache.get('/subjects/0')
+    cache.put('/subjects/3', b'x' * 1000)
+
+    assert cache.get('/subjects/1') is None
+    assert cache.get('/subjects/0') is not None
+    assert cache.stats()['evictions'] == 1
@@ -0,0 +1,65 @@
+from aspace.client import ASpaceClient
+from aspace.client_extensions import record_streams
+from aspace.limiters import AdaptiveConcurrencyLimiter, RateLimiter
+
+
+def _uri(record: dict) -> str:
+    # Defined at the top level, so that spawned workers can unpickle it.
+    return record['uri']
+
+
+def test_harvest_streams_every_record_without_logging_in(server, client):
+    server.reset_stats()
+
+    uris = list(client.streams.harvest_records(
+        'subjects', transform=_uri, processes=2, batch_size=4, chunk_size=5))
+
+    assert uris == ['/subjects/%d' % rec_id for rec_id in range(1, 26)]
+    assert server.stats()['logins'] == 0
+
+
+def test_workers_are_not_given_the_password(client):
+    settings = client.streams._harvest_settings(4, concurrency=2)
+
+    assert settings['password'] is None
+    assert settings['session'] == client.headers['X-ArchivesSpace-Session']
+
+
+def test_limiters_are_shared_between_workers():
+    assert RateLimiter(
+        rate=10, burst=4, endpoint_rates={r'/search': (2, 1)},
+    ).share(4) == {
+        'rate': 2.5,
+        'burst': 1,
+        'endpoint_rates': {r'/search': (0.5, 1)},
+    }
+    assert RateLimiter(endpoint_rates={r'/search': 8}).share(2)['rate'] is None
+
+    share = AdaptiveConcurrencyLimiter(
+        initial_limit=8, min_limit=2, max_limit=64).share(4)
+
+    assert (share['initial_limit'], share['min_limit'],
+            share['max_limit']) == (2, 1, 16)
+
+
+def test_worker_clients_get_their_share_of_the_limits(server, monkeypatch):
+    client = ASpaceClient(
+        server.url, 'admin', 'admin',
+        rate_limiter=RateLimiter(rate=20),
+        concurrency_limiter=AdaptiveConcurrencyLimiter(max_limit=32),
+    )
+    monkeypatch.setattr(record_streams, '_harvest_client', None)
+
+    record_streams._start_harvest_worker(
+        client.streams._harvest_settings(4, concurrency=1))
+    worker = record_streams._harvest_client
+
+    try:
+        assert worker.rate_limiter.stats()['global']['rate'] == 5
+        assert worker.concurrency_limiter.max_limit == 8
+        assert worker.aspace_password is None
+        assert worker.get('/subjects/1').status_code == 200
+        assert server.stats()['logins'] == 1
+    finally:
+        worker.close()
+        client.close()
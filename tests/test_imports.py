@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+import aspace
+
+
+def _imported_modules(code: str) -> set:
+    output = subprocess.run(
+        [sys.executable, '-c',
+         code + '\nimport json, sys; print(json.dumps(list(sys.modules)))'],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+
+    return set(json.loads(output.decode('utf-8')))
+
+
+def test_client_does_not_import_optional_components():
+    modules = _imported_modules('import aspace.client')
+
+    assert 'aspace.base_client' in modules
+    assert not modules & {
+        'asyncio',
+        'httpx',
+        'multiprocessing',
+        'subprocess',
+        'aspace.cache',
+        'aspace.limiters',
+        'aspace.retry',
+        'aspace.routing',
+        'aspace.session_store',
+        'aspace.transports',
+    }
+
+
+def test_version_is_read_without_git(monkeypatch):
+    from importlib import metadata
+
+    # Forgets the version, if it has been read, until the test finishes.
+    monkeypatch.setitem(aspace.__dict__, '__version__', None)
+    monkeypatch.delitem(aspace.__dict__, '__version__')
+    monkeypatch.setattr(metadata, 'version', lambda name: '9.8.7')
+    monkeypatch.setattr(subprocess, 'Popen', None)
+
+    assert aspace.__version__ == '9.8.7'
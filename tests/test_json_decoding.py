@@ -0,0 +1,102 @@
+import json
+
+import pytest
+import requests
+
+from aspace import json_decoding
+from aspace.client import ASpaceClient
+from aspace.testing.server import Dataset, StandInServer
+
+
+def _chunks(text: str, size: int) -> list:
+    data = text.encode('utf-8')
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+VALID_ARRAYS = [
+    '[]',
+    ' [ ] ',
+    '[1, 2 ,3]\n',
+    '[3.5, -2e-3, 12345678901, true, false, null]',
+    '[{"a": [1, 2, "x,]"]}, "b,c", [[]], {}]',
+    '["\\u00e9, \\"quoted\\"", "café"]',
+]
+
+
+@pytest.mark.parametrize('text', VALID_ARRAYS)
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1024])
+def test_iter_json_array_matches_json_loads(text, chunk_size):
+    assert list(json_decoding.iter_json_array(
+        _chunks(text, chunk_size))) == json.loads(text)
+
+
+@pytest.mark.parametrize('text', [
+    '[1,,2 , 3]',
+    '[1 2]',
+    '[,1]',
+    '[1,]',
+    '[1, 2 3, 4]',
+    '[1',
+    '[1.]',
+    '[tru]',
+    '[1] x',
+    '{"a": 1}',
+    '',
+])
+@pytest.mark.parametrize('chunk_size', [1, 3, 1024])
+def test_iter_json_array_rejects_malformed_json(text, chunk_size):
+    with pytest.raises(ValueError):
+        list(json_decoding.iter_json_array(_chunks(text, chunk_size)))
+
+
+def test_iter_json_array_yields_before_the_end():
+    chunks = iter([b'[1, 2, ', b'3, '])
+    values = json_decoding.iter_json_array(chunks)
+
+    assert [next(values), next(values)] == [1, 2]
+
+
+def test_iter_json_array_uses_json_loads():
+    calls = []
+
+    def json_loads(data):
+        calls.append(data)
+        return json.loads(data)
+
+    values = list(json_decoding.iter_json_array(
+        _chunks(json.dumps(list(range(1000))), 256),
+        json_loads=json_loads,
+    ))
+
+    assert values == list(range(1000))
+    assert calls
+
+
+def test_invalid_json_raises_requests_error():
+    resp = json_decoding.JSONResponse()
+    resp._content = b'<html>Bad gateway</html>'
+    resp.encoding = 'utf-8'
+
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        resp.json()
+
+
+@pytest.mark.parametrize('records_per_type', [50, 200000])
+def test_all_ids_are_decoded_with_the_clients_json_loads(records_per_type):
+    calls = []
+
+    def json_loads(data):
+        calls.append(len(data))
+        return json_decoding.loads(data)
+
+    with StandInServer(Dataset(
+            repositories=1, records_per_type=records_per_type)) as server:
+        client = ASpaceClient(
+            server.url, 'admin', 'admin', json_loads=json_loads)
+        calls.clear()
+
+        uris = list(client.streams.uris('subjects'))
+
+    assert len(uris) == records_per_type
+    assert uris[-1] == '/subjects/%d' % records_per_type
+    assert calls
@@ -0,0 +1,154 @@
+import threading
+import time
+
+from aspace import limiters
+from aspace.client import ASpaceClient
+from aspace.testing.server import FaultProfile, StandInServer
+
+
+def test_limit_grows_while_requests_are_healthy():
+    limiter = limiters.AdaptiveConcurrencyLimiter(
+        initial_limit=2, max_limit=4)
+
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(0.01)
+
+    assert limiter.limit == 4
+    assert limiter.stats()['decreases'] == 0
+
+
+def test_limit_is_cut_by_failures():
+    limiter = limiters.AdaptiveConcurrencyLimiter(
+        initial_limit=8, min_limit=2, backoff_ratio=0.5)
+
+    limiter.acquire()
+    limiter.release(0.0, failed=True)
+
+    assert limiter.limit == 4
+    assert limiter.stats()['decreases'] == 1
+
+
+def test_limit_is_cut_by_slow_requests():
+    limiter = limiters.AdaptiveConcurrencyLimiter(
+        initial_limit=8, latency_tolerance=2, backoff_ratio=0.5)
+
+    for latency in (0.01, 0.01, 0.05):
+        limiter.acquire()
+        limiter.release(latency, endpoint='GET /subjects?id_set')
+
+    assert limiter.limit == 4
+
+
+def test_baselines_are_kept_per_endpoint():
+    limiter = limiters.AdaptiveConcurrencyLimiter(
+        initial_limit=8, latency_tolerance=2)
+
+    # A cheap listing does not make a slower kind of request look slow.
+    for endpoint, latency in (
+            ('GET /subjects?all_ids', 0.001),
+            ('GET /subjects?id_set', 0.05),
+            ('GET /subjects?id_set', 0.06)):
+        limiter.acquire()
+        limiter.release(latency, endpoint=endpoint)
+
+    stats = limiter.stats()
+    assert stats['decreases'] == 0
+    assert stats['baseline_latencies'] == {
+        'GET /subjects?all_ids': 0.001,
+        'GET /subjects?id_set': 0.05,
+    }
+
+
+def test_unsampled_latencies_are_ignored():
+    limiter = limiters.AdaptiveConcurrencyLimiter(
+        initial_limit=8, latency_tolerance=2)
+
+    limiter.acquire()
+    limiter.release(0.001, sample_latency=False)
+    limiter.acquire()
+    limiter.release(0.05)
+
+    assert limiter.stats()['decreases'] == 0
+    assert limiter.stats()['baseline_latencies'] == {'': 0.05}
+
+
+def test_acquire_waits_for_a_slot():
+    limiter = limiters.AdaptiveConcurrencyLimiter(
+        initial_limit=1, max_limit=1)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        limiter.acquire()
+        acquired.set()
+
+    threading.Thread(target=acquire, daemon=True).start()
+
+    assert not acquired.wait(0.05)
+    limiter.release(0.01)
+    assert acquired.wait(1)
+
+
+def test_client_keeps_requests_within_the_limit(dataset):
+    limiter = limiters.AdaptiveConcurrencyLimiter(
+        initial_limit=2, max_limit=2)
+
+    with StandInServer(dataset, FaultProfile(latency=0.01)) as server:
+        client = ASpaceClient(
+            server.url, 'admin', 'admin', concurrency_limiter=limiter)
+        records = list(client.streams.records(
+            'subjects', batch_size=1, concurrency=6))
+
+    assert len(records) == 25
+    assert server.stats()['max_in_flight'] <= 2
+    assert set(limiter.stats()['baseline_latencies']) == {
+        'GET /subjects?all_ids',
+        'GET /subjects/:id',
+    }
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    bucket = limiters.TokenBucket(rate=50, burst=5)
+    start = time.monotonic()
+
+    waits = [bucket.acquire() for _ in range(15)]
+
+    assert waits[:5] == [0.0] * 5
+    assert all(wait > 0 for wait in waits[5:])
+
+    # The 10 requests after the burst take at least 10 / 50 seconds.
+    assert time.monotonic() - start >= 0.18
+    assert bucket.stats()['waited'] > 0
+
+
+def test_rate_limiter_applies_the_first_matching_endpoint_rate():
+    limiter = limiters.RateLimiter(
+        endpoint_rates={r'/search': (1, 1), r'/': 1000})
+
+    assert limiter.acquire('/search') == 0
+    assert limiter.acquire('/subjects/1') == 0
+    assert limiter.stats()['global'] is None
+
+    start = time.monotonic()
+    limiter.acquire('/repositories/2/search')
+    assert time.monotonic() - start >= 0.9
+
+
+def test_client_stays_under_the_rate_ceiling(server):
+    client = ASpaceClient(
+        server.url, 'admin', 'admin',
+        rate_limiter=limiters.RateLimiter(rate=40, burst=1),
+    )
+    server.reset_stats()
+    start = time.monotonic()
+
+    records = list(client.streams.records(
+        'subjects', batch_size=1, concurrency=8))
+
+    seconds = time.monotonic() - start
+    requests = sum(server.stats()['requests'].values())
+
+    assert len(records) == 25
+    assert requests == 26
+    assert requests / seconds <= 40 * 1.1
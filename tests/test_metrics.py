@@ -0,0 +1,142 @@
+import gzip
+import http.server
+import json
+import threading
+
+import pytest
+
+from aspace import util
+from aspace.client import ASpaceClient
+from aspace.metrics import RequestMetrics
+
+
+class _GzipHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves a compressible JSON body, gzipped if the request accepts it.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    body = json.dumps([{'title': 'Record %d' % n} for n in range(500)])
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        data = self.body.encode('utf-8')
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            data = gzip.compress(data)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def gzip_url():
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _GzipHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield 'http://127.0.0.1:%d' % httpd.server_address[1]
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize('transport', ['requests', 'httpx'])
+def test_compressed_bodies_are_measured(gzip_url, transport):
+    if transport == 'httpx':
+        pytest.importorskip('httpx')
+
+    client = ASpaceClient(gzip_url, auto_auth=False, transport=transport)
+
+    assert len(client.get('/records').json()) == 500
+
+    stats = client.bandwidth_stats()['endpoints']['/records']
+    assert stats['responses'] == 1
+    assert stats['encodings'] == {'gzip': 1}
+    assert stats['decoded_bytes'] == len(_GzipHandler.body)
+    assert stats['wire_bytes'] < stats['decoded_bytes'] / 5
+    assert stats['compression_ratio'] > 5
+
+
+def test_every_compression_format_is_offered(client):
+    assert 'gzip' in client.headers['Accept-Encoding']
+
+
+def test_streamed_bodies_are_measured_once_closed(server, client):
+    client.bandwidth_meter.reset()
+
+    with client.get('/subjects/1', stream=True) as resp:
+        assert client.bandwidth_stats()['total']['responses'] == 0
+        body = resp.content
+
+    stats = client.bandwidth_stats()['endpoints']['/subjects/:id']
+    assert stats['responses'] == 1
+    assert stats['decoded_bytes'] == stats['wire_bytes'] == len(body)
+
+
+@pytest.mark.parametrize('uri, template', [
+    ('/repositories/2/archival_objects/15?resolve[]=x',
+     '/repositories/:id/archival_objects/:id'),
+    ('/users/admin/login', '/users/:username/login'),
+    ('/users/current-user', '/users/current-user'),
+    ('/', '/'),
+])
+def test_endpoint_template(uri, template):
+    assert util.endpoint_template(uri) == template
+
+
+def test_request_metrics_snapshot():
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    metrics.record('GET', '/subjects/:id', 200, 0.05)
+    metrics.record('GET', '/subjects/:id', 200, 0.5)
+    metrics.record('GET', '/subjects/:id', None, 2.0)
+    metrics.record_reauthentication('/subjects/:id')
+
+    snapshot = metrics.snapshot()
+    stats = snapshot['endpoints']['/subjects/:id']
+
+    assert snapshot['total'] == {
+        'requests': 3, 'errors': 1, 'reauthentications': 1}
+    assert stats['status_codes'] == {200: 2, 'error': 1}
+    assert stats['latency']['buckets'] == [
+        (0.1, 1), (1.0, 2), (float('inf'), 3)]
+    assert stats['latency']['p50'] == pytest.approx(0.55)
+    assert stats['latency']['mean'] == pytest.approx(2.55 / 3)
+
+
+def test_prometheus_text():
+    metrics = RequestMetrics(buckets=(0.1,))
+    metrics.record('POST', '/users/:username/login', 200, 0.05)
+
+    lines = metrics.prometheus_text('aspace').splitlines()
+
+    assert (
+        'aspace_requests_total{endpoint="/users/:username/login",'
+        'method="POST",code="200"} 1'
+    ) in lines
+    assert (
+        'aspace_request_duration_seconds_bucket{'
+        'endpoint="/users/:username/login",le="+Inf"} 1'
+    ) in lines
+
+
+def test_client_metrics_do_not_keep_usernames(server):
+    client = ASpaceClient(server.url, 'admin', 'admin')
+    client.get('/subjects/1')
+    server.expire_sessions()
+    client.get('/subjects/2')
+    client.close()
+
+    endpoints = client.metrics_snapshot()['endpoints']
+
+    assert sorted(endpoints) == ['/subjects/:id', '/users/:username/login']
+    assert endpoints['/users/:username/login']['requests'] == 2
+    assert endpoints['/subjects/:id']['requests'] == 3
+    assert endpoints['/subjects/:id']['reauthentications'] == 1
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from aspace.client_extensions.record_streams import ReadAhead
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'Timed out'
+        time.sleep(0.01)
+
+
+def test_records_are_read_ahead_in_order(client):
+    with ReadAhead(client.streams.records('subjects', batch_size=10),
+                   max_records=5) as read_ahead:
+        uris = [record['uri'] for record in read_ahead]
+
+    assert uris == ['/subjects/%d' % rec_id for rec_id in range(1, 26)]
+
+    stats = read_ahead.stats()
+    assert stats['produced'] == stats['consumed'] == 25
+    assert stats['peak'] <= 5
+    assert stats['done']
+
+
+def test_the_buffer_stops_at_max_records():
+    read_ahead = ReadAhead(iter(range(100)), max_records=10)
+
+    try:
+        _wait_for(lambda: read_ahead.stats()['producer_waits'])
+        assert read_ahead.stats()['buffered'] == 10
+        assert next(read_ahead) == 0
+    finally:
+        read_ahead.close()
+
+
+def test_the_buffer_stops_at_max_bytes():
+    records = [{'id': rec_id} for rec_id in range(100)]
+    read_ahead = ReadAhead(
+        records, max_records=100, max_bytes=30, size=lambda record: 10)
+
+    try:
+        _wait_for(lambda: read_ahead.stats()['producer_waits'])
+        assert read_ahead.stats()['buffered'] == 3
+        assert read_ahead.stats()['buffered_bytes'] == 30
+        assert list(read_ahead) == records
+    finally:
+        read_ahead.close()
+
+
+def test_errors_are_raised_after_the_records_before_them():
+    def stream():
+        yield 1
+        yield 2
+        raise ValueError('Stream failed')
+
+    with ReadAhead(stream()) as read_ahead:
+        assert next(read_ahead) == 1
+        assert next(read_ahead) == 2
+
+        with pytest.raises(ValueError, match='Stream failed'):
+            next(read_ahead)
+
+
+def test_close_closes_the_stream():
+    closed = threading.Event()
+
+    def stream():
+        try:
+            for item in range(100):
+                yield item
+        finally:
+            closed.set()
+
+    read_ahead = ReadAhead(stream(), max_records=2)
+    assert next(read_ahead) == 0
+    read_ahead.close()
+
+    assert closed.wait(5)
@@ -0,0 +1,164 @@
+import pytest
+import requests
+
+from aspace.client import ASpaceClient
+from aspace.testing.server import Dataset, FaultProfile, StandInServer
+
+
+def _uris(list_uri: str, count: int) -> list:
+    return ['%s/%d' % (list_uri, rec_id) for rec_id in range(1, count + 1)]
+
+
+def test_records_are_downloaded_in_id_set_batches(server, client):
+    server.reset_stats()
+
+    uris = [
+        record['uri']
+        for record in client.streams.records('subjects', batch_size=10)
+    ]
+
+    assert uris == _uris('/subjects', 25)
+    assert server.stats()['requests'] == {'GET /subjects': 4}
+
+
+@pytest.mark.parametrize('batch_size', [1, 10])
+def test_records_deleted_during_the_stream_are_skipped(dataset, client,
+                                                       batch_size):
+    stream = client.streams.records('subjects', batch_size=batch_size)
+    first = next(stream)
+
+    # The IDs have already been listed, so the last 5 are requested after
+    # they have gone.
+    dataset.counts['subjects'] = 20
+
+    uris = [first['uri']] + [record['uri'] for record in stream]
+
+    assert uris == _uris('/subjects', 20)
+
+
+def test_failed_batches_raise(server, client):
+    stream = client.streams.records('subjects', batch_size=10)
+    next(stream)
+    server.fail_next(1, status=500)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        list(stream)
+
+
+def test_concurrent_stream_keeps_the_order_of_the_ids(client):
+    uris = [
+        record['uri']
+        for record in client.streams.records(
+            'subjects', batch_size=4, concurrency=4)
+    ]
+
+    assert uris == _uris('/subjects', 25)
+
+
+def test_unordered_stream_streams_every_record(client):
+    uris = [
+        record['uri']
+        for record in client.streams.records(
+            'subjects', batch_size=4, concurrency=4, ordered=False)
+    ]
+
+    assert sorted(uris) == sorted(_uris('/subjects', 25))
+
+
+def test_concurrent_stream_limits_requests_in_flight(dataset):
+    faults = FaultProfile(latency=0.02)
+
+    with StandInServer(dataset, faults) as server:
+        client = ASpaceClient(server.url, 'admin', 'admin')
+        records = list(client.streams.records(
+            'subjects', batch_size=1, concurrency=3))
+
+    assert len(records) == 25
+    assert server.stats()['max_in_flight'] == 3
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+def test_paged_stream_requests_each_page_once(server, client, prefetch):
+    server.reset_stats()
+
+    uris = [
+        record['uri']
+        for record in client.streams.records(
+            'subjects', paged=True, page_size=7, prefetch=prefetch)
+    ]
+
+    assert uris == _uris('/subjects', 25)
+    assert server.stats()['requests'] == {'GET /subjects': 4}
+
+
+def test_paged_stream_skips_to_the_offset(server, client):
+    server.reset_stats()
+
+    records = client.streams._iter_pages('subjects', page_size=5, offset=12)
+
+    assert [record['uri'] for record in records] == (
+        _uris('/subjects', 25)[12:])
+    assert server.stats()['requests'] == {'GET /subjects': 3}
+
+
+def test_paged_stream_of_repository_records(client):
+    uris = [
+        record['uri']
+        for record in client.streams.repository_relative_records(
+            'accessions', paged=True, page_size=10)
+    ]
+
+    assert uris == (
+        _uris('/repositories/2/accessions', 25)
+        + _uris('/repositories/3/accessions', 25)
+    )
+
+
+def test_failed_pages_raise(server, client):
+    server.fail_next(2, status=500)
+
+    with pytest.raises(requests.HTTPError):
+        list(client.streams.records('subjects', paged=True, page_size=10))
+
+
+def _accession_uris() -> list:
+    return [
+        uri
+        for repo_id in (2, 3)
+        for uri in _uris('/repositories/%d/accessions' % repo_id, 25)
+    ]
+
+
+def test_repository_relative_stream(client):
+    uris = [
+        record['uri']
+        for record in client.streams.repository_relative_records(
+            'accessions', concurrency=2, repository_concurrency=2)
+    ]
+
+    assert uris == _accession_uris()
+
+
+def test_interleaved_stream_takes_turns_between_repositories(client):
+    uris = [
+        record['uri']
+        for record in client.streams.repository_relative_records(
+            'accessions', batch_size=5, concurrency=2,
+            repository_concurrency=2, interleaved=True)
+    ]
+
+    assert sorted(uris) == sorted(_accession_uris())
+    assert [uri.split('/')[2] for uri in uris[:20:5]] == ['2', '3', '2', '3']
+
+
+def test_repositories_are_listed_concurrently():
+    dataset = Dataset(repositories=4, records_per_type=2)
+    faults = FaultProfile(latency=0.05)
+
+    with StandInServer(dataset, faults) as server:
+        client = ASpaceClient(server.url, 'admin', 'admin')
+        records = list(client.streams.repository_relative_records(
+            'accessions', repository_concurrency=4))
+
+    assert len(records) == 8
+    assert server.stats()['max_in_flight'] == 4
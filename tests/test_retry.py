@@ -0,0 +1,71 @@
+from aspace import retry
+from aspace.client import ASpaceClient
+
+
+def _client(server, **kwargs) -> ASpaceClient:
+    kwargs.setdefault('max_attempts', 3)
+    kwargs.setdefault('backoff_factor', 0)
+
+    return ASpaceClient(
+        server.url, 'admin', 'admin',
+        retry_policy=retry.RetryPolicy(**kwargs),
+    )
+
+
+def test_retries_503(server):
+    client = _client(server)
+    server.fail_next(2, status=503)
+
+    resp = client.get('/subjects/1')
+
+    assert resp.status_code == 200
+    assert resp.json()['uri'] == '/subjects/1'
+    assert server.stats()['requests']['GET /subjects/:id'] == 3
+    assert client.retry_stats()['retries_by_reason'] == {'503': 2}
+
+
+def test_503_is_returned_without_retry_policy(server, client):
+    server.fail_next(1, status=503)
+
+    assert client.get('/subjects/1').status_code == 503
+
+
+def test_gives_up_after_max_attempts(server):
+    client = _client(server)
+    server.fail_next(5, status=503)
+
+    assert client.get('/subjects/1').status_code == 503
+    assert server.stats()['requests']['GET /subjects/:id'] == 3
+
+
+def test_post_is_not_retried(server):
+    client = _client(server)
+    server.fail_next(1, status=503)
+
+    assert client.post('/subjects/1', json={}).status_code == 503
+    assert client.retry_stats()['retries'] == 0
+
+
+def test_retry_budget_is_exhausted(server):
+    client = _client(server, budget_ratio=0, budget_min_retries=2)
+
+    server.fail_next(10, status=503)
+    statuses = [client.get('/subjects/1').status_code for _ in range(3)]
+
+    stats = client.retry_stats()
+    assert stats['retries'] == 2
+    assert stats['budget_exhausted'] == 2
+    assert server.stats()['requests']['GET /subjects/:id'] == 5
+    assert statuses == [503, 503, 503]
+
+
+def test_budget_refills_with_requests():
+    policy = retry.RetryPolicy(budget_ratio=0.5, budget_min_retries=1)
+
+    assert policy.acquire_retry('503')
+    assert not policy.acquire_retry('503')
+
+    policy.record_request()
+    policy.record_request()
+
+    assert policy.acquire_retry('503')
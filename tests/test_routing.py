@@ -0,0 +1,109 @@
+import socket
+
+from aspace import constants
+from aspace.client import ASpaceClient
+from aspace.retry import RetryPolicy
+from aspace.routing import BackendRouter
+
+
+def _unused_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return 'http://127.0.0.1:%d/' % sock.getsockname()[1]
+
+
+def test_round_robin_spreads_reads():
+    router = BackendRouter(
+        ['http://a', 'http://b/', 'http://c'],
+        strategy=constants.ROUTING_ROUND_ROBIN,
+    )
+
+    hosts = [router.choose('GET') for _ in range(6)]
+
+    assert sorted(hosts) == sorted(router.hosts * 2)
+    assert router.hosts == ['http://a/', 'http://b/', 'http://c/']
+
+
+def test_least_outstanding_avoids_busy_nodes():
+    router = BackendRouter(['http://a', 'http://b'])
+
+    # Chooses hosts while a request to http://a/ is in flight.
+    chosen = router.call(
+        'http://a/', lambda: [router.choose('GET') for _ in range(4)])
+
+    assert chosen == ['http://b/'] * 4
+    assert router.stats()['http://a/']['outstanding'] == 0
+
+
+def test_writes_are_pinned_to_the_primary():
+    router = BackendRouter(
+        ['http://a', 'http://b'],
+        strategy=constants.ROUTING_ROUND_ROBIN,
+        pin_writes=True,
+    )
+
+    assert {router.choose('POST') for _ in range(4)} == {'http://a/'}
+    assert {router.choose('GET') for _ in range(4)} == set(router.hosts)
+
+
+class _Response(object):
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def test_failing_node_is_ejected_and_probed_back():
+    router = BackendRouter(
+        ['http://a', 'http://b'],
+        strategy=constants.ROUTING_ROUND_ROBIN,
+        max_failures=2,
+        probe_interval=60,
+    )
+    ready = {'http://a/': True, 'http://b/': False}
+    router.probe = lambda host, timeout: ready[host]
+
+    router.call('http://b/', _Response, 503)
+    assert router.stats()['http://b/']['healthy']
+
+    router.call('http://b/', _Response, 502)
+    assert not router.stats()['http://b/']['healthy']
+    assert {router.choose('GET') for _ in range(4)} == {'http://a/'}
+
+    assert router.probe_all() == ['http://a/']
+
+    ready['http://b/'] = True
+    assert router.probe_all() == ['http://a/', 'http://b/']
+    assert router.stats()['http://b/'] == {
+        'healthy': True,
+        'outstanding': 0,
+        'requests': 2,
+        'failures': 2,
+        'ejections': 1,
+    }
+
+
+def test_client_fails_over_to_healthy_node(server):
+    router = BackendRouter(
+        [server.url, _unused_url()],
+        strategy=constants.ROUTING_ROUND_ROBIN,
+        pin_writes=True,
+        max_failures=1,
+        probe_interval=60,
+    )
+    client = ASpaceClient(
+        server.url, 'admin', 'admin',
+        router=router,
+        retry_policy=RetryPolicy(max_attempts=3, backoff_factor=0),
+    )
+
+    try:
+        assert all(
+            client.get('/subjects/%d' % rec_id).status_code == 200
+            for rec_id in range(1, 11)
+        )
+    finally:
+        client.close()
+
+    stats = client.backend_stats()
+    assert stats[router.primary]['healthy']
+    assert not stats[router.hosts[1]]['healthy']
+    assert stats[router.hosts[1]]['ejections'] == 1
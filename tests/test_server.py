@@ -0,0 +1,83 @@
+import requests
+
+from aspace.testing.server import Dataset, FaultProfile, StandInServer
+
+
+def _login(server) -> dict:
+    resp = requests.post(
+        server.url + '/users/admin/login', params={'password': 'admin'})
+    assert resp.status_code == 200
+    return {'X-ArchivesSpace-Session': resp.json()['session']}
+
+
+def test_requests_need_a_session(server):
+    assert requests.get(server.url + '/subjects/1').status_code == 412
+
+    resp = requests.get(server.url + '/subjects/1', headers=_login(server))
+
+    assert resp.status_code == 200
+    assert resp.json()['uri'] == '/subjects/1'
+
+
+def test_login_rejects_wrong_password(server):
+    resp = requests.post(
+        server.url + '/users/admin/login', params={'password': 'wrong'})
+
+    assert resp.status_code == 403
+    assert server.stats()['logins'] == 0
+
+
+def test_list_endpoints(server):
+    headers = _login(server)
+
+    all_ids = requests.get(
+        server.url + '/repositories/2/accessions',
+        params={'all_ids': 'true'}, headers=headers).json()
+    id_set = requests.get(
+        server.url + '/repositories/2/accessions',
+        params={'id_set': '3,1,999'}, headers=headers).json()
+    page = requests.get(
+        server.url + '/repositories/2/accessions',
+        params={'page': 2, 'page_size': 10}, headers=headers).json()
+
+    assert all_ids == list(range(1, 26))
+    assert [record['uri'] for record in id_set] == [
+        '/repositories/2/accessions/3', '/repositories/2/accessions/1']
+    assert (page['this_page'], page['last_page'], page['total_hits']) == (
+        2, 3, 25)
+    assert len(page['results']) == 10
+
+
+def test_fail_next_and_expire_sessions(server):
+    headers = _login(server)
+    server.fail_next(2, status=503)
+
+    statuses = [
+        requests.get(server.url + '/subjects/1', headers=headers).status_code
+        for _ in range(3)
+    ]
+    server.expire_sessions()
+
+    assert statuses == [503, 503, 200]
+    assert requests.get(
+        server.url + '/subjects/1', headers=headers).status_code == 412
+    assert server.stats()['requests']['GET /subjects/:id'] == 4
+
+
+def test_error_rate_is_repeatable():
+
+    def statuses():
+        faults = FaultProfile(error_rate=0.5, error_status=500, seed=1)
+
+        with StandInServer(Dataset(records_per_type=5), faults) as server:
+            headers = _login(server)
+            return [
+                requests.get(
+                    server.url + '/subjects/1', headers=headers).status_code
+                for _ in range(20)
+            ]
+
+    first = statuses()
+
+    assert set(first) == {200, 500}
+    assert first == statuses()
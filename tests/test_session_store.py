@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from aspace.client import ASpaceClient
+from aspace.session_store import FileSessionStore
+
+
+def test_tokens_are_shared_between_store_instances(tmp_path):
+    path = str(tmp_path / 'sessions.json')
+    FileSessionStore(path).save('http://a/', 'admin', 'token')
+
+    store = FileSessionStore(path)
+    assert store.load('http://a', 'admin') == 'token'
+    assert store.load('http://b', 'admin') is None
+    assert store.load('http://a', 'someone_else') is None
+
+    # A token that has since been replaced is kept.
+    store.discard('http://a', 'admin', 'older_token')
+    assert store.load('http://a', 'admin') == 'token'
+
+    store.discard('http://a', 'admin', 'token')
+    assert FileSessionStore(path).load('http://a', 'admin') is None
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='POSIX permissions')
+def test_store_is_private(tmp_path):
+    store = FileSessionStore(str(tmp_path / 'sessions.json'))
+    store.save('http://a', 'admin', 'token')
+
+    assert os.stat(store.path).st_mode & 0o077 == 0
+
+
+def test_clients_share_a_login(server, tmp_path):
+    store = FileSessionStore(str(tmp_path / 'sessions.json'))
+
+    clients = [
+        ASpaceClient(server.url, 'admin', 'admin', session_store=store)
+        for _ in range(3)
+    ]
+
+    assert server.stats()['logins'] == 1
+    assert all(
+        client.get('/subjects/1').status_code == 200 for client in clients)
+    assert len({
+        client.headers['X-ArchivesSpace-Session'] for client in clients
+    }) == 1
+
+
+def test_expired_stored_token_is_replaced(server, tmp_path):
+    store = FileSessionStore(str(tmp_path / 'sessions.json'))
+    client = ASpaceClient(server.url, 'admin', 'admin', session_store=store)
+    stale_session = client.headers['X-ArchivesSpace-Session']
+
+    server.expire_sessions()
+
+    assert client.get('/subjects/1').status_code == 200
+    assert store.load(client.aspace_api_host, 'admin') not in (
+        None, stale_session)
+
+
+def test_token_is_discarded_when_login_fails(server, tmp_path):
+    store = FileSessionStore(str(tmp_path / 'sessions.json'))
+    client = ASpaceClient(
+        server.url, 'admin', 'wrong', auto_auth=False, session_store=store)
+
+    store.save(client.aspace_api_host, 'admin', 'bogus')
+
+    # The stored token is tried after the first 412, then the login fails.
+    with pytest.raises(AssertionError):
+        client.get('/subjects/1')
+
+    assert store.load(client.aspace_api_host, 'admin') is None
@@ -0,0 +1,201 @@
+import datetime
+import itertools
+import time
+
+import pytest
+
+from aspace.client import ASpaceClient
+from aspace.client_extensions.record_streams import ReadAhead
+from aspace.sync_state import HighWaterMarks, StreamCheckpoint
+from aspace.tracing import Tracer
+
+
+def _accession_uris() -> list:
+    return [
+        '/repositories/%d/accessions/%d' % (repo_id, rec_id)
+        for repo_id in (2, 3)
+        for rec_id in range(1, 26)
+    ]
+
+
+@pytest.fixture
+def touched(dataset):
+    """
+    Backdates the data set, then touches 2 subjects and 1 accession, and
+    returns the time just before they were touched.
+    """
+    dataset.created_at = time.time() - 3600
+    touched_after = time.time() - 1
+
+    for uri in ('/subjects/3', '/subjects/17',
+                '/repositories/2/accessions/5'):
+        dataset.touch(uri)
+
+    return touched_after
+
+
+@pytest.mark.parametrize('paged', [False, True])
+def test_stream_only_records_modified_since(client, touched, paged):
+    uris = [
+        record['uri']
+        for record in client.streams.records(
+            'subjects', modified_since=touched, paged=paged)
+    ]
+
+    assert uris == ['/subjects/3', '/subjects/17']
+
+
+def test_modified_since_accepts_datetimes(client, touched):
+    modified_since = datetime.datetime.fromtimestamp(touched)
+
+    assert [
+        record['uri']
+        for record in client.streams.repository_relative_records(
+            'accessions', modified_since=modified_since)
+    ] == ['/repositories/2/accessions/5']
+
+
+def test_high_water_mark_is_saved_when_a_run_completes(tmp_path):
+    marks = HighWaterMarks(str(tmp_path / 'marks.json'), margin=60)
+
+    with marks.run('subjects') as modified_since:
+        assert modified_since is None
+
+    mark = marks.get('subjects')
+    assert time.time() - 5 < mark <= time.time()
+    assert marks.modified_since('subjects') == mark - 60
+
+    # A run that fails keeps the previous mark.
+    with pytest.raises(RuntimeError):
+        with marks.run('subjects') as modified_since:
+            assert modified_since == mark - 60
+            raise RuntimeError
+
+    reloaded = HighWaterMarks(str(tmp_path / 'marks.json'))
+    assert reloaded.get('subjects') == mark
+    assert reloaded.get('accessions') is None
+
+    reloaded.reset('subjects')
+    assert marks.get('subjects') is None
+
+
+def test_high_water_marks_drive_incremental_streams(client, touched,
+                                                   tmp_path):
+    marks = HighWaterMarks(str(tmp_path / 'marks.json'), margin=0)
+    marks.set('subjects', touched)
+
+    with marks.run('subjects') as modified_since:
+        uris = [
+            record['uri']
+            for record in client.streams.records(
+                'subjects', modified_since=modified_since)
+        ]
+
+    assert uris == ['/subjects/3', '/subjects/17']
+    assert marks.get('subjects') > touched
+
+
+def test_checkpoint_resume_restreams_at_most_1_record(client, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+
+    # Saves after every record, so that the stream can stop at any point.
+    stream = client.streams.repository_relative_records(
+        'accessions',
+        checkpoint=StreamCheckpoint(path, save_every=1),
+    )
+    first = [record['uri'] for record in itertools.islice(stream, 30)]
+
+    # Stands in for a process that was killed, without closing the stream.
+    del stream
+
+    resumed = [
+        record['uri']
+        for record in client.streams.repository_relative_records(
+            'accessions',
+            checkpoint=StreamCheckpoint(path, save_every=1),
+        )
+    ]
+
+    assert len(set(first) & set(resumed)) <= 1
+    assert set(first) | set(resumed) == set(_accession_uris())
+    assert not (tmp_path / 'checkpoint.json').exists()
+
+
+def test_closed_paged_stream_resumes_from_its_page(server, client,
+                                                   tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+
+    # Without prefetching, no page is still being requested once the
+    # stream is closed.
+    stream = client.streams.repository_relative_records(
+        'accessions', paged=True, page_size=10, prefetch=0,
+        checkpoint=StreamCheckpoint(path),
+    )
+    first = [record['uri'] for record in itertools.islice(stream, 32)]
+    stream.close()
+
+    server.reset_stats()
+    checkpoint = StreamCheckpoint(path)
+    resumed = [
+        record['uri']
+        for record in client.streams.repository_relative_records(
+            'accessions', paged=True, page_size=10, checkpoint=checkpoint)
+    ]
+
+    # The 32nd record was being processed when the stream was closed. The
+    # first repository is skipped, and the second resumes from its page 1.
+    assert first + resumed[1:] == _accession_uris()
+    assert resumed[0] == first[-1]
+    assert server.stats()['requests'] == {
+        'GET /repositories': 1,
+        'GET /repositories/:id/accessions': 3,
+    }
+
+
+def test_checkpoint_of_another_stream_is_refused(client, tmp_path):
+    path = str(tmp_path / 'checkpoint.json')
+
+    stream = client.streams.records(
+        'subjects', checkpoint=StreamCheckpoint(path))
+    next(stream)
+    next(stream)
+    stream.close()
+
+    with pytest.raises(ValueError):
+        list(client.streams.records(
+            'subjects', paged=True, checkpoint=StreamCheckpoint(path)))
+
+
+def test_read_ahead_resumes_a_traced_checkpointed_stream(server, tmp_path):
+    finished = []
+    client = ASpaceClient(
+        server.url, 'admin', 'admin',
+        tracer=Tracer(on_finish=finished.append),
+    )
+    path = str(tmp_path / 'checkpoint.json')
+
+    def stream():
+        return client.streams.repository_relative_records(
+            'accessions', batch_size=5, checkpoint=StreamCheckpoint(path))
+
+    try:
+        with ReadAhead(stream(), max_records=20) as read_ahead:
+            first = [
+                record['uri'] for record in itertools.islice(read_ahead, 12)
+            ]
+
+        # Records still buffered when the stream stopped are not skipped.
+        with ReadAhead(stream(), max_records=20) as read_ahead:
+            resumed = [record['uri'] for record in read_ahead]
+    finally:
+        client.close()
+
+    assert first + resumed[1:] == _accession_uris()
+    assert resumed[0] == first[-1]
+
+    stream_spans = [
+        span for span in finished
+        if span.name == 'RecordStreamingService.repository_relative_records'
+    ]
+    assert len(stream_spans) == 2
+    assert all(span.error is None for span in stream_spans)
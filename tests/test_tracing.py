@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import pytest
+
+from aspace import tracing
+from aspace.client import ASpaceClient
+
+
+class _Recorder(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = []
+        self.finished = []
+
+    def on_start(self, span):
+        with self.lock:
+            self.started.append(span)
+
+    def on_finish(self, span):
+        with self.lock:
+            self.finished.append(span)
+
+    def tracer(self):
+        return tracing.Tracer(self.on_start, self.on_finish)
+
+
+def test_nested_spans_share_a_trace():
+    recorder = _Recorder()
+    tracer = recorder.tracer()
+
+    with tracer.span('outer') as outer:
+        with tracer.span('inner') as inner:
+            assert tracing.current_span() is inner
+        assert tracing.current_span() is outer
+
+    assert tracing.current_span() is None
+    assert inner.parent_id == outer.span_id
+    assert inner.trace_id == outer.trace_id
+    assert recorder.finished == [inner, outer]
+    assert outer.duration >= inner.duration >= 0
+
+
+def test_span_records_error():
+    recorder = _Recorder()
+
+    with pytest.raises(ValueError):
+        with recorder.tracer().span('failing'):
+            raise ValueError('failed')
+
+    assert isinstance(recorder.finished[0].error, ValueError)
+
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_stream_requests_are_children_of_the_stream(server, concurrency):
+    recorder = _Recorder()
+    client = ASpaceClient(
+        server.url, 'admin', 'admin', tracer=recorder.tracer())
+
+    records = list(client.streams.records(
+        'subjects', batch_size=5, concurrency=concurrency))
+    client.close()
+
+    stream_span, = [
+        span for span in recorder.finished
+        if span.name == 'RecordStreamingService.records'
+    ]
+    children = [
+        span for span in recorder.finished
+        if span.parent_id == stream_span.span_id
+    ]
+
+    assert len(records) == 25
+    assert stream_span.error is None
+    assert sorted(
+        span.attributes['http.endpoint'] for span in children
+    ) == ['/subjects'] * 6
+    assert all(span.name == 'HTTP GET' for span in children)
+    assert all(
+        span.attributes['http.status_code'] == 200 for span in children)
+    assert {span.trace_id for span in children} == {stream_span.trace_id}
+
+
+def test_stream_span_finishes_when_closed_early(server):
+    recorder = _Recorder()
+    client = ASpaceClient(
+        server.url, 'admin', 'admin', tracer=recorder.tracer())
+
+    stream = client.streams.records('subjects', batch_size=5)
+    next(stream)
+    stream.close()
+    client.close()
+
+    assert 'RecordStreamingService.records' in [
+        span.name for span in recorder.finished]
+    assert len(recorder.started) == len(recorder.finished)
+
+
+def test_async_client_requests_are_traced(server):
+    pytest.importorskip('httpx')
+    from aspace.async_client import AsyncASpaceClient
+
+    recorder = _Recorder()
+    tracer = recorder.tracer()
+
+    async def main():
+        async with AsyncASpaceClient(
+                server.url, 'admin', 'admin', tracer=tracer) as client:
+            with tracer.span('job'):
+                await asyncio.gather(
+                    client.get('/subjects/1'), client.get('/subjects/2'))
+
+    asyncio.run(main())
+
+    job, = [span for span in recorder.finished if span.name == 'job']
+    requests = [
+        span for span in recorder.finished if span.parent_id == job.span_id
+    ]
+
+    assert sorted(span.attributes['http.endpoint'] for span in requests) == [
+        '/subjects/:id', '/subjects/:id']
@@ -0,0 +1,67 @@
+import pytest
+
+from aspace.client import ASpaceClient
+
+httpx = pytest.importorskip('httpx')
+
+from aspace.transports import HTTPXAdapter  # noqa: E402
+
+
+@pytest.fixture
+def httpx_client(server):
+    client = ASpaceClient(server.url, 'admin', 'admin', transport='httpx')
+    yield client
+    client.close()
+
+
+def test_httpx_offers_only_what_it_decodes(httpx_client):
+    offered = [
+        encoding.strip()
+        for encoding in httpx_client.headers['Accept-Encoding'].split(',')
+    ]
+
+    assert 'gzip' in offered
+    assert set(offered) <= set(httpx._decoders.SUPPORTED_DECODERS)
+
+
+@pytest.mark.parametrize('settings', [
+    {'verify': False},
+    {'cert': '/path/to/client.pem'},
+    {'proxies': {'http': 'http://proxy.invalid:3128'}},
+])
+def test_per_request_settings_are_not_ignored(httpx_client, settings):
+    with pytest.raises(ValueError):
+        httpx_client.get('/subjects/1', **settings)
+
+    assert httpx_client.get('/subjects/1').status_code == 200
+
+
+def test_adapter_settings_are_used(server, monkeypatch):
+
+    # requests prefers a CA bundle from the environment to `Session.verify`.
+    monkeypatch.delenv('REQUESTS_CA_BUNDLE', raising=False)
+    monkeypatch.delenv('CURL_CA_BUNDLE', raising=False)
+
+    client = ASpaceClient(
+        server.url, 'admin', 'admin', auto_auth=False,
+        transport=HTTPXAdapter(verify=False),
+    )
+    client.verify = False
+
+    try:
+        assert client.get('/subjects/1').status_code == 200
+    finally:
+        client.close()
+
+
+def test_ca_bundle_is_taken_from_the_environment(server, monkeypatch):
+    certifi = pytest.importorskip('certifi')
+    monkeypatch.setenv('REQUESTS_CA_BUNDLE', certifi.where())
+
+    client = ASpaceClient(server.url, 'admin', 'admin', transport='httpx')
+
+    try:
+        assert client.get_adapter(server.url).verify == certifi.where()
+        assert client.get('/subjects/1').status_code == 200
+    finally:
+        client.close()